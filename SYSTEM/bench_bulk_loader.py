@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+bench_bulk_loader.py – Vergleicht sequentielles und gleichzeitiges Laden vieler Dateien.
+
+Die Wartezeit eines Netzlaufwerks wird mit --latency (ms je Datei) nachgestellt.
+    - load_json:   Datei für Datei (bisheriges Vorgehen)
+    - Threads:     iter_load mit --threads Lesevorgängen
+    - + Prozesse:  zusätzlich Parsen in --processes Prozessen
+
+Verwendung:
+    python bench_bulk_loader.py [--files 200] [--records 500] [--latency 20]
+                                [--threads 16] [--processes 4]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from bulk_loader import iter_load, read_file
+from json_helper import load_json, save_json
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark für bulk_loader")
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--records", type=int, default=500, help="Datensätze je Datei")
+    parser.add_argument("--latency", type=float, default=20.0, help="Simulierte Wartezeit je Datei in ms")
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--processes", type=int, default=4)
+    args = parser.parse_args()
+    delay = args.latency / 1000
+
+    def slow_reader(path):
+        time.sleep(delay)
+        return read_file(path)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(args.files):
+            path = Path(tmp) / f"schule_{i:04d}.json"
+            save_json(path, [{"id": f"{i}-{j}", "nachname": "Muster", "klasse": "10b", "kurse": ["Ma", "Ph"]}
+                             for j in range(args.records)])
+            paths.append(path)
+
+        def sequential():
+            for path in paths:
+                time.sleep(delay)
+                load_json(path)
+
+        runs = [("load_json", sequential),
+                (f"Threads ({args.threads})", lambda: list(iter_load(paths, args.threads, reader=slow_reader))),
+                (f"+ Prozesse ({args.processes})",
+                 lambda: list(iter_load(paths, args.threads, args.processes, reader=slow_reader)))]
+        print(f"{args.files} Dateien à {args.records} Datensätze, {args.latency:.0f} ms Wartezeit je Datei")
+        print(f"{'Verfahren':<18} {'s':>7} {'Dateien/s':>10}")
+        for name, func in runs:
+            start = time.perf_counter()
+            func()
+            seconds = time.perf_counter() - start
+            print(f"{name:<18} {seconds:>7.2f} {args.files / seconds:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
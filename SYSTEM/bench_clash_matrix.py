@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+bench_clash_matrix.py – Vergleicht die Berechnung der Kollisionsmatrix.
+
+    - Paare:     je Kurspaar alle Wahllisten durchsuchen (bisheriges Vorgehen,
+                 nur bis --pair-limit Schüler, sonst zu langsam)
+    - Schleifen: je Schüler alle Paare seiner Kurse zählen (reines Python)
+    - Bitsets:   je Kurspaar (a & b).bit_count()
+    - NumPy:     M.T @ M (nur falls installiert)
+
+Verwendung:
+    python bench_clash_matrix.py [--sizes 2000 10000 50000] [--courses 40] [--choices 6]
+"""
+
+import argparse
+import random
+import time
+
+from clash_matrix import ClashMatrix, _numpy
+
+
+def make_choices(students: int, courses: int, per_student: int, seed: int = 1):
+    rng = random.Random(seed)
+    kurse = [f"K{i:02d}" for i in range(courses)]
+    return kurse, [(i, rng.sample(kurse, per_student)) for i in range(students)]
+
+
+def pairwise(choices, kurse):
+    sets = [set(wahlen) for _, wahlen in choices]
+    return [[sum(1 for w in sets if a in w and b in w) for b in kurse] for a in kurse]
+
+
+def naive(choices, kurse):
+    index = {k: i for i, k in enumerate(kurse)}
+    counts = [[0] * len(kurse) for _ in kurse]
+    for _, wahlen in choices:
+        for a in wahlen:
+            for b in wahlen:
+                counts[index[a]][index[b]] += 1
+    return counts
+
+
+def _time(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark für clash_matrix")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2000, 10000, 50000])
+    parser.add_argument("--courses", type=int, default=40)
+    parser.add_argument("--choices", type=int, default=6, help="Kurse je Schüler")
+    parser.add_argument("--pair-limit", type=int, default=10000, help="Paar-Verfahren nur bis hier")
+    args = parser.parse_args()
+    has_numpy = _numpy() is not None
+
+    print(f"{'Schüler':>8} {'Paare':>8} {'Schleifen':>10} {'Bitsets':>9} {'NumPy':>9} {'Abfrage':>9}")
+    print(f"{'':>8} {'s':>8} {'s':>10} {'s':>9} {'s':>9} {'ms':>9}")
+    for n in args.sizes:
+        kurse, choices = make_choices(n, args.courses, args.choices)
+        pair_s = "-"
+        if n <= args.pair_limit:
+            pair_s = f"{_time(lambda: pairwise(choices, kurse))[0]:.2f}"
+        loop_s, reference = _time(lambda: naive(choices, kurse))
+        bitset_s, matrix = _time(lambda: ClashMatrix(choices, kurse, backend="bitset"))
+        assert matrix.matrix() == reference
+        numpy_s = "-"
+        if has_numpy:
+            seconds, result = _time(lambda: ClashMatrix(choices, kurse, backend="numpy"))
+            assert result.matrix() == reference
+            numpy_s = f"{seconds:.3f}"
+        query_s, _ = _time(lambda: [matrix.clashing_students(kurse[i], kurse[i + 1]) for i in range(10)])
+        print(f"{n:>8} {pair_s:>8} {loop_s:>10.3f} {bitset_s:>9.3f} {numpy_s:>9} {query_s * 100:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+bench_dedup.py – Misst, wie die Duplikatsuche mit der Anzahl Datensätze wächst.
+
+Erzeugt Schüler aus Namenslisten (mit ~2 % absichtlichen Dubletten mit
+Tippfehlern bzw. Schreibvarianten) und vergleicht:
+    - Alle Paare: n·(n-1)/2 Vergleiche (nur bis --pair-limit, sonst zu langsam)
+    - Blöcke:     DuplicateFinder (Vergleiche wachsen etwa linear)
+
+Verwendung:
+    python bench_dedup.py [--sizes 10000 50000 100000] [--duplicates 0.02]
+"""
+
+import argparse
+import random
+import time
+
+from dedup import DuplicateFinder
+
+VORNAMEN = ["Anna", "Ben", "Clara", "David", "Emma", "Felix", "Greta", "Hannah", "Jan", "Jonas", "Lea",
+            "Leon", "Lina", "Luca", "Marie", "Max", "Mia", "Noah", "Paul", "Sophie", "Tim", "Tom"]
+SILBEN = ["ber", "bach", "dorf", "er", "hoff", "kamp", "ler", "mann", "mei", "rich", "schmi", "schul",
+          "stein", "wag", "wer", "wolf", "zimm", "kra", "lang", "neu", "ad", "bus", "fel", "gut", "heim",
+          "jo", "kir", "lo", "mo", "nit", "pa", "ro", "sa", "te", "ul", "vo", "wi", "zet", "hal", "tr"]
+
+
+def _typo(rng, name: str) -> str:
+    i = rng.randrange(len(name))
+    return name[:i] + rng.choice("aeiklnrst") + name[i + 1:]
+
+
+def make_records(n: int, share: float, seed: int = 1):
+    rng = random.Random(seed)
+    records = []
+    for i in range(n):
+        if records and rng.random() < share:
+            original = rng.choice(records)
+            record = dict(original, id=i, nachname=_typo(rng, original["nachname"]))
+        else:
+            nachname = "".join(rng.choice(SILBEN) for _ in range(rng.randint(2, 3))).capitalize()
+            record = {"id": i, "vorname": rng.choice(VORNAMEN), "nachname": nachname,
+                      "geburtsdatum": f"{rng.randint(2004, 2012)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"}
+        records.append(record)
+    return records
+
+
+def all_pairs(records) -> int:
+    finder = DuplicateFinder()
+    for record in records:
+        finder.add(record)
+    hits = 0
+    for i in range(len(records)):
+        for j in range(i + 1, len(records)):
+            hits += finder.score(i, j)[0] >= finder.threshold
+    return hits
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark für dedup")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 50000, 100000])
+    parser.add_argument("--duplicates", type=float, default=0.02, help="Anteil erzeugter Dubletten")
+    parser.add_argument("--pair-limit", type=int, default=1000, help="Alle-Paare-Verfahren nur bis hier")
+    args = parser.parse_args()
+
+    print(f"{'Datensätze':>10} {'Alle Paare':>11} {'Blöcke':>8} {'Vergleiche':>11} {'je Satz':>8} {'Treffer':>8}")
+    print(f"{'':>10} {'s':>11} {'s':>8} {'':>11} {'':>8} {'':>8}")
+    for n in args.sizes:
+        records = make_records(n, args.duplicates)
+        pairs_s = "-"
+        if n <= args.pair_limit:
+            start = time.perf_counter()
+            all_pairs(records)
+            pairs_s = f"{time.perf_counter() - start:.2f}"
+        start = time.perf_counter()
+        finder = DuplicateFinder()
+        for record in records:
+            finder.add(record)
+        report = finder.report()
+        block_s = time.perf_counter() - start
+        stats = report["statistik"]
+        print(f"{n:>10} {pairs_s:>11} {block_s:>8.2f} {stats['vergleiche']:>11} "
+              f"{stats['vergleiche'] / n:>8.2f} {stats['treffer']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+bench_kursplanung.py – Misst die Kurszuteilung für große Jahrgänge.
+
+Synthetische Daten: K Kurse mit ungleicher Beliebtheit (beliebte Kurse sind
+überbucht), je Schüler vier Wünsche, Plätze insgesamt etwas mehr als Schüler.
+Gemessen werden die komplette Zuteilung und anschließend schrittweise
+Änderungen einzelner Schüler (change_student); Faktor = Neulösung / Änderung.
+
+Verwendung:
+    python bench_kursplanung.py [--sizes 2000 10000 50000] [--courses 30] [--changes 200]
+"""
+
+import argparse
+import random
+import time
+
+from kursplanung import Kursplanung
+
+
+def make_instance(students: int, courses: int, seed: int = 1):
+    rng = random.Random(seed)
+    kurse = [f"K{i:02d}" for i in range(courses)]
+    popularity = [1.0 / (i + 1) ** 0.8 for i in range(courses)]      # Zipf-artig
+    wahlen = []
+    for sid in range(students):
+        chosen = []
+        while len(chosen) < 4:
+            kurs = rng.choices(kurse, popularity)[0]
+            if kurs not in chosen:
+                chosen.append(kurs)
+        wahlen.append((sid, chosen))
+    # Plätze gleichmäßig verteilt: beliebte Kurse reichen nicht für alle Erstwünsche
+    per_course = int(students * 1.05 / courses) + 1
+    return {k: per_course for k in kurse}, wahlen
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark für kursplanung")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2000, 10000, 50000])
+    parser.add_argument("--courses", type=int, default=30)
+    parser.add_argument("--changes", type=int, default=200, help="schrittweise Änderungen je Größe")
+    args = parser.parse_args()
+
+    print(f"{'Schüler':>8} {'Zuteilung':>10} {'Erstw.':>7} {'Zweitw.':>8} {'Dritt+':>7} {'ohne':>5} "
+          f"{'Suchen':>7} {'Wechsel':>8} {'Änderung':>10} {'Faktor':>8}")
+    print(f"{'':>8} {'s':>10} {'%':>7} {'%':>8} {'%':>7} {'':>5} {'':>7} {'':>8} {'ms':>10} {'':>8}")
+    for n in args.sizes:
+        capacities, wahlen = make_instance(n, args.courses)
+        start = time.perf_counter()
+        plan = Kursplanung(capacities).add_students(wahlen)
+        solve = time.perf_counter() - start
+        stats = plan.stats()
+        by_rank = stats["by_rank"]
+        share = lambda count: 100.0 * count / n
+
+        rng = random.Random(2)
+        kurse = list(capacities)
+        start = time.perf_counter()
+        for _ in range(args.changes):
+            plan.change_student(rng.randrange(n), rng.sample(kurse, 4))
+        change_ms = (time.perf_counter() - start) / args.changes * 1000
+
+        print(f"{n:>8} {solve:>10.2f} {share(by_rank.get(0, 0)):>7.1f} {share(by_rank.get(1, 0)):>8.1f} "
+              f"{share(sum(c for r, c in by_rank.items() if r is not None and r >= 2)):>7.1f} "
+              f"{stats['unassigned']:>5} {stats['searches']:>7} {stats['moves']:>8} {change_ms:>10.2f} "
+              f"{solve * 1000 / change_ms:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+bench_logger.py – Vergleicht den Durchsatz des Loggers (Meldungen pro Sekunde).
+
+Gemessen wird die Dateiausgabe ohne Konsole:
+    - ungepuffert: Datei wird für jede Meldung geöffnet und geschlossen
+    - gepuffert:   gemeinsamer Dateihandle + Hintergrund-Schreiber
+jeweils mit einem Thread und mit mehreren Threads gleichzeitig.
+
+Verwendung:
+    python bench_logger.py [--messages 100000] [--threads 8]
+"""
+
+import argparse
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from logger import Logger
+
+
+def run(log_file: Path, messages: int, threads: int, buffered: bool) -> float:
+    """Schreibt `messages` Meldungen verteilt auf `threads` Threads, liefert Meldungen/s."""
+    log = Logger(log_file, console=False, buffered=buffered)
+    per_thread = messages // threads
+
+    def worker(n):
+        for i in range(per_thread):
+            log.info(f"Thread {n}: Meldung {i}")
+
+    workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    start = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    log.flush()
+    elapsed = time.perf_counter() - start
+
+    # Kontrolle: keine Zeile verloren oder zerrissen
+    with open(log_file, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    assert len(lines) == per_thread * threads, (len(lines), per_thread * threads)
+    assert all(" | INFO     | Thread " in line for line in lines)
+    return per_thread * threads / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark für logger.Logger")
+    parser.add_argument("--messages", type=int, default=100000, help="Meldungen pro Lauf")
+    parser.add_argument("--threads", type=int, default=8, help="Threads im parallelen Lauf")
+    args = parser.parse_args()
+
+    print(f"{'Variante':<14} {'Threads':>7} {'Meldungen/s':>14}")
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {}
+        for threads in (1, args.threads):
+            for buffered in (False, True):
+                name = "gepuffert" if buffered else "ungepuffert"
+                log_file = Path(tmp) / f"{name}_{threads}.log"
+                rate = run(log_file, args.messages, threads, buffered)
+                results[(threads, buffered)] = rate
+                print(f"{name:<14} {threads:>7} {rate:>14,.0f}")
+
+    for threads in (1, args.threads):
+        factor = results[(threads, True)] / results[(threads, False)]
+        print(f"Faktor bei {threads} Thread(s): {factor:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
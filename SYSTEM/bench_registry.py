@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+bench_registry.py – Misst Aufbau, Speicher und Abfragen des Schülerbestands.
+
+Für 1.000, 10.000 und 100.000 synthetische Schüler:
+    - Laden aus JSON und Aufbau der Indizes
+    - Speicher der Registry (tracemalloc) im Vergleich zur Liste von Dicts
+    - Abfragen per id, Klasse und Kurs: Index vs. lineare Suche in der Liste
+    - schrittweise Änderungen (update)
+
+Verwendung:
+    python bench_registry.py [--sizes 1000 10000 100000] [--queries 1000]
+"""
+
+import argparse
+import gc
+import random
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from json_helper import load_json, save_json
+from schueler_registry import SchuelerRegistry
+
+KURSE = ["Ma", "De", "En", "Ph", "Ch", "Bio", "Ku", "Mu", "Ge", "Ek", "Inf", "Spa", "Fr", "La", "Re"]
+
+
+def make_records(n: int, seed: int = 1) -> list:
+    rng = random.Random(seed)
+    return [{"id": i, "nachname": f"Name{rng.randrange(5000)}", "vorname": f"Vorname{rng.randrange(800)}",
+             "klasse": f"{rng.randint(5, 13)}{'abcdef'[rng.randrange(6)]}",
+             "kurse": rng.sample(KURSE, 4), "geburtsdatum": f"20{rng.randint(5, 15):02d}-01-01"}
+            for i in range(1, n + 1)]
+
+
+def _memory(build) -> int:
+    gc.collect()
+    tracemalloc.start()
+    data = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del data
+    return size
+
+
+def _per_query(func, keys) -> float:
+    """Mikrosekunden je Abfrage."""
+    start = time.perf_counter()
+    for key in keys:
+        func(key)
+    return (time.perf_counter() - start) / len(keys) * 1e6
+
+
+def run(n: int, queries: int, tmp: Path) -> dict:
+    records = make_records(n)
+    path = tmp / f"schueler_{n}.json"
+    save_json(path, records, compact=True)
+
+    start = time.perf_counter()
+    registry = SchuelerRegistry.load(path)
+    load_s = time.perf_counter() - start
+
+    rng = random.Random(2)
+    ids = [rng.randint(1, n) for _ in range(queries)]
+    klassen = [rng.choice(registry.klassen()) for _ in range(queries)]
+    kurse = [rng.choice(KURSE) for _ in range(queries)]
+    linear_queries = max(1, min(queries, 200_000 // n))   # lineare Suche ist bei 100k sehr langsam
+
+    result = {
+        "n": n,
+        "load_s": load_s,
+        "mem_dicts": _memory(lambda: load_json(path)),
+        "mem_registry": _memory(lambda: SchuelerRegistry.load(path)),
+        "get_us": _per_query(registry.get, ids),
+        "get_linear_us": _per_query(lambda i: next(r for r in records if r["id"] == i), ids[:linear_queries]),
+        "klasse_us": _per_query(registry.by_klasse, klassen),
+        "klasse_linear_us": _per_query(lambda k: [r for r in records if r["klasse"] == k],
+                                       klassen[:linear_queries]),
+        "find_us": _per_query(lambda k: registry.find(jahrgang=10, kurs=k), kurse),
+    }
+    start = time.perf_counter()
+    for i in ids:
+        registry.update(i, klasse=rng.choice(klassen), kurse=rng.sample(KURSE, 4))
+    result["update_us"] = (time.perf_counter() - start) / len(ids) * 1e6
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark für schueler_registry")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--queries", type=int, default=1000, help="Abfragen je Messung")
+    args = parser.parse_args()
+
+    print(f"{'Schüler':>8} {'Laden':>8} {'Dicts':>9} {'Registry':>9} {'id':>7} {'id lin.':>9} "
+          f"{'Klasse':>8} {'Kl. lin.':>10} {'find':>8} {'update':>8}")
+    print(f"{'':>8} {'s':>8} {'MiB':>9} {'MiB':>9} {'µs':>7} {'µs':>9} {'µs':>8} {'µs':>10} {'µs':>8} {'µs':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.sizes:
+            r = run(n, args.queries, Path(tmp))
+            print(f"{r['n']:>8} {r['load_s']:>8.3f} {r['mem_dicts'] / 2**20:>9.1f} "
+                  f"{r['mem_registry'] / 2**20:>9.1f} {r['get_us']:>7.2f} {r['get_linear_us']:>9.1f} "
+                  f"{r['klasse_us']:>8.1f} {r['klasse_linear_us']:>10.1f} {r['find_us']:>8.1f} "
+                  f"{r['update_us']:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
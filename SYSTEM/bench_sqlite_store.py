@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+bench_sqlite_store.py – Vergleicht JSON-Datei und SQLite-Speicher bei großen Beständen.
+
+    - Laden:    load_json der ganzen Datei  vs. bulk_load in eine Tabelle
+    - Abfrage:  Liste durchsuchen           vs. get() über den Schlüssel
+    - Filter:   Liste filtern               vs. query() über den Index
+    - Ändern:   Datensatz ändern + save_json vs. upsert()
+
+Verwendung:
+    python bench_sqlite_store.py [--sizes 10000 100000] [--changes 20]
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from json_helper import load_json, save_json
+from sqlite_store import SqliteStore
+
+
+def make_records(n: int, seed: int = 1):
+    rng = random.Random(seed)
+    return [{"id": str(i), "nachname": f"Name{rng.randrange(n)}", "vorname": "Max",
+             "klasse": f"{rng.randint(5, 13)}{rng.choice('abcd')}", "kurse": ["Ma", "Ph", "De"]}
+            for i in range(n)]
+
+
+def _time(func, repeat: int = 1) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark für sqlite_store")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--changes", type=int, default=20, help="Einzeländerungen je Verfahren")
+    args = parser.parse_args()
+
+    print(f"{'Datensätze':>10} {'Verfahren':<8} {'Laden':>8} {'Abfrage':>9} {'Filter':>8} {'Ändern':>9}")
+    print(f"{'':>10} {'':<8} {'s':>8} {'ms':>9} {'ms':>8} {'ms':>9}")
+    for n in args.sizes:
+        records = make_records(n)
+        ids = [str(random.randrange(n)) for _ in range(args.changes)]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "schueler.json"
+            save_json(path, records)
+
+            data = None
+
+            def load():
+                nonlocal data
+                data = load_json(path)
+
+            load_s = _time(load)
+            lookup = _time(lambda: next(r for r in data if r["id"] == ids[0]), 5) * 1000
+            filter_ms = _time(lambda: [r for r in data if r["klasse"] == "10b"], 5) * 1000
+
+            def change_json():
+                for sid in ids:
+                    next(r for r in data if r["id"] == sid)["klasse"] = "13z"
+                    save_json(path, data)
+
+            change = _time(change_json) * 1000 / len(ids)
+            print(f"{n:>10} {'JSON':<8} {load_s:>8.2f} {lookup:>9.3f} {filter_ms:>8.2f} {change:>9.2f}")
+
+            with SqliteStore(Path(tmp) / "db.sqlite3") as store:
+                load_s = _time(lambda: store.import_json("schueler", path, key="id", indexes=["klasse"]))
+                lookup = _time(lambda: store.get("schueler", ids[0]), 5) * 1000
+                filter_ms = _time(lambda: store.query("schueler", klasse="10b"), 5) * 1000
+
+                def change_sqlite():
+                    for sid in ids:
+                        store.update("schueler", sid, klasse="13y")
+
+                change = _time(change_sqlite) * 1000 / len(ids)
+                print(f"{'':>10} {'SQLite':<8} {load_s:>8.2f} {lookup:>9.3f} {filter_ms:>8.2f} {change:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+# SYSTEM/bulk_loader.py
+"""Lädt viele JSON-/CSV-Dateien gleichzeitig (z.B. alle Schuldateien aus INPUT).
+
+Auf einem Netzlaufwerk dominiert die Wartezeit je Datei, nicht das Parsen.
+Statt load_json Datei für Datei:
+    - Lesen in einem Thread-Pool (mehrere Dateien gleichzeitig unterwegs)
+    - Parsen im selben Thread oder optional in einem Prozess-Pool
+      (große Dateien, mehrere Kerne)
+    - höchstens max_in_flight Dateien gleichzeitig im Speicher
+    - Ergebnisse in Eingabereihenfolge oder sobald fertig
+    - Fehler je Datei im Ergebnis, der Rest läuft weiter
+    - cached=True: JSON-Dateien über den Cache von load_json (nur geänderte
+      Dateien werden neu geparst)
+
+Formate (nach Endung, .gz/.xz werden entpackt):
+    .json   – beliebiges JSON (wie load_json)
+    .ndjson – Liste der Datensätze
+    .csv    – Liste von Dicts (csv.DictReader, Trennzeichen wählbar)
+
+Verwendung:
+    data = load_many(input_files("schule_*.json"), default=[])   # {Path: Daten}, wie load_json
+    for result in iter_load(paths, ordered=False, processes=4):
+        if result.ok:
+            ...result.data...
+        else:
+            log.warning(f"{result.path}: {result.error}")
+"""
+
+import csv
+import io
+import json
+import sys
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
+
+from file_manager import FilePaths
+from json_helper import load_json
+from logger import Logger
+from progress import Progress
+
+log = Logger()
+
+DEFAULT_THREADS = 8
+_FAILED = object()
+
+
+class LoadResult:
+    """
+    Ergebnis für eine Datei.
+
+    Attribute:
+        path (Path): Eingabedatei.
+        data: Geladene Daten (bei Fehler der default-Wert).
+        error (str): Fehlermeldung oder None.
+        bytes (int): Gelesene Bytes (vor dem Entpacken).
+        seconds (float): Lesen + Parsen.
+    """
+
+    __slots__ = ("path", "data", "error", "bytes", "seconds")
+
+    def __init__(self, path: Path, data: Any = None, error: Optional[str] = None, nbytes: int = 0,
+                 seconds: float = 0.0):
+        self.path = path
+        self.data = data
+        self.error = error
+        self.bytes = nbytes
+        self.seconds = seconds
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __repr__(self):
+        state = "ok" if self.ok else f"Fehler: {self.error}"
+        return f"LoadResult({self.path.name}, {state}, {self.bytes} Bytes)"
+
+
+def input_files(pattern: str = "*.json", directory: Union[str, Path, None] = None) -> List[Path]:
+    """Passende Dateien im INPUT-Ordner (bzw. directory), sortiert."""
+    directory = Path(directory) if directory else FilePaths.INPUT_DIR
+    return sorted(p for p in directory.glob(pattern) if p.is_file())
+
+
+def read_file(path: Path) -> bytes:
+    """Liest eine Datei roh (Entpacken geschieht beim Parsen)."""
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def parse_bytes(raw: bytes, name: str, delimiter: str = ";") -> Any:
+    """
+    Parst den Inhalt einer Datei anhand ihres Namens (auch im Prozess-Pool).
+
+    Raises:
+        ValueError: Ungültiges JSON/NDJSON oder kein UTF-8.
+        OSError, EOFError: Kaputte .gz/.xz-Datei.
+    """
+    suffixes = [s.lower() for s in Path(name).suffixes]
+    if suffixes and suffixes[-1] == ".gz":
+        import gzip
+        raw, suffixes = gzip.decompress(raw), suffixes[:-1]
+    elif suffixes and suffixes[-1] == ".xz":
+        import lzma
+        try:
+            raw = lzma.decompress(raw)
+        except lzma.LZMAError as e:
+            raise ValueError(f"xz-Datei beschädigt: {e}") from None
+        suffixes = suffixes[:-1]
+    kind = suffixes[-1] if suffixes else ""
+    if kind == ".csv":
+        text = raw.decode("utf-8-sig")
+        return list(csv.DictReader(io.StringIO(text, newline=""), delimiter=delimiter))
+    if kind == ".ndjson":
+        records = []
+        for number, line in enumerate(raw.decode("utf-8").splitlines(), 1):
+            if line.strip():
+                try:
+                    records.append(json.loads(line))
+                except ValueError as e:
+                    raise ValueError(f"Zeile {number}: {e}") from None
+        return records
+    return json.loads(raw)
+
+
+def _is_json(path: Path) -> bool:
+    suffixes = [s.lower() for s in path.suffixes]
+    if suffixes and suffixes[-1] in (".gz", ".xz"):
+        suffixes = suffixes[:-1]
+    return bool(suffixes) and suffixes[-1] == ".json"
+
+
+def _load_one(path: Path, reader: Callable[[Path], bytes], delimiter: str, default: Any,
+              parse_pool=None, cached: bool = False) -> LoadResult:
+    """Liest und parst eine Datei im Thread; Fehler landen im Ergebnis."""
+    start = time.perf_counter()
+    result = LoadResult(path, default)
+    try:
+        if cached and _is_json(path):
+            # Cache von load_json (threadsicher); liefert eine eigene Kopie
+            data = load_json(path, default=_FAILED, cached=True)
+            if data is _FAILED:
+                result.error = "Datei nicht gefunden" if not path.exists() else "ungültiges JSON"
+            else:
+                result.data = data
+                result.bytes = path.stat().st_size
+            result.seconds = time.perf_counter() - start
+            return result
+        raw = reader(path)
+        result.bytes = len(raw)
+        if parse_pool is None:
+            result.data = parse_bytes(raw, path.name, delimiter)
+        else:
+            result.data = parse_pool.submit(parse_bytes, raw, path.name, delimiter).result()
+    except FileNotFoundError:
+        result.error = "Datei nicht gefunden"
+    except Exception as e:
+        result.error = str(e) or type(e).__name__
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+def iter_load(paths: Iterable[Union[str, Path]], threads: int = DEFAULT_THREADS, processes: int = 0,
+              max_in_flight: Optional[int] = None, ordered: bool = True, default: Any = None,
+              delimiter: str = ";", cached: bool = False,
+              reader: Callable[[Path], bytes] = read_file) -> Iterator[LoadResult]:
+    """
+    Lädt Dateien gleichzeitig und liefert je Datei ein LoadResult.
+
+    Args:
+        paths: Dateien (auch ein Generator)
+        threads: Gleichzeitige Lesevorgänge
+        processes: > 0: so viele Prozesse parsen (lohnt erst bei großen Dateien)
+        max_in_flight: Höchstzahl gestarteter, noch nicht abgeholter Dateien
+                       (Standard 2 × threads) – begrenzt den Speicher
+        ordered: True = Eingabereihenfolge, False = sobald fertig
+        default: Daten bei Fehler (wie bei load_json)
+        delimiter: Trennzeichen für CSV-Dateien
+        cached: JSON-Dateien über den Cache von load_json laden
+        reader: Liest eine Datei roh (z.B. für Tests oder andere Quellen)
+    """
+    # Erst hier importieren: concurrent.futures kostet beim Start spürbar Zeit
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+    threads = max(1, int(threads))
+    limit = max(1, int(max_in_flight or 2 * threads))
+    paths = iter(Path(p) for p in paths)
+    parse_pool = ProcessPoolExecutor(max_workers=processes) if processes > 0 else None
+    pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="bulk_loader")
+    pending = deque() if ordered else set()
+
+    def submit() -> bool:
+        path = next(paths, None)
+        if path is None:
+            return False
+        future = pool.submit(_load_one, path, reader, delimiter, default, parse_pool, cached)
+        if ordered:
+            pending.append(future)
+        else:
+            pending.add(future)
+        return True
+
+    try:
+        while len(pending) < limit and submit():
+            pass
+        while pending:
+            if ordered:
+                results = [pending[0].result()]
+                pending.popleft()
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                pending.difference_update(done)
+                results = [future.result() for future in done]
+            # Erst nach dem Abholen nachschieben – so bleiben höchstens limit Dateien unterwegs
+            for result in results:
+                submit()
+                yield result
+    finally:
+        # Abbruch durch den Aufrufer (break/Exception): Wartende verwerfen
+        for future in pending:
+            future.cancel()
+        pool.shutdown(wait=True)
+        if parse_pool is not None:
+            parse_pool.shutdown(wait=True)
+
+
+def load_many(paths: Iterable[Union[str, Path]], default: Any = None, **options) -> Dict[Path, Any]:
+    """
+    Wie load_json für viele Dateien: Pfad -> Daten, bei Fehlern default.
+
+    Fehler werden als Warnung protokolliert; Fortschritt in Dateien wird
+    gemeldet (siehe progress). options: siehe iter_load.
+    """
+    paths = [Path(p) for p in paths]
+    data = {}
+    failed = 0
+    with Progress(total=len(paths), unit="Dateien", label="bulk_loader") as progress:
+        for count, result in enumerate(iter_load(paths, default=default, **options), 1):
+            data[result.path] = result.data
+            if not result.ok:
+                failed += 1
+                log.warning(f"Datei nicht geladen: {result.path} ({result.error})")
+            progress.update(count)
+    if failed:
+        log.warning(f"{failed} von {len(paths)} Dateien nicht geladen")
+    return data
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Viele JSON-/CSV-Dateien gleichzeitig laden")
+    parser.add_argument("pattern", nargs="?", default="*.json", help="Glob-Muster im INPUT-Ordner")
+    parser.add_argument("--dir", help="Anderer Ordner statt INPUT")
+    parser.add_argument("--threads", type=int, default=DEFAULT_THREADS, help="Gleichzeitige Lesevorgänge")
+    parser.add_argument("--processes", type=int, default=0, help="Prozesse zum Parsen (0 = in den Threads)")
+    parser.add_argument("--max-in-flight", type=int, help="Höchstzahl gleichzeitig geladener Dateien")
+    parser.add_argument("--unordered", action="store_true", help="Ergebnisse ausgeben, sobald fertig")
+    parser.add_argument("--delimiter", default=";", help="Trennzeichen für CSV (Standard ';')")
+    args = parser.parse_args()
+
+    files = input_files(args.pattern, args.dir)
+    if not files:
+        log.warning(f"Keine Dateien für Muster '{args.pattern}' gefunden.")
+        sys.exit(0)
+    start = time.perf_counter()
+    failed = total_bytes = 0
+    for result in iter_load(files, args.threads, args.processes, args.max_in_flight,
+                            ordered=not args.unordered, delimiter=args.delimiter):
+        total_bytes += result.bytes
+        size = len(result.data) if isinstance(result.data, (list, dict)) else "-"
+        state = "OK" if result.ok else f"FEHLER: {result.error}"
+        print(f"{result.path.name:<32} {size:>8} {result.bytes:>12} {result.seconds:>7.2f}s  {state}")
+        failed += not result.ok
+    print(f"{len(files)} Dateien, {total_bytes} Bytes in {time.perf_counter() - start:.2f} s, {failed} Fehler")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+clash_matrix.py – Welche Kurse haben gemeinsame Schüler? (Kollisionsmatrix für den Stundenplan)
+
+Aus den Kurswahlen entsteht eine Schüler × Kurs-Inzidenzmatrix, spaltenweise
+bitgepackt: je Kurs eine Python-Ganzzahl, deren Bit i für Schüler i steht.
+Daraus wird die Matrix der Überschneidungen (Kurs × Kurs, Diagonale =
+Kursgröße) in einem Schritt berechnet:
+    - mit NumPy (falls installiert): M.T @ M über die 0/1-Matrix
+    - sonst: je Kurspaar (bits_a & bits_b).bit_count() – die Schleife über
+      die Schüler läuft dabei in C, nicht in Python
+
+Abfragen:
+    matrix.overlap("Ma", "Ph")            # Anzahl gemeinsamer Schüler (O(1))
+    matrix.clashing_students("Ma", "Ph")  # wer kollidiert, wenn beide im selben Block liegen
+    matrix.slot_clashes(["Ma", "Ku"])     # Kollisionen eines geplanten Blocks
+    matrix.save("kollisionen.json") / export_csv("kollisionen.csv")
+
+Verwendung:
+    python clash_matrix.py [--output DATEI] [--csv DATEI] [--backend auto|numpy|bitset]
+"""
+
+import csv
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from file_manager import FilePaths
+from json_helper import save_json
+from logger import Logger
+
+log = Logger()
+
+BACKENDS = ("auto", "numpy", "bitset")
+
+# Byte -> Positionen der gesetzten Bits (zum schnellen Auslesen der Bitsets)
+_BYTE_BITS = [tuple(i for i in range(8) if value >> i & 1) for value in range(256)]
+
+
+def _numpy():
+    """NumPy, falls installiert (sonst None)."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def bit_indices(bits: int) -> List[int]:
+    """Positionen der gesetzten Bits, aufsteigend."""
+    if not bits:
+        return []
+    data = bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+    result = []
+    for offset, byte in enumerate(data):
+        if byte:
+            base = offset * 8
+            result.extend(base + i for i in _BYTE_BITS[byte])
+    return result
+
+
+class ClashMatrix:
+    """
+    Bitgepackte Inzidenzmatrix und Überschneidungsmatrix der Kurse.
+
+    Args:
+        choices: (schüler_id, kurse) je Schüler
+        kurse: Feste Kursliste (z.B. aus kurse.json); sonst alle gewählten Kurse, sortiert
+        backend: "auto" (NumPy wenn vorhanden), "numpy" oder "bitset"
+
+    Attribute:
+        kurse (list): Kurse in Matrixreihenfolge.
+        students (list): Schüler-ids; Index = Bitposition.
+        backend (str): Tatsächlich verwendetes Verfahren.
+        unknown (int): Wahlen von Kursen, die nicht in `kurse` stehen.
+
+    Raises:
+        ValueError: Unbekanntes Backend oder "numpy" ohne installiertes NumPy.
+    """
+
+    def __init__(self, choices: Iterable[Tuple[Any, Sequence[str]]], kurse: Optional[Sequence[str]] = None,
+                 backend: str = "auto"):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unbekanntes Backend: {backend}")
+        choices = [(sid, tuple(wahlen)) for sid, wahlen in choices]
+        if kurse is None:
+            kurse = sorted({kurs for _, wahlen in choices for kurs in wahlen}, key=str)
+        self.kurse = list(kurse)
+        self._column = {kurs: i for i, kurs in enumerate(self.kurse)}
+        self.students = [sid for sid, _ in choices]
+        self.unknown = 0
+
+        # Spalten der Inzidenzmatrix: erst Bitpositionen sammeln, dann je Kurs
+        # einmal zu einer Ganzzahl packen (statt N-mal bits |= 1 << i)
+        positions = [[] for _ in self.kurse]
+        column = self._column
+        for row, (_, wahlen) in enumerate(choices):
+            for kurs in set(wahlen):
+                j = column.get(kurs)
+                if j is None:
+                    self.unknown += 1
+                else:
+                    positions[j].append(row)
+        self._bits = [_pack(rows, len(self.students)) for rows in positions]
+
+        numpy = _numpy() if backend != "bitset" else None
+        if backend == "numpy" and numpy is None:
+            raise ValueError("Backend 'numpy' gewählt, aber NumPy ist nicht installiert")
+        if numpy is not None:
+            self.backend = "numpy"
+            self._counts = self._overlaps_numpy(numpy, positions)
+        else:
+            self.backend = "bitset"
+            self._counts = self._overlaps_bitset()
+
+    @classmethod
+    def from_registry(cls, registry, kurse: Optional[Sequence[str]] = None, backend: str = "auto") -> "ClashMatrix":
+        """Aus einer SchuelerRegistry (Kurswahlen = record.kurse)."""
+        return cls(((record.id, record.kurse) for record in registry), kurse, backend)
+
+    # ------------------------------------------------------------------
+    # Berechnung
+    # ------------------------------------------------------------------
+    def _overlaps_bitset(self) -> List[List[int]]:
+        bits = self._bits
+        size = len(bits)
+        counts = [[0] * size for _ in range(size)]
+        for a in range(size):
+            row, bits_a = counts[a], bits[a]
+            row[a] = bits_a.bit_count()
+            if not bits_a:
+                continue
+            for b in range(a + 1, size):
+                row[b] = counts[b][a] = (bits_a & bits[b]).bit_count()
+        return counts
+
+    def _overlaps_numpy(self, np, positions: List[List[int]]) -> List[List[int]]:
+        incidence = np.zeros((len(self.students), len(self.kurse)), dtype=np.float32)
+        for j, rows in enumerate(positions):
+            incidence[rows, j] = 1.0
+        # float32-Matrixprodukt nutzt BLAS und ist bis 2**24 Schüler exakt
+        return np.rint(incidence.T @ incidence).astype(np.int64).tolist()
+
+    # ------------------------------------------------------------------
+    # Abfragen
+    # ------------------------------------------------------------------
+    def _index(self, kurs: str) -> int:
+        try:
+            return self._column[kurs]
+        except KeyError:
+            raise KeyError(f"Unbekannter Kurs: {kurs}") from None
+
+    def overlap(self, a: str, b: str) -> int:
+        """Anzahl Schüler, die a und b gewählt haben (a == b: Kursgröße)."""
+        return self._counts[self._index(a)][self._index(b)]
+
+    def size(self, kurs: str) -> int:
+        return self.overlap(kurs, kurs)
+
+    def clashing_students(self, a: str, b: str) -> List[Any]:
+        """Schüler, die kollidieren, wenn a und b im selben Block liegen."""
+        bits = self._bits[self._index(a)] & self._bits[self._index(b)]
+        students = self.students
+        return [students[i] for i in bit_indices(bits)]
+
+    def conflicts(self, kurs: str) -> Dict[str, int]:
+        """Kurse mit gemeinsamen Schülern -> Anzahl (ohne den Kurs selbst)."""
+        i = self._index(kurs)
+        return {other: count for other, count in zip(self.kurse, self._counts[i]) if count and other != kurs}
+
+    def slot_clashes(self, kurse: Sequence[str]) -> Dict[Tuple[str, str], int]:
+        """Kollidierende Kurspaare eines geplanten Blocks -> Anzahl betroffener Schüler."""
+        result = {}
+        for i, a in enumerate(kurse):
+            for b in kurse[i + 1:]:
+                count = self.overlap(a, b)
+                if count:
+                    result[(a, b)] = count
+        return result
+
+    def students_with_clash(self, kurse: Sequence[str]) -> List[Any]:
+        """Schüler, die in einem Block mit diesen Kursen mindestens zwei Kurse hätten."""
+        seen = clash = 0
+        for kurs in kurse:
+            bits = self._bits[self._index(kurs)]
+            clash |= seen & bits
+            seen |= bits
+        return [self.students[i] for i in bit_indices(clash)]
+
+    def matrix(self) -> List[List[int]]:
+        """Überschneidungsmatrix (Kopie) in der Reihenfolge von kurse."""
+        return [list(row) for row in self._counts]
+
+    # ------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------
+    def to_dict(self) -> dict:
+        return {"kurse": self.kurse, "schueler": len(self.students), "matrix": self._counts}
+
+    def save(self, path: Union[str, Path]) -> bool:
+        """Speichert Kursliste und Matrix als (kompaktes) JSON."""
+        return save_json(path, self.to_dict(), compact=True)
+
+    def export_csv(self, path: Union[str, Path], delimiter: str = ';') -> bool:
+        """Matrix als CSV (erste Zeile und Spalte: Kursnamen). True bei Erfolg."""
+        try:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "w", encoding="utf-8", newline="") as f:
+                writer = csv.writer(f, delimiter=delimiter)
+                writer.writerow(["", *self.kurse])
+                for kurs, row in zip(self.kurse, self._counts):
+                    writer.writerow([kurs, *row])
+            return True
+        except OSError as e:
+            log.error(f"Kollisionsmatrix konnte nicht gespeichert werden: {e}")
+            return False
+
+
+def _pack(rows: List[int], count: int) -> int:
+    """Bitpositionen -> Ganzzahl (über ein bytearray, ohne große Zwischenzahlen)."""
+    if not rows:
+        return 0
+    data = bytearray((count + 7) // 8)
+    for row in rows:
+        data[row >> 3] |= 1 << (row & 7)
+    return int.from_bytes(data, "little")
+
+
+def main():
+    import argparse
+    from kursplanung import load_kurse
+    from schueler_registry import SchuelerRegistry
+
+    parser = argparse.ArgumentParser(description="Kollisionsmatrix der Kurse aus den Schülerwahlen")
+    parser.add_argument("--schueler", help="Schülerliste (Standard: schueler_master_liste.json)")
+    parser.add_argument("--kurse", help="Kursliste (Standard: kurse.json, falls vorhanden)")
+    parser.add_argument("--output", help="JSON-Ausgabe (Standard: OUTPUT/kollisionen.json)")
+    parser.add_argument("--csv", help="Zusätzlich als CSV speichern")
+    parser.add_argument("--backend", choices=BACKENDS, default="auto")
+    args = parser.parse_args()
+
+    try:
+        registry = SchuelerRegistry.load(args.schueler)
+        kurs_path = Path(args.kurse) if args.kurse else FilePaths.KURSE
+        kurse = list(load_kurse(kurs_path)) if kurs_path.exists() else None
+        matrix = ClashMatrix.from_registry(registry, kurse, args.backend)
+    except ValueError as e:
+        log.error(str(e))
+        sys.exit(1)
+    output = Path(args.output) if args.output else FilePaths.get_output_file("kollisionen.json")
+    ok = matrix.save(output) and (not args.csv or matrix.export_csv(args.csv))
+    if not ok:
+        sys.exit(1)
+    log.info(f"Kollisionsmatrix: {len(matrix.kurse)} Kurse, {len(matrix.students)} Schüler "
+             f"({matrix.backend}) -> {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,11 @@ Dieses Modul stellt eine Klasse Config bereit, die:
 - Eine JSON-Konfigurationsdatei lädt und speichert.
 - Fehlende Standardwerte ergänzt.
 - Einfachen Lese-/Schreibzugriff über get/set ermöglicht.
+- Viele Änderungen gesammelt mit einem einzigen Schreibvorgang speichert
+  (batch) und auf Wunsch verzögert automatisch speichert (autosave_delay).
+- Pro Datei eine gemeinsame Instanz im Prozess anbietet (Config.shared).
+- Änderungen an der Datei durch andere Programme im Hintergrund erkennt
+  und nachlädt (watch, on_change).
 - Auf den Basismodulen file_manager (Pfade) und json_helper (JSON-IO) aufbaut.
 
 Verwendung:
@@ -14,13 +19,40 @@ Verwendung:
     cfg = Config()  # lädt DATEN/CONFIG/settings.json (Default)
     debug = cfg.get("debug", False)
     cfg.set("project_name", "Mein neues Projekt")
+
+    # Mehrere Werte, nur ein Schreibvorgang (bei einer Exception: nichts geändert)
+    with cfg.batch():
+        cfg.set("debug", True)
+        cfg.set("csv_import_mode", "stream")
+
+    # Gemeinsame Instanz für alle Aufrufer im Prozess (lädt die Datei nur einmal)
+    cfg = Config.shared()
+
+    # Interaktiv (Dashboard): erst 1 s nach der letzten Änderung speichern
+    cfg = Config(autosave_delay=1.0)
+    ...
+    cfg.flush()  # ausstehende Änderungen sofort schreiben
+
+    # Langlaufende Prozesse: Datei überwachen, Rückruf erhält die geänderten Schlüssel
+    cfg.on_change(lambda keys: print("geändert:", keys))
+    cfg.watch(interval=1.0)
 """
 
 # ----------------------------------------------------------------------
 # 1. Importe – wir nutzen unsere bereits etablierten Helfer
 # ----------------------------------------------------------------------
+import atexit
+import os
+import threading
+import weakref
+from contextlib import contextmanager
+from pathlib import Path
+
 from json_helper import load_json, save_json          # Robustes JSON-Handling
 from file_manager import FilePaths                     # Zentrale Pfade
+from logger import Logger
+
+log = Logger()
 
 # ----------------------------------------------------------------------
 # 2. Standard-Konfiguration (kann später erweitert werden)
@@ -33,6 +65,23 @@ DEFAULT_CONFIG = {
     # Hier können später beliebig viele weitere Einstellungen ergänzt werden
 }
 
+# Instanzen mit lokal gesetzten, noch nicht gespeicherten Werten – werden beim
+# Beenden des Interpreters von einem einzigen atexit-Hook geschrieben.
+_pending = weakref.WeakSet()
+_pending_lock = threading.Lock()
+
+def _flush_pending():
+    """atexit: ausstehende Änderungen aller Instanzen schreiben (vorher fremde Änderungen übernehmen)."""
+    with _pending_lock:
+        instances = list(_pending)
+        _pending.clear()
+    for instance in instances:
+        if instance._unsaved:
+            instance.reload()
+            instance.flush()
+
+atexit.register(_flush_pending)
+
 # ----------------------------------------------------------------------
 # 3. Die Hauptklasse Config
 # ----------------------------------------------------------------------
@@ -43,9 +92,15 @@ class Config:
     Attribute:
         path (Path): Pfad zur Konfigurationsdatei.
         data (dict): Die geladenen Konfigurationsdaten.
+        autosave_delay (float|None): Wenn gesetzt, speichert set() nicht sofort,
+            sondern erst so viele Sekunden nach der letzten Änderung.
     """
 
-    def __init__(self, config_path=None):
+    # Gemeinsame Instanzen je Datei (siehe shared)
+    _shared = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, config_path=None, autosave_delay=None):
         """
         Initialisiert die Config-Instanz.
 
@@ -53,34 +108,104 @@ class Config:
             config_path (str|Path, optional): Pfad zur JSON-Konfigurationsdatei.
                 Wenn None, wird der Standardpfad verwendet:
                 FilePaths.CONFIG_DIR / "settings.json"
+            autosave_delay (float, optional): Verzögertes Speichern in Sekunden
+                (None = jede Änderung sofort speichern).
         """
         # 1. Pfad festlegen
         if config_path is None:
             # Nutze den zentralen Konfigurationsordner aus file_manager
             self.path = FilePaths.CONFIG_DIR / "settings.json"
         else:
-            self.path = FilePaths._ensure_path(config_path)  # Konvertiere zu Path
+            self.path = Path(config_path)  # Konvertiere zu Path
+
+        self.autosave_delay = autosave_delay
+        self._lock = threading.RLock()
+        self._batch_depth = 0
+        self._dirty = False
+        self._unsaved = set()       # lokal gesetzte, noch nicht gespeicherte Schlüssel
+        self._timer = None
+        self._listeners = []
+        self._signature = None      # (mtime, Größe, inode) beim letzten Laden/Speichern
+        self._watch_stop = None
+        self._wake = threading.Event()
+        self._observer = None
 
         # 2. Daten laden (mit Fallback auf DEFAULT_CONFIG)
-        self.data = load_json(self.path, default=DEFAULT_CONFIG.copy())
+        self._signature = self._stat()
+        exists = self.path.exists()
+        self.data = load_json(self.path, default=None)
+        unreadable = exists and not isinstance(self.data, dict)
+        if not isinstance(self.data, dict):
+            self.data = DEFAULT_CONFIG.copy()
 
         # 3. Sicherstellen, dass alle Standardwerte vorhanden sind
-        self._ensure_defaults()
+        #    (eine neue Datei wird angelegt, eine vorhandene nie überschrieben)
+        self._ensure_defaults(write=not exists)
+        if unreadable:
+            # Kaputte Datei (z.B. halb geschrieben) nicht durch die Standardwerte ersetzen –
+            # geschrieben wird erst bei einem ausdrücklichen set()/update()
+            self._dirty = False
+            log.warning("Konfigurationsdatei nicht lesbar, verwende Standardwerte (Datei bleibt unverändert): %s",
+                        self.path)
+
+    # ------------------------------------------------------------------
+    @classmethod
+    def shared(cls, config_path=None):
+        """
+        Liefert die gemeinsame Instanz für eine Konfigurationsdatei.
+
+        Alle Aufrufer im selben Prozess (csv_importer, Dashboard, ...) teilen
+        sich so dieselben Daten; die Datei wird nur beim ersten Aufruf gelesen
+        und geprüft.
+
+        Args:
+            config_path (str|Path, optional): wie bei Config()
+
+        Returns:
+            Config: Die gemeinsame Instanz.
+        """
+        path = FilePaths.CONFIG_DIR / "settings.json" if config_path is None else Path(config_path)
+        key = path.resolve()
+        with cls._shared_lock:
+            instance = cls._shared.get(key)
+            if instance is None:
+                instance = cls._shared[key] = cls(path)
+            return instance
+
+    @classmethod
+    def reset_shared(cls):
+        """
+        Verwirft alle gemeinsamen Instanzen.
+
+        Der nächste shared()-Aufruf liest die Datei neu – z.B. vor jedem
+        Auftrag in einem wiederverwendeten Worker-Prozess (worker_pool).
+        Lokal gesetzte, noch nicht gespeicherte Werte werden vorher mit dem
+        aktuellen Dateiinhalt zusammengeführt und gespeichert; ohne solche
+        Werte wird nichts geschrieben (fremde Änderungen bleiben unangetastet).
+        """
+        with cls._shared_lock:
+            instances = list(cls._shared.values())
+            cls._shared.clear()
+        for instance in instances:
+            instance.unwatch()
+            if instance._unsaved:
+                instance.reload()
+                instance.flush()
 
     # ------------------------------------------------------------------
-    def _ensure_defaults(self):
+    def _ensure_defaults(self, write=False):
         """
-        Ergänzt fehlende Schlüssel aus DEFAULT_CONFIG in self.data
-        und speichert die Datei, wenn Änderungen vorgenommen wurden.
+        Ergänzt fehlende Schlüssel aus DEFAULT_CONFIG in self.data.
+
+        Ergänzte Werte werden mit der nächsten Änderung gespeichert; nur wenn
+        die Datei noch gar nicht existiert (write=True), wird sie sofort angelegt.
         """
-        changed = False
         for key, value in DEFAULT_CONFIG.items():
             if key not in self.data:
                 self.data[key] = value
-                changed = True
+                self._dirty = True
 
-        # Wenn wir etwas ergänzt haben, sofort speichern
-        if changed:
+        if write:
             self.save()
 
     # ------------------------------------------------------------------
@@ -100,22 +225,252 @@ class Config:
     # ------------------------------------------------------------------
     def set(self, key, value):
         """
-        Setzt einen Konfigurationswert und speichert die Datei sofort.
+        Setzt einen Konfigurationswert und speichert die Datei.
+
+        Gespeichert wird sofort, innerhalb von batch() erst an dessen Ende
+        und mit autosave_delay verzögert.
 
         Args:
             key (str): Der zu setzende Schlüssel.
             value (any): Der neue Wert (muss JSON-serialisierbar sein).
         """
-        self.data[key] = value
-        self.save()
+        with self._lock:
+            self.data[key] = value
+            self._dirty = True
+            self._unsaved.add(key)
+            with _pending_lock:
+                _pending.add(self)  # beim Beenden nicht verlieren (siehe _flush_pending)
+            self._changed()
+
+    # ------------------------------------------------------------------
+    def update(self, values):
+        """
+        Setzt mehrere Werte auf einmal (ein Schreibvorgang).
+
+        Args:
+            values (dict): Schlüssel und neue Werte.
+        """
+        with self.batch():
+            for key, value in dict(values).items():
+                self.set(key, value)
+
+    # ------------------------------------------------------------------
+    @contextmanager
+    def batch(self):
+        """
+        Sammelt Änderungen und speichert sie am Ende einmal.
+
+        Wird der Block durch eine Exception verlassen, werden alle Änderungen
+        darin verworfen. Verschachtelte Blöcke speichern erst beim äußersten.
+
+        Beispiel:
+            with cfg.batch():
+                cfg.set("a", 1)
+                cfg.set("b", 2)
+        """
+        with self._lock:
+            if self._batch_depth == 0:
+                snapshot = (dict(self.data), self._dirty, set(self._unsaved))
+            self._batch_depth += 1
+            try:
+                yield self
+            except BaseException:
+                if self._batch_depth == 1:
+                    self.data.clear()
+                    self.data.update(snapshot[0])
+                    self._dirty = snapshot[1]
+                    self._unsaved = snapshot[2]
+                raise
+            finally:
+                self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._changed()
+
+    # ------------------------------------------------------------------
+    def _changed(self):
+        """Speichert nach einer Änderung – sofort oder verzögert."""
+        if self._batch_depth or not self._dirty:
+            return
+        if self.autosave_delay is None:
+            self.save()
+            return
+        # Debounce: jede Änderung startet den Timer neu
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(self.autosave_delay, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    # ------------------------------------------------------------------
+    def flush(self):
+        """Schreibt ausstehende (verzögerte) Änderungen sofort."""
+        with self._lock:
+            if self._dirty and self._batch_depth == 0:
+                self.save()
 
     # ------------------------------------------------------------------
     def save(self):
         """
         Speichert die aktuellen Konfigurationsdaten in die JSON-Datei.
         Nutzt save_json aus dem json_helper.
+
+        Returns:
+            bool: True bei Erfolg.
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            ok = save_json(self.path, self.data)
+            if ok:
+                self._dirty = False
+                self._unsaved.clear()
+                with _pending_lock:
+                    _pending.discard(self)
+                self._signature = self._stat()  # eigene Änderung nicht als fremde erkennen
+            return ok
+
+    # ------------------------------------------------------------------
+    # Änderungen von außen erkennen
+    # ------------------------------------------------------------------
+    def _stat(self):
+        """Billige Signatur der Datei (ohne sie zu lesen); None, wenn sie fehlt."""
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def on_change(self, callback):
+        """
+        Registriert einen Rückruf für Änderungen, die reload() von der Platte holt.
+
+        Der Rückruf erhält die Menge der geänderten Schlüssel (auch neue und
+        entfernte). Er läuft im Überwachungs-Thread – GUI-Code muss die
+        Arbeit selbst in den Haupt-Thread geben (z.B. über eine Queue).
+
+        Returns:
+            Den Rückruf (so auch als Dekorator verwendbar).
         """
-        save_json(self.path, self.data)
+        with self._lock:
+            self._listeners.append(callback)
+        return callback
+
+    def remove_on_change(self, callback):
+        """Entfernt einen mit on_change registrierten Rückruf."""
+        with self._lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+    def reload(self, force=False):
+        """
+        Lädt die Datei neu, wenn sie sich seit dem letzten Laden/Speichern geändert hat.
+
+        Geprüft wird zuerst nur mtime/Größe; gelesen wird nur bei einer Änderung.
+        Lokal gesetzte, noch nicht gespeicherte Werte bleiben erhalten.
+        Ist die Datei gerade unlesbar (halb geschrieben), wird es beim nächsten
+        Mal erneut versucht.
+
+        Args:
+            force (bool): Auch ohne geänderte Signatur neu lesen.
+
+        Returns:
+            set: Die geänderten Schlüssel (leer, wenn nichts geändert wurde).
+        """
+        signature = self._stat()
+        if not force and signature == self._signature:
+            return set()
+        new = load_json(self.path, default=None)
+        if not isinstance(new, dict):
+            return set()
+
+        with self._lock:
+            for key, value in DEFAULT_CONFIG.items():
+                new.setdefault(key, value)
+            for key in self._unsaved:
+                if key in self.data:
+                    new[key] = self.data[key]
+            changed = {k for k in self.data.keys() | new.keys()
+                       if k not in self.data or k not in new or self.data[k] != new[k]}
+            self.data.clear()
+            self.data.update(new)
+            self._signature = signature
+            listeners = list(self._listeners)
+
+        if changed:
+            for callback in listeners:
+                try:
+                    callback(changed)
+                except Exception:
+                    pass  # ein fehlerhafter Rückruf darf die Überwachung nicht beenden
+        return changed
+
+    def watch(self, interval=1.0, use_watchdog=True):
+        """
+        Überwacht die Datei im Hintergrund und lädt sie bei Änderungen neu.
+
+        Alle `interval` Sekunden werden mtime und Größe verglichen. Ist das
+        Paket watchdog installiert (inotify/FSEvents/...), wird zusätzlich
+        sofort bei einem Dateiereignis geprüft. Mehrfache Aufrufe sind harmlos.
+
+        Args:
+            interval (float): Abstand der Prüfungen in Sekunden.
+            use_watchdog (bool): watchdog verwenden, falls vorhanden.
+        """
+        with self._lock:
+            if self._watch_stop is not None:
+                return
+            self._watch_stop = threading.Event()
+            if use_watchdog:
+                self._observer = self._start_observer()
+            thread = threading.Thread(target=self._watch_loop, args=(interval, self._watch_stop),
+                                      name=f"ConfigWatch-{self.path.name}", daemon=True)
+            thread.start()
+
+    def unwatch(self):
+        """Beendet die Überwachung."""
+        with self._lock:
+            if self._watch_stop is not None:
+                self._watch_stop.set()
+                self._wake.set()
+                self._watch_stop = None
+            if self._observer is not None:
+                self._observer.stop()
+                self._observer = None
+
+    def _watch_loop(self, interval, stop):
+        while not stop.is_set():
+            self._wake.wait(interval)
+            self._wake.clear()
+            if not stop.is_set():
+                self.reload()
+
+    def _start_observer(self):
+        """Startet einen watchdog-Beobachter für den Ordner (None ohne watchdog)."""
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            return None
+
+        name = self.path.name
+        wake = self._wake
+
+        class _Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                paths = (event.src_path, getattr(event, "dest_path", "") or "")
+                if any(os.path.basename(p) == name for p in paths):
+                    wake.set()
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            observer = Observer()
+            observer.daemon = True
+            observer.schedule(_Handler(), str(self.path.parent))
+            observer.start()
+        except OSError:
+            return None  # z.B. inotify-Limit erreicht -> nur Polling
+        return observer
 
     # ------------------------------------------------------------------
     def __repr__(self):
@@ -5,6 +5,34 @@ csv_importer.py – Importiert eine CSV-Datei und speichert sie als JSON.
 
 Verwendung:
     python csv_importer.py --input datei.csv --output datei.json [--delimiter ;]
+                           [--mode full|stream|ndjson] [--chunk-size 1000]
+    python csv_importer.py --batch "*.csv" [--workers 4] [--mode ...] [--force]
+    python csv_importer.py --input datei.csv --delta-key id
+    python csv_importer.py --input datei.csv --sqlite [--sqlite-key id] [--sqlite-index klasse ...]
+
+Mit Schema (--schema datei.json, Sidecar daten.schema.json neben der CSV oder
+Config-Schlüssel "csv_import_schema") werden die Werte typisiert und spaltenweise
+eingelesen (siehe schema_import); --export columnar speichert die Spaltenform,
+--measure vergleicht Speicher und Laufzeit mit dem Import als Liste von Dicts.
+
+Mit --delta-key SPALTE wird die neue Ausgabe über diese Schlüsselspalte mit
+der vorherigen verglichen und ein Änderungssatz (hinzugefügt, entfernt,
+geändert je Feld) neben die Ausgabe geschrieben, z.B. OUTPUT/daten.delta.json
+(siehe import_delta). Wird der Import übersprungen, bleibt der letzte
+Änderungssatz stehen; er lässt sich gefahrlos erneut anwenden.
+
+Mit --sqlite [DATEI] landen die Zeilen statt in einer JSON-Datei in einer
+SQLite-Tabelle (Standard DATEN/toolbox.sqlite3, Tabelle = Name der CSV), in
+einer Transaktion und mit Indizes auf --sqlite-key/--sqlite-index (siehe
+sqlite_store).
+
+Unveränderte Eingabedateien (gleicher Inhalt, gleiche Optionen) werden anhand
+des Manifests OUTPUT/import_manifest.json übersprungen; --force erzwingt den Import.
+
+Modi:
+    full    – liest alle Zeilen in den Speicher und schreibt sie mit save_json (Standard)
+    stream  – schreibt die Zeilen blockweise als JSON-Array (gleiches Format wie full)
+    ndjson  – schreibt die Zeilen blockweise als NDJSON (ein Datensatz pro Zeile)
 
 Das Skript nutzt:
     - file_manager für Pfade
@@ -15,19 +43,35 @@ Das Skript nutzt:
 
 import argparse
 import csv
+import os
 import sys
+import time
 from pathlib import Path
+from typing import Optional
 
 # Eigene Module
 from file_manager import FilePaths
 from logger import Logger
-from json_helper import save_json
+from json_helper import load_json, save_json, save_json_stream
 from config_helper import Config
+from import_delta import delta_path, diff_output, index_output, save_delta
+from import_manifest import ImportManifest, MANIFEST_NAME, file_digest
+from progress import Progress
+from schema_import import load_schema, measure_import, read_columnar, save_columnar, save_records
 
 # Logger initialisieren
 log = Logger()
 
-def csv_to_json(csv_path: Path, json_path: Path, delimiter: str = ';') -> bool:
+# Verfügbare Import-Modi (siehe Modul-Docstring)
+MODES = ("full", "stream", "ndjson")
+# Exportformate beim Import mit Schema
+EXPORTS = ("records", "columnar")
+DEFAULT_CHUNK_SIZE = 1000
+
+def csv_to_json(csv_path: Path, json_path: Path, delimiter: str = ';',
+                mode: str = "full", chunk_size: int = DEFAULT_CHUNK_SIZE,
+                schema: Optional[dict] = None, export: str = "records",
+                delta_key: Optional[str] = None) -> bool:
     """
     Liest eine CSV-Datei und speichert die Daten als JSON.
 
@@ -35,38 +79,424 @@ def csv_to_json(csv_path: Path, json_path: Path, delimiter: str = ';') -> bool:
         csv_path: Pfad zur CSV-Datei
         json_path: Pfad zur Ausgabe-JSON
         delimiter: Trennzeichen (Standard ';')
+        mode: "full" (alles im Speicher), "stream" (JSON-Array blockweise)
+              oder "ndjson" (eine Zeile pro Datensatz, blockweise)
+        chunk_size: Zeilen pro Block in den Modi "stream" und "ndjson"
+        schema: Optionales Schema (siehe schema_import) – Werte werden dann typisiert
+        export: Mit Schema: "records" (Liste von Dicts) oder "columnar" (Spaltenform)
+        delta_key: Schlüsselspalte – zusätzlich Änderungssatz zur vorherigen Ausgabe schreiben
 
     Returns:
         True bei Erfolg, False bei Fehler
     """
     try:
-        # CSV lesen
-        log.info(f"Lese CSV: {csv_path}")
-        with open(csv_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f, delimiter=delimiter)
-            data = list(reader)
-        log.info(f"{len(data)} Zeilen gelesen.")
-
-        # JSON speichern
-        save_json(json_path, data)
-        log.info(f"JSON gespeichert: {json_path}")
+        _convert(csv_path, json_path, delimiter, mode, chunk_size, schema, export, delta_key=delta_key)
         return True
 
     except Exception as e:
-        log.error(f"Fehler beim Import: {e}")
+        log.error("Fehler beim Import: %s", e, file=Path(csv_path).name)
         return False
 
+def _convert(csv_path: Path, json_path: Path, delimiter: str, mode: str, chunk_size: int,
+             schema: Optional[dict] = None, export: str = "records", report: bool = True,
+             delta_key: Optional[str] = None) -> int:
+    """
+    Eigentliche Konvertierung für csv_to_json und den Batch-Modus.
+
+    report: Fortschritt melden (siehe progress) – im Batch meldet import_batch
+    stattdessen die fertigen Dateien.
+    delta_key: Schlüsselspalte für den Änderungssatz (siehe _write_delta)
+
+    Returns:
+        Anzahl gelesener Zeilen. Fehler werden als Exception weitergereicht.
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unbekannter Modus: {mode}")
+    if delta_key:
+        # Erst in eine temporäre Datei konvertieren und vergleichen – die alte Ausgabe
+        # wird nur ersetzt, wenn auch der Änderungssatz geschrieben ist. Die Endung
+        # bleibt erhalten (z.B. .json.gz).
+        json_path = Path(json_path)
+        tmp_path = json_path.with_name(f".{os.getpid()}.{json_path.name}")
+        try:
+            rows = _convert(csv_path, tmp_path, delimiter, mode, chunk_size, schema, export, report)
+            previous = index_output(json_path, delta_key)
+            _write_delta(previous, json_path, delta_key, tmp_path)
+            os.replace(tmp_path, json_path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+        return rows
+    progress = None
+    if report:
+        progress = Progress(unit="Zeilen", label=Path(csv_path).name, bytes_total=os.path.getsize(csv_path))
+    if schema is not None:
+        rows = _convert_with_schema(csv_path, json_path, delimiter, mode, chunk_size, schema, export, progress)
+        if progress is not None:
+            progress.finish(rows)
+        return rows
+
+    # CSV lesen
+    start = time.perf_counter()
+    log.info("Lese CSV: %s", csv_path)
+    with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.DictReader(f, delimiter=delimiter)
+        if mode == "full":
+            data = list(_RowCounter(reader, progress, f.buffer.tell))
+            rows = len(data)
+            log.info("%d Zeilen gelesen.", rows)
+            ok = save_json(json_path, data)
+        else:
+            # Zeilen direkt vom Reader in die Datei – der Speicherbedarf
+            # hängt nur von chunk_size ab, nicht von der Dateigröße.
+            counter = _RowCounter(reader, progress, f.buffer.tell)
+            ok = save_json_stream(json_path, counter, ndjson=(mode == "ndjson"),
+                                  chunk_size=chunk_size)
+            rows = counter.count
+            if counter.error is not None:
+                # save_json_stream meldet nur False – den eigentlichen Lesefehler weitergeben
+                raise counter.error
+            log.info("%d Zeilen gelesen.", rows)
+
+    if not ok:
+        raise OSError(f"JSON konnte nicht geschrieben werden: {json_path}")
+    if progress is not None:
+        progress.finish(rows)
+    log.info("JSON gespeichert: %s", json_path, file=Path(csv_path).name, rows=rows, mode=mode,
+             seconds=round(time.perf_counter() - start, 3))
+    return rows
+
+def _convert_with_schema(csv_path: Path, json_path: Path, delimiter: str, mode: str,
+                         chunk_size: int, schema: dict, export: str,
+                         progress: Optional[Progress] = None) -> int:
+    """Typisierter Import über schema_import (spaltenweise im Speicher)."""
+    if export not in EXPORTS:
+        raise ValueError(f"Unbekanntes Exportformat: {export}")
+
+    log.info("Lese CSV mit Schema: %s", csv_path)
+    start = time.perf_counter()
+    table = read_columnar(csv_path, schema, delimiter, progress)
+    seconds = time.perf_counter() - start
+    # nbytes() läuft über alle Spalten – nur berechnen, wenn die Meldung ausgegeben wird
+    log.info(lambda: f"{len(table)} Zeilen gelesen ({table.nbytes() // 1024} KiB spaltenweise, "
+                     f"{seconds:.2f} s).")
+
+    if export == "columnar":
+        ok = save_columnar(table, json_path)
+    else:
+        ok = save_records(table, json_path, ndjson=(mode == "ndjson"), chunk_size=chunk_size)
+    if not ok:
+        raise OSError(f"JSON konnte nicht geschrieben werden: {json_path}")
+    log.info("JSON gespeichert: %s", json_path, file=Path(csv_path).name, rows=len(table),
+             export=export, seconds=round(time.perf_counter() - start, 3))
+    return len(table)
+
+def _write_delta(previous: dict, json_path: Path, delta_key: str, new_path: Optional[Path] = None):
+    """
+    Vergleicht die neue Ausgabe (new_path, Standard json_path) mit dem Index der
+    alten und speichert den Änderungssatz neben json_path.
+    """
+    delta = diff_output(previous, new_path or json_path, delta_key)
+    path = delta_path(json_path)
+    if not save_delta(path, delta):
+        raise OSError(f"Änderungssatz konnte nicht geschrieben werden: {path}")
+    stats = delta["statistik"]
+    log.info("Änderungssatz gespeichert: %s (%d neu, %d entfernt, %d geändert)", path,
+             stats["hinzugefuegt"], stats["entfernt"], stats["geaendert"], file=json_path.name)
+
+def csv_to_sqlite(csv_path: Path, db_path: Optional[Path] = None, table: Optional[str] = None,
+                  key: Optional[str] = None, indexes=(), delimiter: str = ';',
+                  schema: Optional[dict] = None, journal_mode: Optional[str] = None) -> bool:
+    """
+    Liest eine CSV-Datei in eine SQLite-Tabelle (ersetzt die Tabelle).
+
+    Args:
+        csv_path: Pfad zur CSV-Datei
+        db_path: Datenbank (Standard DATEN/toolbox.sqlite3)
+        table: Tabellenname (Standard: Dateiname der CSV ohne Endung)
+        key: Schlüsselspalte (PRIMARY KEY) für get/upsert
+        indexes: Weitere Spalten mit Index
+        delimiter: Trennzeichen (Standard ';')
+        schema: Optionales Schema (siehe schema_import) – Werte werden dann typisiert
+        journal_mode: Journal-Modus der Datenbank (Standard DELETE, siehe sqlite_store)
+
+    Returns:
+        True bei Erfolg, False bei Fehler
+    """
+    try:
+        _convert_sqlite(csv_path, db_path, table, key, indexes, delimiter, schema, journal_mode)
+        return True
+
+    except Exception as e:
+        log.error("Fehler beim Import: %s", e, file=Path(csv_path).name)
+        return False
+
+def _convert_sqlite(csv_path: Path, db_path: Optional[Path], table: Optional[str], key: Optional[str],
+                    indexes, delimiter: str, schema: Optional[dict] = None,
+                    journal_mode: Optional[str] = None) -> int:
+    """Massenimport für csv_to_sqlite. Returns: Anzahl Zeilen."""
+    # Erst hier laden: sqlite3 brauchen nur Importe in die Datenbank
+    from sqlite_store import SqliteStore
+
+    table = table or Path(csv_path).stem
+    progress = Progress(unit="Zeilen", label=Path(csv_path).name, bytes_total=os.path.getsize(csv_path))
+    start = time.perf_counter()
+    log.info("Lese CSV in SQLite-Tabelle %s: %s", table, csv_path)
+    with SqliteStore(db_path, journal_mode) as store:
+        if schema is not None:
+            records = read_columnar(csv_path, schema, delimiter, progress)
+            rows = store.bulk_load(table, records.iter_records(), key, indexes)
+        else:
+            with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+                counter = _RowCounter(csv.DictReader(f, delimiter=delimiter), progress, f.buffer.tell)
+                rows = store.bulk_load(table, counter, key, indexes)
+        db = store.path
+    progress.finish(rows)
+    log.info("SQLite-Tabelle gespeichert: %s", table, file=Path(csv_path).name, rows=rows, db=str(db),
+             seconds=round(time.perf_counter() - start, 3))
+    return rows
+
+class _RowCounter:
+    """
+    Reicht die Zeilen eines Readers durch, zählt sie und merkt sich Lesefehler.
+
+    Mit progress wird alle 1024 Zeilen der Stand gemeldet (position liefert
+    die gelesenen Bytes; der Melder drosselt selbst).
+    """
+
+    def __init__(self, rows, progress: Optional[Progress] = None, position=None):
+        self.rows = rows
+        self.count = 0
+        self.error = None
+        self.progress = progress if progress is not None and progress.enabled else None
+        self.position = position
+
+    def __iter__(self):
+        try:
+            if self.progress is None:
+                for row in self.rows:
+                    self.count += 1
+                    yield row
+            else:
+                progress, position = self.progress, self.position
+                for row in self.rows:
+                    self.count += 1
+                    if not self.count & 1023:
+                        progress.update(self.count, position() if position else None)
+                    yield row
+        except Exception as e:
+            self.error = e
+            raise
+
+# ----------------------------------------------------------------------
+# Batch-Modus: mehrere Dateien aus dem INPUT-Ordner parallel konvertieren
+# ----------------------------------------------------------------------
+def output_name(csv_path: Path, mode: str) -> str:
+    """Name der Ausgabedatei für eine CSV im Batch-Modus (z.B. schule_a.json)."""
+    suffix = ".ndjson" if mode == "ndjson" else ".json"
+    return Path(csv_path).stem + suffix
+
+def import_options(delimiter: str, mode: str, schema: Optional[dict] = None,
+                   export: str = "records", delta_key: Optional[str] = None) -> dict:
+    """
+    Optionen, die das Ergebnis beeinflussen (werden im Manifest verglichen).
+
+    delta_key gehört dazu: ein Import mit neuem Schlüssel muss laufen, sonst
+    entsteht kein Änderungssatz.
+    """
+    options = {"delimiter": delimiter, "mode": mode}
+    if schema is not None:
+        options.update(schema=schema, export=export)
+    if delta_key:
+        options["delta_key"] = delta_key
+    return options
+
+def _convert_file(csv_path: Path, json_path: Path, delimiter: str, mode: str, chunk_size: int,
+                  schema: Optional[dict] = None, export: str = "records",
+                  delta_key: Optional[str] = None) -> dict:
+    """
+    Konvertiert eine Datei im Worker-Prozess und liefert eine Statistik.
+
+    Der Inhalts-Hash für das Manifest wird vor der Konvertierung im Worker
+    berechnet, damit auch das Hashen parallel läuft.
+
+    Returns:
+        dict mit input, output, rows, bytes, seconds, sha256, skipped, error (None bei Erfolg)
+    """
+    start = time.perf_counter()
+    result = {"input": str(csv_path), "output": str(json_path), "rows": 0, "bytes": 0,
+              "seconds": 0.0, "sha256": None, "skipped": False, "error": None}
+    try:
+        result["bytes"] = os.path.getsize(csv_path)
+        result["sha256"] = file_digest(csv_path)
+        result["rows"] = _convert(csv_path, json_path, delimiter, mode, chunk_size, schema, export,
+                                  report=False, delta_key=delta_key)
+    except Exception as e:
+        log.error("Fehler beim Import: %s", e, file=Path(csv_path).name)
+        result["error"] = str(e) or type(e).__name__
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+def import_batch(pattern: str = "*.csv", workers: Optional[int] = None, delimiter: str = ';',
+                 mode: str = "full", chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 input_dir: Optional[Path] = None, output_dir: Optional[Path] = None,
+                 force: bool = False, manifest: Optional[ImportManifest] = None,
+                 schema: Optional[dict] = None, export: str = "records",
+                 delta_key: Optional[str] = None) -> list:
+    """
+    Konvertiert alle Dateien in input_dir, die auf pattern passen, parallel.
+
+    Jede Datei wird genauso verarbeitet wie mit csv_to_json; die Ausgabe
+    landet unter gleichem Namen (Endung .json bzw. .ndjson) in output_dir.
+
+    Args:
+        pattern: Glob-Muster relativ zu input_dir (z.B. "*.csv" oder "schule_*.csv")
+        workers: Anzahl Worker-Prozesse (None = Anzahl CPU-Kerne)
+        delimiter, mode, chunk_size: wie bei csv_to_json
+        input_dir: Eingabeordner (Standard FilePaths.INPUT_DIR)
+        output_dir: Ausgabeordner (Standard FilePaths.OUTPUT_DIR)
+        force: Auch unveränderte Dateien erneut konvertieren
+        manifest: Manifest für inkrementelle Importe (Standard output_dir/import_manifest.json)
+        schema: Standard-Schema; eine Sidecar-Datei neben der CSV hat Vorrang
+        export: Exportformat beim Import mit Schema
+        delta_key: Schlüsselspalte – je Datei einen Änderungssatz schreiben (siehe import_delta)
+
+    Returns:
+        Liste der Statistiken je Datei (siehe _convert_file), sortiert nach Eingabedatei.
+        Übersprungene Dateien haben skipped=True.
+    """
+    input_dir = Path(input_dir) if input_dir else FilePaths.INPUT_DIR
+    output_dir = Path(output_dir) if output_dir else FilePaths.OUTPUT_DIR
+    files = sorted(p for p in input_dir.glob(pattern) if p.is_file())
+    if not files:
+        log.warning("Keine Dateien für Muster '%s' in %s gefunden.", pattern, input_dir)
+        return []
+
+    if manifest is None:
+        manifest = ImportManifest(output_dir / MANIFEST_NAME)
+
+    # Unveränderte Dateien aussortieren
+    results = {}
+    jobs = []
+    job_options = {}
+    for f in files:
+        json_path = output_dir / output_name(f, mode)
+        file_schema = load_schema(f, schema)
+        options = job_options[f] = import_options(delimiter, mode, file_schema, export, delta_key)
+        if not force and manifest.is_current(f, json_path, options):
+            results[f] = {"input": str(f), "output": str(json_path), "rows": 0,
+                          "bytes": f.stat().st_size, "seconds": 0.0, "sha256": None,
+                          "skipped": True, "error": None}
+        else:
+            jobs.append((f, json_path, delimiter, mode, chunk_size, file_schema, export, delta_key))
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(jobs) or 1))
+    log.info("Batch-Import: %d von %d Dateien mit %d Prozessen", len(jobs), len(files), workers)
+
+    # Fortschritt in fertigen Dateien (die Worker selbst melden nichts)
+    progress = Progress(total=len(jobs), unit="Dateien", label=pattern,
+                        bytes_total=sum(job[0].stat().st_size for job in jobs))
+    done_bytes = 0
+    if workers == 1:
+        # Ohne Pool – spart den Start der Worker-Prozesse
+        converted = []
+        for job in jobs:
+            converted.append(_convert_file(*job))
+            done_bytes += converted[-1]["bytes"]
+            progress.update(len(converted), done_bytes)
+    else:
+        # Erst hier importieren: concurrent.futures/multiprocessing kosten beim Start spürbar Zeit
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_convert_file, *job) for job in jobs]
+            for count, future in enumerate(as_completed(futures), 1):
+                done_bytes += future.result()["bytes"]
+                progress.update(count, done_bytes)
+            converted = [future.result() for future in futures]
+    progress.finish()
+
+    # Manifest nur im Hauptprozess pflegen
+    for job, result in zip(jobs, converted):
+        results[job[0]] = result
+        if result["error"] is None:
+            manifest.record(job[0], job[1], job_options[job[0]], digest=result["sha256"])
+        else:
+            manifest.forget(job[0])
+    manifest.save()
+
+    return [results[f] for f in files]
+
+def print_summary(results: list):
+    """Gibt eine Übersicht über einen Batch-Lauf aus."""
+    if not results:
+        return
+    width = max(len(Path(r["input"]).name) for r in results)
+    print()
+    print(f"{'Datei'.ljust(width)}  {'Zeilen':>10}  {'Bytes':>12}  {'Sekunden':>9}  Status")
+    for r in results:
+        if r["error"] is not None:
+            status = f"FEHLER: {r['error']}"
+        else:
+            status = "übersprungen" if r.get("skipped") else "OK"
+        print(f"{Path(r['input']).name.ljust(width)}  {r['rows']:>10}  {r['bytes']:>12}  "
+              f"{r['seconds']:>9.2f}  {status}")
+
+    failed = [r for r in results if r["error"] is not None]
+    skipped = [r for r in results if r.get("skipped")]
+    converted = len(results) - len(failed) - len(skipped)
+    print(f"\n{len(results)} Dateien: {converted} konvertiert, {len(skipped)} übersprungen, "
+          f"{len(failed)} Fehler – {sum(r['rows'] for r in results)} Zeilen, "
+          f"{sum(r['bytes'] for r in results)} Bytes, "
+          f"{sum(r['seconds'] for r in results):.2f} s")
+
 def main():
     parser = argparse.ArgumentParser(description="CSV-zu-JSON-Importer")
     parser.add_argument("--input", help="Name der CSV-Datei im INPUT-Ordner (z.B. daten.csv)")
     parser.add_argument("--output", help="Name der JSON-Datei im OUTPUT-Ordner (optional)")
     parser.add_argument("--delimiter", default=';', help="Feldtrenner (Standard ';')")
+    parser.add_argument("--mode", choices=MODES, help="Import-Modus: full, stream oder ndjson (Standard full)")
+    parser.add_argument("--chunk-size", type=int, help=f"Zeilen pro Block bei stream/ndjson (Standard {DEFAULT_CHUNK_SIZE})")
+    parser.add_argument("--batch", metavar="GLOB", help="Alle passenden Dateien im INPUT-Ordner konvertieren (z.B. '*.csv')")
+    parser.add_argument("--workers", type=int, help="Anzahl paralleler Prozesse im Batch-Modus (Standard: CPU-Kerne)")
+    parser.add_argument("--force", action="store_true", help="Auch unveränderte Dateien neu importieren")
+    parser.add_argument("--schema", help="Schema-Datei (JSON) für einen typisierten Import")
+    parser.add_argument("--export", choices=EXPORTS, default="records", help="Exportformat mit Schema (Standard records)")
+    parser.add_argument("--measure", action="store_true", help="Speicher/Laufzeit mit und ohne Schema vergleichen")
+    parser.add_argument("--delta-key", metavar="SPALTE", help="Änderungssatz zur vorherigen Ausgabe über diese Schlüsselspalte schreiben")
+    parser.add_argument("--sqlite", nargs="?", const="", metavar="DATEI", help="In eine SQLite-Datenbank importieren (Standard DATEN/toolbox.sqlite3)")
+    parser.add_argument("--table", help="Tabellenname bei --sqlite (Standard: Name der CSV)")
+    parser.add_argument("--sqlite-key", metavar="SPALTE", help="Schlüsselspalte der Tabelle (z.B. id)")
+    parser.add_argument("--sqlite-index", nargs="*", metavar="SPALTE", help="Spalten mit Index (z.B. klasse jahrgang)")
     args = parser.parse_args()
 
+    FilePaths.ensure_dirs()  # INPUT/OUTPUT anlegen, damit der Nutzer sie findet
+
     # Wenn keine Argumente, Config fragen (optional)
-    cfg = Config()
+    cfg = Config.shared()
     default_input = cfg.get("csv_import_default_input", "daten.csv")
     default_output = cfg.get("csv_import_default_output", "daten.json")
+    mode = args.mode or cfg.get("csv_import_mode", "full")
+    chunk_size = args.chunk_size or cfg.get("csv_import_chunk_size", DEFAULT_CHUNK_SIZE)
+    delta_key = args.delta_key or cfg.get("csv_import_delta_key")
+    if args.schema:
+        default_schema = load_json(args.schema, default=None)
+        if default_schema is None:
+            log.error("Schema-Datei nicht lesbar: %s", args.schema)
+            sys.exit(1)
+    else:
+        default_schema = cfg.get("csv_import_schema")
+
+    # Batch-Modus: Ausgabenamen ergeben sich aus den Eingabedateien
+    if args.batch:
+        if args.sqlite is not None:
+            log.error("--sqlite geht nur mit --input (eine Datenbank, ein Schreiber).")
+            sys.exit(1)
+        workers = args.workers or cfg.get("csv_import_workers")
+        results = import_batch(args.batch, workers, args.delimiter, mode, chunk_size, force=args.force,
+                               schema=default_schema, export=args.export, delta_key=delta_key)
+        print_summary(results)
+        failed = not results or any(r["error"] is not None for r in results)
+        sys.exit(1 if failed else 0)
 
     input_file = args.input or default_input
     output_file = args.output or default_output
@@ -77,14 +507,46 @@ def main():
 
     # Prüfen, ob Eingabedatei existiert
     if not csv_path.exists():
-        log.error(f"Eingabedatei nicht gefunden: {csv_path}")
+        log.error("Eingabedatei nicht gefunden: %s", csv_path)
         sys.exit(1)
 
+    schema = load_schema(csv_path, default_schema)
+    if args.measure:
+        if schema is None:
+            log.error("--measure braucht ein Schema.")
+            sys.exit(1)
+        stats = measure_import(csv_path, schema, args.delimiter)
+        print(f"{stats['rows']} Zeilen")
+        print(f"Liste von Dicts: {stats['dict_bytes'] / 2**20:8.2f} MiB  {stats['dict_seconds']:6.2f} s")
+        print(f"Spaltenweise:    {stats['columnar_bytes'] / 2**20:8.2f} MiB  {stats['columnar_seconds']:6.2f} s")
+
+    # In die Datenbank statt in eine JSON-Datei
+    if args.sqlite is not None:
+        key = args.sqlite_key or cfg.get("csv_import_sqlite_key")
+        indexes = args.sqlite_index if args.sqlite_index is not None else cfg.get("csv_import_sqlite_indexes", [])
+        ok = csv_to_sqlite(csv_path, Path(args.sqlite) if args.sqlite else None, args.table, key, indexes,
+                           args.delimiter, schema, cfg.get("sqlite_journal_mode"))
+        sys.exit(0 if ok else 1)
+
+    # Unveränderte Eingabe überspringen
+    manifest = ImportManifest()
+    options = import_options(args.delimiter, mode, schema, args.export, delta_key)
+    if not args.force and manifest.is_current(csv_path, json_path, options):
+        manifest.save()
+        log.info("Eingabe unverändert, Import übersprungen (--force erzwingt ihn): %s", csv_path)
+        log.info("0 Dateien konvertiert, 1 übersprungen.")
+        sys.exit(0)
+
     # Import durchführen
-    success = csv_to_json(csv_path, json_path, args.delimiter)
+    digest = file_digest(csv_path)
+    success = csv_to_json(csv_path, json_path, args.delimiter, mode=mode, chunk_size=chunk_size,
+                          schema=schema, export=args.export, delta_key=delta_key)
 
     if success:
+        manifest.record(csv_path, json_path, options, digest=digest)
+        manifest.save()
         log.info("Import erfolgreich abgeschlossen.")
+        log.info("1 Datei konvertiert, 0 übersprungen.")
         sys.exit(0)
     else:
         log.error("Import fehlgeschlagen.")
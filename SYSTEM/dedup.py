@@ -0,0 +1,358 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+dedup.py – Findet doppelte Schüler in (zusammengeführten) Importen.
+
+Paarweise Vergleiche aller Datensätze wachsen quadratisch. Stattdessen
+bekommt jeder Datensatz einige Blockschlüssel, und verglichen werden nur
+Datensätze mit gemeinsamem Schlüssel:
+    - Kölner Phonetik von Nachname und Vorname   ("Meier Jan" = "Mayer Jan")
+    - Geburtsdatum + Anfang des Nachnamens       (Tippfehler im Vornamen)
+    - Geburtsdatum + Anfang des Vornamens        (Tippfehler im Nachnamen)
+Namen werden vorher normalisiert (Kleinschreibung, ä -> ae, ß -> ss, Akzente
+und Satzzeichen weg). Blöcke mit mehr als max_block Einträgen (z.B. lauter
+"Müller Anna" ohne Datum) werden übersprungen und in der Statistik gezählt –
+so bleibt der Aufwand etwa linear.
+
+Kandidaten bekommen eine Punktzahl aus Namensähnlichkeit (difflib) und
+Geburtsdatum; ab threshold gelten sie als Treffer. Der Bericht enthält die
+Paare mit Begründung und die daraus entstehenden Gruppen.
+
+Eingabe sind Ausgaben von csv_to_json (JSON-Array, auch im stream-Modus,
+oder NDJSON) – sie werden elementweise gelesen.
+
+Verwendung:
+    python dedup.py schule_a.json schule_b.ndjson [--output duplikate.json]
+                    [--threshold 0.85] [--max-block 200]
+"""
+
+import re
+import sys
+import unicodedata
+from datetime import datetime
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from file_manager import FilePaths
+from json_helper import iter_records, save_json
+from logger import Logger
+from progress import Progress
+
+log = Logger()
+
+DEFAULT_THRESHOLD = 0.85
+DEFAULT_MAX_BLOCK = 200
+# Gewichte der Punktzahl (Summe 1)
+WEIGHTS = {"nachname": 0.35, "vorname": 0.35, "geburtsdatum": 0.3}
+
+_TRANSLIT = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue", "ß": "ss"})
+_NON_LETTERS = re.compile(r"[^a-z ]+")
+_SPACES = re.compile(r" {2,}")
+_DATE_FORMATS = ("%Y-%m-%d", "%d.%m.%Y")
+
+
+# ----------------------------------------------------------------------
+# Normalisierung und Kölner Phonetik
+# ----------------------------------------------------------------------
+def normalize_name(text: Optional[str]) -> str:
+    """"  Müller-Lüdenscheidt " -> "mueller luedenscheidt"."""
+    if not text:
+        return ""
+    text = str(text).lower().translate(_TRANSLIT)
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    text = _NON_LETTERS.sub(" ", text)
+    return _SPACES.sub(" ", text).strip()
+
+
+def koelner_phonetik(text: Optional[str]) -> str:
+    """
+    Kölner Phonetik (Postel 1969): ähnlich klingende deutsche Namen bekommen
+    denselben Ziffernschlüssel, z.B. "Meier", "Mayer", "Maier" -> "67".
+    """
+    letters = [c for c in normalize_name(text).upper() if "A" <= c <= "Z"]
+    codes = []
+    for i, c in enumerate(letters):
+        prev = letters[i - 1] if i else ""
+        nxt = letters[i + 1] if i + 1 < len(letters) else ""
+        if c in "AEIJOUY":
+            code = "0"
+        elif c == "H":
+            code = ""
+        elif c == "B":
+            code = "1"
+        elif c == "P":
+            code = "3" if nxt == "H" else "1"
+        elif c in "DT":
+            code = "8" if nxt in ("C", "S", "Z") else "2"
+        elif c in "FVW":
+            code = "3"
+        elif c in "GKQ":
+            code = "4"
+        elif c == "C":
+            if i == 0:
+                code = "4" if nxt in ("A", "H", "K", "L", "O", "Q", "R", "U", "X") else "8"
+            elif prev in ("S", "Z"):
+                code = "8"
+            else:
+                code = "4" if nxt in ("A", "H", "K", "O", "Q", "U", "X") else "8"
+        elif c == "X":
+            code = "8" if prev in ("C", "K", "Q") else "48"
+        elif c == "L":
+            code = "5"
+        elif c in "MN":
+            code = "6"
+        elif c == "R":
+            code = "7"
+        else:  # S, Z
+            code = "8"
+        codes.append(code)
+    # Doppelte Ziffern zusammenfassen, dann alle 0 außer am Anfang entfernen
+    result = []
+    for digit in "".join(codes):
+        if not result or result[-1] != digit:
+            result.append(digit)
+    return (result[0] if result else "") + "".join(d for d in result[1:] if d != "0")
+
+
+def parse_date(value) -> Optional[str]:
+    """Geburtsdatum als ISO-Text ("2008-03-01") oder None."""
+    if not value:
+        return None
+    text = str(value).strip()
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date().isoformat()
+        except ValueError:
+            continue
+    return None
+
+
+def date_similarity(a: Optional[str], b: Optional[str]) -> float:
+    """1 gleich, 0.6 ein Teil anders oder Tag/Monat vertauscht, 0.5 unbekannt, sonst 0."""
+    if a is None or b is None:
+        return 0.5
+    if a == b:
+        return 1.0
+    ya, ma, da = a.split("-")
+    yb, mb, db = b.split("-")
+    if (ya, ma, da) == (yb, db, mb) or sum(x != y for x, y in zip((ya, ma, da), (yb, mb, db))) == 1:
+        return 0.6
+    return 0.0
+
+
+def name_similarity(a: str, b: str) -> float:
+    if a == b:
+        return 1.0
+    if not a or not b:
+        return 0.0
+    return SequenceMatcher(None, a, b).ratio()
+
+
+# ----------------------------------------------------------------------
+# Suche
+# ----------------------------------------------------------------------
+class DuplicateFinder:
+    """
+    Sammelt Datensätze, bildet Blöcke und vergleicht innerhalb der Blöcke.
+
+    Je Datensatz wird nur ein kleines Tupel behalten (Quelle, Zeile, id,
+    normalisierte Namen, Datum), nicht der ganze Datensatz.
+
+    Args:
+        threshold: Mindestpunktzahl für einen Treffer (0..1)
+        max_block: Größere Blöcke werden nicht verglichen
+    """
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD, max_block: int = DEFAULT_MAX_BLOCK):
+        self.threshold = threshold
+        self.max_block = max_block
+        self._entries: List[tuple] = []
+        self._blocks: Dict[tuple, List[int]] = {}
+        self._phonetic: Dict[str, str] = {}        # Cache: Namen wiederholen sich oft
+        self.stats = {"datensaetze": 0, "ohne_namen": 0, "bloecke": 0, "zu_grosse_bloecke": 0,
+                      "uebersprungen": 0, "vergleiche": 0, "treffer": 0, "gruppen": 0}
+
+    def add(self, record: dict, source: str = "", line: int = 0) -> Optional[int]:
+        """Nimmt einen Datensatz auf. Liefert seine Nummer (None ohne Namen)."""
+        self.stats["datensaetze"] += 1
+        nachname, vorname = _names(record)
+        nachname, vorname = normalize_name(nachname), normalize_name(vorname)
+        if not nachname and not vorname:
+            self.stats["ohne_namen"] += 1
+            return None
+        geburtsdatum = parse_date(record.get("geburtsdatum"))
+        index = len(self._entries)
+        self._entries.append((source, line, record.get("id"), nachname, vorname, geburtsdatum))
+        for key in self._keys(nachname, vorname, geburtsdatum):
+            block = self._blocks.get(key)
+            if block is None:
+                self._blocks[key] = [index]
+            else:
+                block.append(index)
+        return index
+
+    def add_file(self, path: Union[str, Path]) -> int:
+        """Liest eine Importer-Ausgabe elementweise ein. Liefert die Anzahl Datensätze."""
+        path = Path(path)
+        count = 0
+        with Progress(unit="Datensätze", label=path.name) as progress:
+            for count, record in enumerate(iter_records(path), 1):
+                if isinstance(record, dict):
+                    self.add(record, path.name, count)
+                progress.update(count)
+        return count
+
+    def _phon(self, name: str) -> str:
+        code = self._phonetic.get(name)
+        if code is None:
+            code = self._phonetic[name] = koelner_phonetik(name)
+        return code
+
+    def _keys(self, nachname: str, vorname: str, geburtsdatum: Optional[str]) -> List[tuple]:
+        keys = [("p", self._phon(nachname), self._phon(vorname))]
+        if geburtsdatum:
+            keys.append(("n", geburtsdatum, nachname[:3]))
+            keys.append(("v", geburtsdatum, vorname[:3]))
+        return keys
+
+    def candidates(self) -> Iterable[Tuple[int, int]]:
+        """Paare (i, j) mit i < j aus gemeinsamen Blöcken, jedes Paar einmal."""
+        seen = set()
+        stats = self.stats
+        for block in self._blocks.values():
+            size = len(block)
+            if size < 2:
+                continue
+            stats["bloecke"] += 1
+            if size > self.max_block:
+                stats["zu_grosse_bloecke"] += 1
+                stats["uebersprungen"] += size
+                continue
+            for x in range(size):
+                i = block[x]
+                for y in range(x + 1, size):
+                    pair = (i, block[y])
+                    if pair not in seen:
+                        seen.add(pair)
+                        yield pair
+
+    def score(self, i: int, j: int) -> Tuple[float, Dict[str, float]]:
+        """Punktzahl (0..1) und Einzelwerte für zwei Datensätze."""
+        a, b = self._entries[i], self._entries[j]
+        details = {"nachname": name_similarity(a[3], b[3]), "vorname": name_similarity(a[4], b[4]),
+                   "geburtsdatum": date_similarity(a[5], b[5])}
+        return sum(WEIGHTS[k] * v for k, v in details.items()), details
+
+    def find(self) -> List[dict]:
+        """Alle Treffer, absteigend nach Punktzahl."""
+        matches = []
+        entries, threshold = self._entries, self.threshold
+        names_weight = WEIGHTS["nachname"] + WEIGHTS["vorname"]
+        for i, j in self.candidates():
+            self.stats["vergleiche"] += 1
+            # Ohne Namensvergleich verwerfen, wenn selbst gleiche Namen nicht reichen
+            if names_weight + WEIGHTS["geburtsdatum"] * date_similarity(entries[i][5], entries[j][5]) < threshold:
+                continue
+            total, details = self.score(i, j)
+            if total >= self.threshold:
+                matches.append({"a": self._ref(i), "b": self._ref(j), "score": round(total, 3),
+                                "details": {k: round(v, 3) for k, v in details.items()},
+                                "_pair": (i, j)})
+        matches.sort(key=lambda m: -m["score"])
+        self.stats["treffer"] = len(matches)
+        return matches
+
+    def groups(self, matches: Sequence[dict]) -> List[List[dict]]:
+        """Zusammenhängende Treffer als Gruppen (Union-Find), größte zuerst."""
+        parent = {}
+
+        def root(x):
+            while parent.get(x, x) != x:
+                parent[x] = parent.get(parent[x], parent[x])  # Pfad halbieren
+                x = parent[x]
+            return x
+
+        for match in matches:
+            i, j = match["_pair"]
+            ri, rj = root(i), root(j)
+            if ri != rj:
+                parent[max(ri, rj)] = min(ri, rj)
+        members = {}
+        for x in {x for match in matches for x in match["_pair"]}:
+            members.setdefault(root(x), []).append(x)
+        result = [[self._ref(x) for x in sorted(group)] for group in members.values()]
+        result.sort(key=len, reverse=True)
+        self.stats["gruppen"] = len(result)
+        return result
+
+    def _ref(self, i: int) -> dict:
+        source, line, record_id, nachname, vorname, geburtsdatum = self._entries[i]
+        return {"quelle": source, "zeile": line, "id": record_id,
+                "name": f"{nachname}, {vorname}".strip(", "), "geburtsdatum": geburtsdatum}
+
+    def report(self) -> dict:
+        """Treffer, Gruppen und Statistik als JSON-taugliches Dict."""
+        matches = self.find()
+        groups = self.groups(matches)
+        for match in matches:
+            del match["_pair"]
+        if self.stats["zu_grosse_bloecke"]:
+            log.warning(f"{self.stats['zu_grosse_bloecke']} Blöcke mit mehr als {self.max_block} "
+                        f"Einträgen nicht verglichen")
+        return {"statistik": dict(self.stats), "paare": matches, "gruppen": groups}
+
+
+def _names(record: dict) -> Tuple[Optional[str], Optional[str]]:
+    """(nachname, vorname); ein einzelnes Feld "name" wird am letzten Leerzeichen geteilt."""
+    nachname, vorname = record.get("nachname"), record.get("vorname")
+    if nachname is None and vorname is None and record.get("name"):
+        name = str(record["name"]).strip()
+        if "," in name:                                   # "Muster, Max"
+            nachname, _, vorname = name.partition(",")
+        else:                                             # "Max Muster"
+            vorname, _, nachname = name.rpartition(" ")
+    return nachname, vorname
+
+
+def find_duplicates(paths: Iterable[Union[str, Path]], output: Union[str, Path, None] = None,
+                    threshold: float = DEFAULT_THRESHOLD, max_block: int = DEFAULT_MAX_BLOCK) -> dict:
+    """
+    Sucht Duplikate in einer oder mehreren Importer-Ausgaben und schreibt den Bericht.
+
+    Raises:
+        OSError, ValueError: Eingabe nicht lesbar bzw. kein gültiges JSON/NDJSON.
+    """
+    finder = DuplicateFinder(threshold, max_block)
+    for path in paths:
+        finder.add_file(path)
+    report = finder.report()
+    if output is not None and not save_json(output, report):
+        raise OSError(f"Bericht konnte nicht gespeichert werden: {output}")
+    return report
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Doppelte Schüler in Importen finden")
+    parser.add_argument("inputs", nargs="+", help="Importer-Ausgaben (.json oder .ndjson)")
+    parser.add_argument("--output", help="Bericht (Standard: OUTPUT/duplikate.json)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Mindestpunktzahl 0..1")
+    parser.add_argument("--max-block", type=int, default=DEFAULT_MAX_BLOCK, help="Größte verglichene Blockgröße")
+    args = parser.parse_args()
+
+    output = Path(args.output) if args.output else FilePaths.get_output_file("duplikate.json")
+    try:
+        report = find_duplicates(args.inputs, output, args.threshold, args.max_block)
+    except (OSError, ValueError) as e:
+        log.error(f"Duplikatsuche fehlgeschlagen: {e}")
+        sys.exit(1)
+    stats = report["statistik"]
+    log.info(f"{stats['datensaetze']} Datensätze, {stats['vergleiche']} Vergleiche, "
+             f"{stats['treffer']} Treffer in {stats['gruppen']} Gruppen -> {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,10 @@
 # SYSTEM/file_manager.py
 """Zentrale Pfadverwaltung für das gesamte Projekt.
 
-Stellt sicher, dass alle wichtigen Verzeichnisse existieren und
-bietet eine einheitliche Schnittstelle für den Zugriff auf Pfade.
+Bietet eine einheitliche Schnittstelle für den Zugriff auf Pfade.
+Der Import hat keine Nebenwirkungen: Ordner werden erst beim ersten
+Gebrauch angelegt (save_json, Logger, ... legen ihre Zielordner selbst an;
+ensure_dirs() legt alle Daten-Ordner auf einmal an).
 """
 
 from pathlib import Path
@@ -21,14 +23,18 @@ OUTPUT_DIR = DATA_DIR / "OUTPUT"
 # --- System-Ordner (für Skripte und Hilfsmodule) ---
 SYSTEM_DIR = BASE_DIR / "SYSTEM"
 
-# --- Ordner automatisch anlegen (falls sie nicht existieren) ---
-for directory in [DATA_DIR, CONFIG_DIR, INPUT_DIR, OUTPUT_DIR]:
-    directory.mkdir(parents=True, exist_ok=True)
+
+# --- Ordner bei Bedarf anlegen (nicht beim Import) ---
+def ensure_dirs() -> None:
+    """Legt alle Daten-Ordner an, falls sie nicht existieren."""
+    for directory in [DATA_DIR, CONFIG_DIR, INPUT_DIR, OUTPUT_DIR]:
+        directory.mkdir(parents=True, exist_ok=True)
 
 # --- Wichtige Dateien (Beispiele) ---
 SCHUELER_MASTER = INPUT_DIR / "schueler_master_liste.json"
 KURSE = INPUT_DIR / "kurse.json"
 LOGFILE = OUTPUT_DIR / "dashboard_log.txt"
+DATABASE = DATA_DIR / "toolbox.sqlite3"
 
 # ----------------------------------------------------------------------
 # Zentrale Zugriffsklasse (für Autovervollständigung und Klarheit im Code)
@@ -50,6 +56,9 @@ class FilePaths:
     SCHUELER_MASTER = SCHUELER_MASTER
     KURSE = KURSE
     LOGFILE = LOGFILE
+    DATABASE = DATABASE
+
+    ensure_dirs = staticmethod(ensure_dirs)
 
     # Beispiel für eine dynamische Methode (optional)
     @staticmethod
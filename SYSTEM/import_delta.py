@@ -0,0 +1,244 @@
+# SYSTEM/import_delta.py
+"""Änderungen zwischen zwei Importen derselben Quelle (Delta-Import).
+
+Statt nach jedem Neuimport alles nachgelagert neu zu berechnen, wird die neue
+Ausgabe über eine Schlüsselspalte (z.B. "id") mit der vorherigen verglichen:
+    - vorherige Ausgabe: ein Durchlauf -> Schlüssel -> (Zeilen-Hash, Datensatz)
+    - neue Ausgabe:      ein Durchlauf, je Zeile nur Hash vergleichen; Felder
+                         werden nur bei abweichendem Hash einzeln verglichen
+Was danach im Index übrig bleibt, wurde entfernt.
+
+Änderungssatz (kompaktes JSON, z.B. OUTPUT/schule_a.delta.json):
+    {"version": 1, "schluessel": "id",
+     "hinzugefuegt": [{...}, ...],                       # ganze Datensätze
+     "entfernt": ["17", ...],                            # nur Schlüssel
+     "geaendert": [{"schluessel": "4711", "felder": {"klasse": ["10a", "10b"]}}],
+     "statistik": {"alt": 500, "neu": 501, "hinzugefuegt": 1, ...}}
+    Felder, die auf einer Seite fehlen, erscheinen dort als None.
+
+apply_delta wendet einen Änderungssatz auf eine Liste von Datensätzen an
+(z.B. die Master-Liste). Mehrfaches Anwenden desselben Satzes ändert nichts
+mehr.
+
+Verwendung:
+    previous = index_output(json_path, "id")       # vor dem Überschreiben
+    ...                                             # neu importieren
+    delta = diff_output(previous, json_path, "id")
+    save_delta(delta_path(json_path), delta)
+    records = apply_delta(load_json(master), delta)
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from json_helper import _compression, _open_text, iter_ndjson, iter_records, load_json, save_json
+from schema_import import iter_columnar_records
+
+DELTA_VERSION = 1
+DELTA_SUFFIX = ".delta.json"
+
+_dumps = json.JSONEncoder(ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str).encode
+
+
+def row_digest(record: dict) -> bytes:
+    """Hash eines Datensatzes (unabhängig von der Reihenfolge der Felder)."""
+    return hashlib.blake2b(_dumps(record).encode("utf-8"), digest_size=16).digest()
+
+
+def delta_path(json_path: Union[str, Path]) -> Path:
+    """Pfad des Änderungssatzes zu einer Ausgabe (schule_a.json[.gz] -> schule_a.delta.json)."""
+    json_path = Path(json_path)
+    name = json_path.with_suffix("") if _compression(json_path) else json_path
+    return json_path.with_name(name.stem + DELTA_SUFFIX)
+
+
+def iter_output(path: Union[str, Path]) -> Iterable[dict]:
+    """
+    Datensätze einer Importer-Ausgabe: JSON-Array, NDJSON oder Spaltenform.
+
+    Raises:
+        OSError, ValueError: Datei nicht lesbar bzw. kein gültiges Format.
+    """
+    path = Path(path)
+    with _open_text(path) as f:   # entpackt .gz/.xz
+        first = f.readline()
+    if not first.lstrip().startswith("{"):
+        return iter_records(path)
+    # Objekt am Anfang: NDJSON (auch ohne Endung .ndjson) oder Spaltenform
+    try:
+        record = json.loads(first)
+    except ValueError:
+        record = None
+    if isinstance(record, dict) and record.get("format") != "columnar":
+        return iter_ndjson(path)
+    return iter_columnar_records(load_json(path, default=None))
+
+
+def _key_of(record: dict, key: str) -> Any:
+    value = record.get(key) if isinstance(record, dict) else None
+    return None if value is None or value == "" else value
+
+
+def index_records(records: Iterable[dict], key: str) -> Tuple[Dict[Any, tuple], int]:
+    """
+    Schlüssel -> (Hash, Datensatz) für die alte Seite.
+
+    Returns:
+        (Index, Anzahl Datensätze ohne Schlüssel – sie werden nicht verglichen)
+
+    Raises:
+        ValueError: Schlüssel doppelt.
+    """
+    index = {}
+    missing = 0
+    for record in records:
+        value = _key_of(record, key)
+        if value is None:
+            missing += 1
+            continue
+        if value in index:
+            raise ValueError(f"Schlüssel {key}={value!r} kommt mehrfach vor")
+        index[value] = (row_digest(record), record)
+    return index, missing
+
+
+def index_output(path: Union[str, Path], key: str) -> Dict[Any, tuple]:
+    """Index der vorherigen Ausgabe (leer, wenn es noch keine gibt)."""
+    path = Path(path)
+    if not path.exists():
+        return {}
+    return index_records(iter_output(path), key)[0]
+
+
+def field_changes(old: dict, new: dict) -> Dict[str, list]:
+    """Feld -> [alt, neu] für alle abweichenden Felder."""
+    changes = {}
+    for name, value in new.items():
+        if name not in old:
+            changes[name] = [None, value]
+        elif old[name] != value:
+            changes[name] = [old[name], value]
+    for name in old.keys() - new.keys():
+        changes[name] = [old[name], None]
+    return changes
+
+
+def diff_records(previous: Dict[Any, tuple], records: Iterable[dict], key: str) -> dict:
+    """
+    Vergleicht die neuen Datensätze mit dem Index der alten (ein Durchlauf).
+
+    previous wird dabei geleert (übrig gebliebene Einträge = entfernt).
+
+    Raises:
+        ValueError: Schlüssel in den neuen Datensätzen doppelt.
+    """
+    stats = {"alt": len(previous), "neu": 0, "hinzugefuegt": 0, "entfernt": 0, "geaendert": 0,
+             "unveraendert": 0, "ohne_schluessel": 0}
+    added, changed = [], []
+    seen = set()
+    for record in records:
+        value = _key_of(record, key)
+        if value is None:
+            stats["ohne_schluessel"] += 1
+            continue
+        if value in seen:
+            raise ValueError(f"Schlüssel {key}={value!r} kommt mehrfach vor")
+        seen.add(value)
+        stats["neu"] += 1
+        old = previous.pop(value, None)
+        if old is None:
+            added.append(record)
+        elif old[0] != row_digest(record):
+            changed.append({"schluessel": value, "felder": field_changes(old[1], record)})
+        else:
+            stats["unveraendert"] += 1
+    removed = list(previous)
+    previous.clear()
+    stats.update(hinzugefuegt=len(added), entfernt=len(removed), geaendert=len(changed))
+    return {"version": DELTA_VERSION, "schluessel": key, "hinzugefuegt": added, "entfernt": removed,
+            "geaendert": changed, "statistik": stats}
+
+
+def diff_output(previous: Dict[Any, tuple], path: Union[str, Path], key: str) -> dict:
+    """Änderungssatz zwischen dem Index der vorherigen und der neuen Ausgabe."""
+    return diff_records(previous, iter_output(path), key)
+
+
+def save_delta(path: Union[str, Path], delta: dict) -> bool:
+    """Speichert einen Änderungssatz (kompakt). True bei Erfolg."""
+    return save_json(path, delta, compact=True)
+
+
+def load_delta(path: Union[str, Path]) -> dict:
+    """
+    Lädt einen Änderungssatz.
+
+    Raises:
+        ValueError: Datei fehlt, ist ungültig oder hat eine andere Version.
+    """
+    delta = load_json(path, default=None)
+    if not isinstance(delta, dict) or delta.get("version") != DELTA_VERSION or "schluessel" not in delta:
+        raise ValueError(f"Kein gültiger Änderungssatz: {path}")
+    return delta
+
+
+def apply_delta(records: List[dict], delta: dict) -> List[dict]:
+    """
+    Wendet einen Änderungssatz auf eine Liste von Datensätzen an (in place).
+
+    Hinzugefügte Datensätze ersetzen einen vorhandenen mit gleichem Schlüssel,
+    geänderte Felder werden gesetzt, unbekannte Schlüssel beim Entfernen
+    und Ändern werden übergangen.
+
+    Returns:
+        Dieselbe Liste.
+    """
+    key = delta["schluessel"]
+    position = {}
+    for i, record in enumerate(records):
+        value = _key_of(record, key)
+        if value is not None:
+            position[value] = i
+    removed = {value for value in delta.get("entfernt", ()) if value in position}
+    for change in delta.get("geaendert", ()):
+        i = position.get(change["schluessel"])
+        if i is None:
+            continue
+        record = records[i]
+        for name, (_, new) in change["felder"].items():
+            record[name] = new
+    for record in delta.get("hinzugefuegt", ()):
+        i = position.get(record.get(key))
+        if i is None:
+            position[record.get(key)] = len(records)
+            records.append(dict(record))
+        else:
+            records[i] = dict(record)
+            removed.discard(record.get(key))
+    if removed:
+        records[:] = [record for record in records if _key_of(record, key) not in removed]
+    return records
+
+
+def apply_delta_file(target: Union[str, Path], delta: Union[str, Path, dict]) -> dict:
+    """
+    Wendet einen Änderungssatz auf eine gespeicherte Liste an (z.B. die Master-Liste).
+
+    Returns:
+        Die Statistik des Änderungssatzes.
+
+    Raises:
+        ValueError: Änderungssatz ungültig oder Ziel keine Liste.
+        OSError: Ziel konnte nicht gespeichert werden.
+    """
+    if not isinstance(delta, dict):
+        delta = load_delta(delta)
+    records = load_json(target, default=[])
+    if not isinstance(records, list):
+        raise ValueError(f"Ziel ist keine Liste von Datensätzen: {target}")
+    apply_delta(records, delta)
+    if not save_json(target, records):
+        raise OSError(f"Ziel konnte nicht gespeichert werden: {target}")
+    return delta.get("statistik", {})
@@ -0,0 +1,119 @@
+# SYSTEM/import_manifest.py
+"""Manifest für inkrementelle Importe.
+
+Merkt sich für jede importierte Eingabedatei Größe, Änderungszeit und
+Inhalts-Hash sowie die verwendeten Import-Optionen. Bei einem erneuten
+Lauf kann so erkannt werden, ob sich eine Datei seit dem letzten Import
+geändert hat – unveränderte Dateien werden übersprungen.
+
+Verwendung:
+    manifest = ImportManifest()              # OUTPUT/import_manifest.json
+    if not manifest.is_current(csv_path, json_path, options):
+        ...  # konvertieren
+        manifest.record(csv_path, json_path, options)
+    manifest.save()
+"""
+
+import hashlib
+import os
+from pathlib import Path
+from typing import Optional, Union
+
+from file_manager import FilePaths
+from json_helper import load_json, save_json
+
+MANIFEST_NAME = "import_manifest.json"
+MANIFEST_VERSION = 1
+
+# Blockgröße beim Hashen (1 MiB)
+_HASH_BLOCK = 1024 * 1024
+
+
+def file_digest(path: Union[str, Path]) -> str:
+    """Berechnet den SHA-256-Hash einer Datei blockweise."""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+class ImportManifest:
+    """
+    Liest und schreibt das Import-Manifest.
+
+    Attribute:
+        path (Path): Pfad zur Manifest-Datei.
+        files (dict): Einträge je Eingabedatei (Schlüssel: absoluter Pfad).
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None):
+        self.path = Path(path) if path else FilePaths.OUTPUT_DIR / MANIFEST_NAME
+        data = load_json(self.path, default={})
+        if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+            data = {}
+        self.files = data.get("files", {})
+        self._changed = False
+
+    @staticmethod
+    def _key(csv_path) -> str:
+        return str(Path(csv_path).resolve())
+
+    def is_current(self, csv_path, json_path, options: dict) -> bool:
+        """
+        Prüft, ob die Eingabedatei seit dem letzten Import unverändert ist.
+
+        Zuerst werden Größe und Änderungszeit verglichen; nur wenn sich die
+        Änderungszeit bei gleicher Größe unterscheidet, wird der Inhalt
+        gehasht (z.B. nach einem erneuten Kopieren derselben Datei).
+
+        Returns:
+            True, wenn Inhalt, Optionen und Ausgabedatei unverändert sind.
+        """
+        entry = self.files.get(self._key(csv_path))
+        if entry is None or entry.get("options") != options:
+            return False
+        if entry.get("output") != str(json_path) or not Path(json_path).exists():
+            return False
+
+        try:
+            st = os.stat(csv_path)
+        except OSError:
+            return False
+        if st.st_size != entry.get("size"):
+            return False
+        if st.st_mtime_ns == entry.get("mtime_ns"):
+            return True
+
+        if file_digest(csv_path) != entry.get("sha256"):
+            return False
+        # Inhalt gleich, nur die Zeit hat sich geändert – Eintrag auffrischen
+        entry["mtime_ns"] = st.st_mtime_ns
+        self._changed = True
+        return True
+
+    def record(self, csv_path, json_path, options: dict, digest: Optional[str] = None):
+        """Trägt einen erfolgreichen Import ein (Hash wird bei Bedarf berechnet)."""
+        st = os.stat(csv_path)
+        self.files[self._key(csv_path)] = {
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "sha256": digest or file_digest(csv_path),
+            "options": options,
+            "output": str(json_path),
+        }
+        self._changed = True
+
+    def forget(self, csv_path):
+        """Entfernt den Eintrag einer Eingabedatei (z.B. nach einem Fehler)."""
+        if self.files.pop(self._key(csv_path), None) is not None:
+            self._changed = True
+
+    def save(self) -> bool:
+        """Speichert das Manifest, falls sich etwas geändert hat."""
+        if not self._changed:
+            return True
+        ok = save_json(self.path, {"version": MANIFEST_VERSION, "files": self.files})
+        if ok:
+            self._changed = False
+        return ok
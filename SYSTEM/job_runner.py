@@ -0,0 +1,494 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+job_runner.py – Führt Skripte aus dem SYSTEM-Ordner als Jobs mit begrenzter Parallelität aus.
+
+Jobs landen in einer Warteschlange; höchstens max_workers laufen
+gleichzeitig, der Rest wartet. Jeder Job kann abgebrochen werden und hat
+optional ein Zeitlimit. Zu jedem Job werden Status, Laufzeit, Exitcode und
+der höchste Speicherverbrauch (Peak RSS) festgehalten:
+    - POSIX: os.wait4 liefert ru_maxrss des beendeten Kindprozesses
+    - sonst: mit psutil (falls installiert) wird der RSS regelmäßig abgefragt
+
+Mit einem WorkerPool (worker_pool) laufen Skripte in vorgewärmten Workern
+statt in einem neuen Interpreter; ist kein Worker verfügbar, wird wie bisher
+ein eigener Prozess gestartet. Beim Pool ist der Peak-Speicher der des
+Workers seit seinem Start.
+
+Fortschritt (siehe progress): Unter POSIX bekommt jeder Prozess eine eigene
+Pipe (TOOLBOX_PROGRESS_FD), sonst werden Markerzeilen aus stdout gefiltert;
+im Pool kommen die Meldungen über die Verbindung zum Worker. Der letzte
+Datensatz steht in job.progress, on_progress wird je Meldung aufgerufen.
+
+Verwendung:
+    runner = JobRunner(max_workers=2, on_output=print_line, on_update=refresh,
+                       pool=WorkerPool(size=2))   # optional
+    job = runner.submit("csv_importer.py", ["--batch", "*.csv"], timeout=600)
+    runner.cancel(job.id)
+    runner.wait()
+
+    python job_runner.py csv_importer.py --batch "*.csv"   # einzelner Job, Ausgabe auf Konsole
+"""
+
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence
+
+from file_manager import FilePaths
+from progress import PROGRESS_ENV, PROGRESS_FD_ENV, parse_marker
+from worker_pool import WorkerPool, WorkerStopped, WorkerUnavailable
+
+# Status eines Jobs und die Anzeige im Dashboard
+QUEUED, RUNNING, DONE, FAILED, CANCELLED, TIMEOUT = "queued", "running", "done", "failed", "cancelled", "timeout"
+FINISHED = (DONE, FAILED, CANCELLED, TIMEOUT)
+STATUS_LABELS = {QUEUED: "wartet", RUNNING: "läuft", DONE: "fertig", FAILED: "Fehler",
+                 CANCELLED: "abgebrochen", TIMEOUT: "Zeitlimit"}
+
+DEFAULT_MAX_WORKERS = 2
+# Sekunden zwischen terminate() und kill() beim Abbrechen
+_KILL_GRACE = 3.0
+# Abfrageintervall für den Speicher, wenn os.wait4 fehlt (psutil)
+_MEMORY_POLL = 0.2
+
+
+def script_command(script: str, args: Sequence[str] = ()) -> List[str]:
+    """
+    Kommandozeile für ein Skript im SYSTEM-Ordner.
+
+    Raises:
+        ValueError: Wenn das Skript nicht im SYSTEM-Ordner liegt oder fehlt.
+    """
+    path = (FilePaths.SYSTEM_DIR / script).resolve()
+    if path.parent != FilePaths.SYSTEM_DIR.resolve() or path.suffix != ".py" or not path.is_file():
+        raise ValueError(f"Kein Skript im SYSTEM-Ordner: {script}")
+    # -u: ungepuffert, damit die Ausgabe zeilenweise ankommt
+    return [sys.executable, "-u", str(path), *map(str, args)]
+
+
+class Job:
+    """
+    Ein Auftrag: ein Skript mit Argumenten.
+
+    Attribute:
+        id (int): Laufende Nummer.
+        name (str): Anzeigename (Skriptname).
+        argv (list): Vollständige Kommandozeile.
+        timeout (float|None): Zeitlimit in Sekunden.
+        status (str): QUEUED, RUNNING, DONE, FAILED, CANCELLED oder TIMEOUT.
+        exit_code (int|None): Exitcode des Prozesses.
+        peak_rss (int|None): Höchster Speicherverbrauch in Bytes (None = unbekannt).
+        error (str|None): Fehlertext, wenn der Prozess nicht starten konnte.
+        target (tuple|None): (skript, argumente) für die Ausführung im WorkerPool.
+        pooled (bool): True, wenn der Job in einem Pool-Worker lief.
+        progress (dict|None): Letzte Fortschrittsmeldung (siehe progress).
+    """
+
+    def __init__(self, job_id: int, name: str, argv: List[str], timeout: Optional[float] = None,
+                 target: Optional[tuple] = None):
+        self.id = job_id
+        self.name = name
+        self.argv = argv
+        self.timeout = timeout
+        self.target = target
+        self.pooled = False
+        self.progress = None
+        self.status = QUEUED
+        self.exit_code = None
+        self.peak_rss = None
+        self.error = None
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+        self._process = None
+        self._cancel = False
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+
+    @property
+    def wall_time(self) -> Optional[float]:
+        """Laufzeit in Sekunden (bei laufenden Jobs bis jetzt)."""
+        if self.started is None:
+            return None
+        return (self.finished or time.time()) - self.started
+
+    @property
+    def label(self) -> str:
+        return STATUS_LABELS.get(self.status, self.status)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wartet, bis der Job beendet ist. True, wenn er fertig ist."""
+        return self._done.wait(timeout)
+
+    def __repr__(self):
+        return f"Job({self.id}, {self.name}, {self.status}, exit={self.exit_code})"
+
+
+class JobRunner:
+    """
+    Warteschlange mit höchstens max_workers gleichzeitig laufenden Jobs.
+
+    Die Rückrufe laufen in den Worker-Threads – GUI-Code muss sie selbst an
+    den Haupt-Thread weitergeben (z.B. über eine Queue).
+
+    Args:
+        max_workers: Höchstzahl gleichzeitig laufender Jobs
+        on_output: Rückruf (job, zeile) für jede Ausgabezeile
+        on_update: Rückruf (job) bei jeder Statusänderung
+        on_progress: Rückruf (job, datensatz) für jede Fortschrittsmeldung
+        pool: Optionaler WorkerPool für Skripte (submit mit pooled=True)
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS,
+                 on_output: Optional[Callable[[Job, str], None]] = None,
+                 on_update: Optional[Callable[[Job], None]] = None,
+                 pool: Optional[WorkerPool] = None,
+                 on_progress: Optional[Callable[[Job, dict], None]] = None):
+        self.max_workers = max(1, int(max_workers))
+        self.on_output = on_output
+        self.on_update = on_update
+        self.on_progress = on_progress
+        self.pool = pool
+        self._queue = queue.Queue()
+        self._jobs = {}
+        self._next_id = 1
+        self._lock = threading.Lock()
+        self._threads = []
+        self._closed = False
+
+    # ------------------------------------------------------------------
+    # Öffentliche Schnittstelle
+    # ------------------------------------------------------------------
+    def submit(self, script: str, args: Sequence[str] = (), timeout: Optional[float] = None,
+               name: Optional[str] = None, pooled: bool = True) -> Job:
+        """
+        Reiht ein Skript aus dem SYSTEM-Ordner ein (siehe script_command).
+
+        Mit pooled=True (und einem Pool) läuft es in einem vorgewärmten Worker.
+        """
+        argv = script_command(script, args)
+        target = (Path(argv[2]).name, [str(a) for a in args]) if pooled and self.pool is not None else None
+        return self.submit_command(argv, name or Path(script).name, timeout, target)
+
+    def submit_command(self, argv: Sequence[str], name: Optional[str] = None,
+                       timeout: Optional[float] = None, target: Optional[tuple] = None) -> Job:
+        """Reiht eine beliebige Kommandozeile ein (target: siehe Job)."""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("JobRunner ist beendet")
+            job = Job(self._next_id, name or Path(argv[0]).name, list(argv), timeout, target)
+            self._next_id += 1
+            self._jobs[job.id] = job
+            # Worker-Threads erst bei Bedarf starten, höchstens max_workers
+            if len(self._threads) < self.max_workers:
+                thread = threading.Thread(target=self._worker, name=f"JobWorker-{len(self._threads) + 1}",
+                                          daemon=True)
+                self._threads.append(thread)
+                thread.start()
+        self._notify(job)
+        self._queue.put(job)
+        return job
+
+    def cancel(self, job_id: int) -> bool:
+        """
+        Bricht einen Job ab: wartende werden nicht gestartet, laufende beendet
+        (terminate, nach _KILL_GRACE Sekunden kill).
+
+        Returns:
+            True, wenn der Job noch nicht beendet war.
+        """
+        job = self._jobs.get(job_id)
+        if job is None:
+            return False
+        with job._lock:
+            if job.status in FINISHED:
+                return False
+            job._cancel = True
+            if job.status == QUEUED:
+                self._finish(job, CANCELLED)
+                return True
+        self._stop(job)
+        return True
+
+    def get(self, job_id: int) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def jobs(self) -> List[Job]:
+        """Alle Jobs in der Reihenfolge ihres Eingangs."""
+        with self._lock:
+            return list(self._jobs.values())
+
+    def active(self) -> List[Job]:
+        """Wartende und laufende Jobs."""
+        return [job for job in self.jobs() if job.status not in FINISHED]
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wartet auf alle bisher eingereihten Jobs. True, wenn alle fertig sind."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for job in self.jobs():
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if not job.wait(remaining):
+                return False
+        return True
+
+    def shutdown(self, cancel: bool = True):
+        """Nimmt keine Jobs mehr an und bricht auf Wunsch alle offenen ab."""
+        with self._lock:
+            self._closed = True
+            threads = list(self._threads)
+        if cancel:
+            for job in self.active():
+                self.cancel(job.id)
+        for _ in threads:
+            self._queue.put(None)
+
+    # ------------------------------------------------------------------
+    # Ausführung
+    # ------------------------------------------------------------------
+    def _worker(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            with job._lock:
+                if job._cancel or job.status != QUEUED:
+                    continue
+                job.status = RUNNING
+                job.started = time.time()
+            self._notify(job)
+            try:
+                if job.target is not None and self.pool is not None and self._run_pooled(job):
+                    continue
+                self._run(job)
+            except Exception as e:  # z.B. Programm nicht gefunden
+                job.error = str(e)
+                self._finish(job, FAILED)
+
+    def _run_pooled(self, job: Job) -> bool:
+        """Führt den Job im WorkerPool aus. False, wenn kein Worker verfügbar ist."""
+        timer = self._start_timer(job)
+        script, args = job.target
+        output = None
+        if self.on_output is not None:
+            output = lambda line, stream: self.on_output(job, line)
+        try:
+            job.pooled = True
+            exit_code, job.peak_rss = self.pool.run(script, args, on_output=output,
+                                                    should_stop=lambda: job._cancel or job.status == TIMEOUT,
+                                                    on_progress=lambda record: self._progress(job, record))
+        except WorkerUnavailable:
+            job.pooled = False
+            return False  # Rückfall auf den eigenen Prozess
+        except WorkerStopped:
+            exit_code = None
+        finally:
+            if timer is not None:
+                timer.cancel()
+        self._complete(job, exit_code)
+        return True
+
+    def _start_timer(self, job: Job) -> Optional[threading.Timer]:
+        if not job.timeout:
+            return None
+        timer = threading.Timer(job.timeout, self._on_timeout, args=(job,))
+        timer.daemon = True
+        timer.start()
+        return timer
+
+    def _complete(self, job: Job, exit_code: Optional[int]):
+        """Setzt Exitcode und Endstatus."""
+        with job._lock:
+            job.exit_code = exit_code
+            if job.status == TIMEOUT:
+                status = TIMEOUT
+            elif job._cancel:
+                status = CANCELLED
+            else:
+                status = DONE if exit_code == 0 else FAILED
+        self._finish(job, status)
+
+    def _run(self, job: Job):
+        env = dict(os.environ, PYTHONIOENCODING="utf-8")
+        env.pop(PROGRESS_FD_ENV, None)
+        read_fd = write_fd = None
+        if os.name == "posix":
+            # Eigene Pipe: Fortschritt mischt sich nicht in die Ausgabe
+            read_fd, write_fd = os.pipe()
+            env[PROGRESS_FD_ENV] = str(write_fd)
+        else:
+            env[PROGRESS_ENV] = "stdout"
+        try:
+            process = subprocess.Popen(job.argv, cwd=FilePaths.SYSTEM_DIR, stdout=subprocess.PIPE,
+                                       stderr=subprocess.STDOUT, text=True, encoding="utf-8",
+                                       errors="replace", bufsize=1, env=env,
+                                       pass_fds=() if write_fd is None else (write_fd,))
+        except Exception:
+            if read_fd is not None:
+                os.close(read_fd)
+            raise
+        finally:
+            if write_fd is not None:
+                os.close(write_fd)  # sonst sieht der Leser nie das Ende
+        reader = None
+        if read_fd is not None:
+            reader = threading.Thread(target=self._read_progress, args=(job, read_fd), daemon=True)
+            reader.start()
+        with job._lock:
+            job._process = process
+            cancelled = job._cancel
+        if cancelled:  # während des Starts abgebrochen
+            self._stop(job)
+
+        timer = self._start_timer(job)
+        sampler = None
+        if not hasattr(os, "wait4"):
+            sampler = threading.Thread(target=self._sample_memory, args=(job, process), daemon=True)
+            sampler.start()
+
+        try:
+            for line in process.stdout:
+                line = line.rstrip("\r\n")
+                if reader is None:
+                    record = parse_marker(line)
+                    if record is not None:
+                        self._progress(job, record)
+                        continue
+                if self.on_output is not None:
+                    self.on_output(job, line)
+        finally:
+            process.stdout.close()
+            try:
+                exit_code = self._reap(job, process)
+            finally:
+                if timer is not None:
+                    timer.cancel()
+                if reader is not None:
+                    reader.join(1.0)
+        self._complete(job, exit_code)
+
+    def _read_progress(self, job: Job, fd: int):
+        """Liest die Fortschrittspipe bis zum Ende (JSON-Zeilen)."""
+        with os.fdopen(fd, "r", encoding="utf-8", errors="replace") as pipe:
+            for line in pipe:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(record, dict):
+                    self._progress(job, record)
+
+    def _progress(self, job: Job, record: dict):
+        job.progress = record
+        if self.on_progress is not None:
+            try:
+                self.on_progress(job, record)
+            except Exception:
+                pass
+
+    def _reap(self, job: Job, process: subprocess.Popen) -> int:
+        """Wartet auf das Ende des Prozesses und liest dabei den Peak-Speicher."""
+        if not hasattr(os, "wait4"):
+            return process.wait()
+        try:
+            _, status, usage = os.wait4(process.pid, 0)
+        except ChildProcessError:
+            # Schon von Popen abgeholt (terminate() in _stop ruft vorher poll() auf) –
+            # Exitcode von dort, Peak-Speicher bleibt unbekannt
+            return process.wait()
+        exit_code = os.waitstatus_to_exitcode(status)
+        with job._lock:
+            # Popen wissen lassen, dass der Prozess schon abgeholt ist
+            process.returncode = exit_code
+            # ru_maxrss: Linux in KiB, macOS in Bytes
+            job.peak_rss = usage.ru_maxrss if sys.platform == "darwin" else usage.ru_maxrss * 1024
+        return exit_code
+
+    @staticmethod
+    def _sample_memory(job: Job, process: subprocess.Popen):
+        """Ohne os.wait4: RSS mit psutil regelmäßig abfragen (falls installiert)."""
+        try:
+            import psutil
+            proc = psutil.Process(process.pid)
+        except Exception:
+            return
+        while process.poll() is None:
+            try:
+                rss = proc.memory_info().rss
+            except Exception:
+                return
+            job.peak_rss = max(job.peak_rss or 0, rss)
+            time.sleep(_MEMORY_POLL)
+
+    def _on_timeout(self, job: Job):
+        with job._lock:
+            if job.status != RUNNING:
+                return
+            job.status = TIMEOUT
+        self._stop(job)
+
+    def _stop(self, job: Job):
+        """terminate(), nach einer Gnadenfrist kill()."""
+        with job._lock:
+            process = job._process
+            if process is None or process.returncode is not None:
+                return
+            process.terminate()
+
+        def kill():
+            with job._lock:
+                if process.returncode is None:
+                    process.kill()
+
+        timer = threading.Timer(_KILL_GRACE, kill)
+        timer.daemon = True
+        timer.start()
+
+    def _finish(self, job: Job, status: str):
+        job.status = status
+        job.finished = time.time()
+        job._process = None
+        job._done.set()
+        self._notify(job)
+
+    def _notify(self, job: Job):
+        if self.on_update is not None:
+            try:
+                self.on_update(job)
+            except Exception:
+                pass  # ein fehlerhafter Rückruf darf den Worker nicht beenden
+
+
+def format_bytes(value: Optional[int]) -> str:
+    """Bytes für die Anzeige ('' wenn unbekannt)."""
+    if value is None:
+        return ""
+    for unit in ("B", "KiB", "MiB"):
+        if value < 1024:
+            return f"{value:.0f} {unit}"
+        value /= 1024
+    return f"{value:.1f} GiB"
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Verwendung: python job_runner.py SKRIPT [ARGUMENTE ...]")
+        sys.exit(2)
+    runner = JobRunner(on_output=lambda job, line: print(line))
+    job = runner.submit(sys.argv[1], sys.argv[2:])
+    try:
+        job.wait()
+    except KeyboardInterrupt:
+        runner.cancel(job.id)
+        job.wait()
+    print(f"{job.name}: {job.label}, Exitcode {job.exit_code}, {job.wall_time:.2f} s, "
+          f"Peak {format_bytes(job.peak_rss) or 'unbekannt'}")
+    sys.exit(0 if job.status == DONE else 1)
+
+
+if __name__ == "__main__":
+    main()
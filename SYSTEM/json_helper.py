@@ -1,47 +1,605 @@
 # SYSTEM/json_helper.py
-"""Hilfsfunktionen für das Laden und Speichern von JSON-Dateien."""
+"""Hilfsfunktionen für das Laden und Speichern von JSON-Dateien.
 
+load_json(..., cached=True) nutzt einen prozessweiten Cache: eine Datei wird
+nur neu geparst, wenn sich Änderungszeit oder Größe geändert haben. Der Cache
+ist auf eine Gesamtgröße begrenzt (LRU) und wird von save_json für den
+geschriebenen Pfad sofort verworfen. Aufrufer bekommen eine eigene Kopie oder
+– mit readonly=True – eine unveränderliche Ansicht (MappingProxyType/tuple).
+
+save_json schreibt standardmäßig atomar (temporäre Datei + Umbenennen),
+optional kompakt und mit fsync; Dateien auf .gz/.xz werden transparent
+komprimiert und von load_json wieder gelesen.
+
+Große JSON-Arrays (z.B. Importer-Ausgaben) lassen sich mit iter_json_array
+elementweise lesen, ohne das ganze Dokument zu laden; count_json_array
+zählt die Elemente. iter_records liest Array oder NDJSON (je nach Endung).
+"""
+
+import codecs
+import io
 import json
+import mmap
+import os
+import re
+import stat
+import sys
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from itertools import islice
 from pathlib import Path
-from typing import Any, Union
+from types import MappingProxyType
+from typing import Any, Iterable, Iterator, Optional, Union
+
+# Einrückung eines Listenelements bei indent=4 (siehe save_json_stream)
+_INDENT = ' ' * 4
+
+# Schreibpuffer (Bytes) für save_json und gültige fsync-Strategien
+_WRITE_BUFFER = 64 * 1024
+FSYNC_POLICIES = ('none', 'file', 'full')
+
+# Lesefehler, bei denen load_json den Standardwert liefert (dazu LZMAError, siehe _read_errors)
+_READ_ERRORS = (ValueError, EOFError, IOError, OSError)
+
+# Standardgrenze für den load_json-Cache (Summe der Dateigrößen)
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+
+
+def _copy_json(obj: Any) -> Any:
+    """Tiefe Kopie für JSON-Daten (schneller als copy.deepcopy)."""
+    if isinstance(obj, dict):
+        return {k: _copy_json(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_copy_json(v) for v in obj]
+    return obj  # str, int, float, bool, None sind unveränderlich
+
+
+def _freeze(obj: Any) -> Any:
+    """Unveränderliche Ansicht: dict -> MappingProxyType, list -> tuple."""
+    if isinstance(obj, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in obj.items()})
+    if isinstance(obj, list):
+        return tuple(_freeze(v) for v in obj)
+    return obj
+
+
+class JsonCache:
+    """
+    LRU-Cache für geparste JSON-Dateien, begrenzt über die Dateigröße.
+
+    Schlüssel ist der aufgelöste Pfad; ein Eintrag gilt nur, solange
+    Änderungszeit (ns) und Größe der Datei gleich sind.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()   # Pfad -> [signatur, daten, ansicht, bytes]
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str, signature: tuple, readonly: bool) -> tuple:
+        """Liefert (True, Daten) bei einem Treffer, sonst (False, None)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != signature:
+                self.misses += 1
+                return False, None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            if readonly:
+                if entry[2] is None:
+                    entry[2] = _freeze(entry[1])
+                return True, entry[2]
+            data = entry[1]
+        return True, _copy_json(data)
+
+    def put(self, key: str, signature: tuple, data: Any, nbytes: int):
+        """Speichert geparste Daten; zu große Dateien werden nicht gecacht."""
+        if nbytes > self.max_bytes:
+            return
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = [signature, data, None, nbytes]
+            self._bytes += nbytes
+            self._evict()
+
+    def resize(self, max_bytes: int):
+        """Setzt eine neue Größengrenze und verdrängt überzählige Einträge."""
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def invalidate(self, key: str):
+        with self._lock:
+            self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _evict(self):
+        while self._bytes > self.max_bytes and self._entries:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[3]
+
+    def stats(self) -> dict:
+        """Zähler und Füllstand des Caches."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                    "entries": len(self._entries), "bytes": self._bytes, "max_bytes": self.max_bytes}
+
+
+# Prozessweiter Cache für load_json(..., cached=True)
+_cache = JsonCache()
+
+
+def cache_stats() -> dict:
+    """Treffer, Fehlschläge, Verdrängungen und Füllstand des load_json-Caches."""
+    return _cache.stats()
+
 
-def load_json(path: Union[str, Path], default: Any = None) -> Any:
+def clear_cache():
+    """Leert den load_json-Cache (Zähler bleiben erhalten)."""
+    _cache.clear()
+
+
+def set_cache_limit(max_bytes: int):
+    """Setzt die Größengrenze des load_json-Caches (überzählige Einträge fallen sofort heraus)."""
+    _cache.resize(max_bytes)
+
+
+def load_json(path: Union[str, Path], default: Any = None, cached: bool = False,
+              readonly: bool = False) -> Any:
     """
     Lädt eine JSON-Datei sicher.
     
     Args:
         path: Pfad zur JSON-Datei (String oder Path-Objekt)
         default: Wert, der bei Fehlern zurückgegeben wird (z.B. leeres Dict oder Liste)
+        cached: Prozessweiten Cache nutzen (Datei wird nur bei Änderung neu geparst)
+        readonly: Nur mit cached – unveränderliche Ansicht statt einer Kopie liefern
     
     Returns:
         Geladene Daten oder default bei Fehler.
     """
     path = Path(path)  # Stelle sicher, dass es ein Path-Objekt ist
+    if cached:
+        return _load_cached(path, default, readonly)
     if not path.exists():
         return default
     try:
-        with open(path, 'r', encoding='utf-8') as f:
+        with _open_text(path) as f:
             return json.load(f)
-    except (json.JSONDecodeError, IOError, OSError):
+    except _read_errors():
+        return default
+
+
+def _load_cached(path: Path, default: Any, readonly: bool) -> Any:
+    try:
+        key = str(path.resolve())
+        st = os.stat(key)
+    except OSError:
         return default
+    signature = (st.st_mtime_ns, st.st_size)
+    hit, data = _cache.get(key, signature, readonly)
+    if hit:
+        return data
+    try:
+        with _open_text(path) as f:
+            data = json.load(f)
+    except _read_errors():
+        return default
+    _cache.put(key, signature, data, st.st_size)
+    return _freeze(data) if readonly else _copy_json(data)
+
+
+def _invalidate(path: Path):
+    """Verwirft den Cache-Eintrag eines Pfads (nach dem Schreiben)."""
+    try:
+        _cache.invalidate(str(path.resolve()))
+    except OSError:
+        pass
+
+def _read_errors() -> tuple:
+    """_READ_ERRORS plus LZMAError – lzma wird erst bei der ersten .xz-Datei importiert."""
+    lzma = sys.modules.get('lzma')
+    return _READ_ERRORS + (lzma.LZMAError,) if lzma else _READ_ERRORS
+
 
-def save_json(path: Union[str, Path], data: Any) -> bool:
+def _compression(path: Path) -> Optional[str]:
+    """Kompression anhand der Dateiendung: 'gz', 'xz' oder None."""
+    suffix = path.suffix.lower()
+    return suffix[1:] if suffix in ('.gz', '.xz') else None
+
+
+def _open_binary(path: Path):
+    """Öffnet eine Datei zum Lesen und entpackt .gz/.xz transparent."""
+    # gzip/lzma erst bei Bedarf importieren (schnellerer Start)
+    compression = _compression(path)
+    if compression == 'gz':
+        import gzip
+        return gzip.open(path, 'rb')
+    if compression == 'xz':
+        import lzma
+        return lzma.open(path, 'rb')
+    return open(path, 'rb')
+
+
+def _open_text(path: Path):
+    """Öffnet eine (evtl. komprimierte) JSON-Datei als UTF-8-Text."""
+    if _compression(path):
+        return io.TextIOWrapper(_open_binary(path), encoding='utf-8')
+    return open(path, 'r', encoding='utf-8')
+
+
+@contextmanager
+def _writer(path: Path, atomic: bool, fsync: str):
+    """
+    Liefert eine Textdatei zum Schreiben von path.
+
+    atomic: erst in eine temporäre Datei im selben Ordner schreiben und sie
+        dann per os.replace umbenennen – bei einem Absturz bleibt die alte
+        Datei vollständig erhalten.
+    fsync: "none", "file" (Datei vor dem Umbenennen auf die Platte zwingen)
+        oder "full" (zusätzlich den Ordner, nur POSIX).
+    """
+    if fsync not in FSYNC_POLICIES:
+        raise ValueError(f"Unbekannte fsync-Strategie: {fsync}")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if atomic:
+        # Wie open(): Rechte nach umask bzw. die der bisherigen Datei
+        # (tempfile.mkstemp würde immer 0600 anlegen).
+        tmp_name = str(path.parent / f".{path.name}.{os.getpid()}.{os.urandom(4).hex()}.tmp")
+        fd = os.open(tmp_name, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0), 0o666)
+        try:
+            os.chmod(fd if os.chmod in os.supports_fd else tmp_name, stat.S_IMODE(os.stat(path).st_mode))
+        except OSError:
+            pass  # Zieldatei gibt es noch nicht
+        raw = os.fdopen(fd, 'wb', buffering=_WRITE_BUFFER)
+    else:
+        tmp_name = None
+        raw = open(path, 'wb', buffering=_WRITE_BUFFER)
+
+    try:
+        compression = _compression(path)
+        if compression == 'gz':
+            import gzip
+            stream = gzip.GzipFile(filename=path.stem, fileobj=raw, mode='wb')
+        elif compression == 'xz':
+            import lzma
+            stream = lzma.LZMAFile(raw, 'wb')
+        else:
+            stream = raw
+        text = io.TextIOWrapper(stream, encoding='utf-8')
+        yield text
+
+        # Schließen ohne raw zu schließen: erst Text, dann Kompression, dann Datei
+        text.flush()
+        text.detach()
+        if stream is not raw:
+            stream.close()
+        raw.flush()
+        if fsync != 'none':
+            os.fsync(raw.fileno())
+        raw.close()
+        if tmp_name is not None:
+            os.replace(tmp_name, path)
+            if fsync == 'full' and os.name == 'posix':
+                dir_fd = os.open(path.parent, os.O_RDONLY)
+                try:
+                    os.fsync(dir_fd)
+                finally:
+                    os.close(dir_fd)
+    except BaseException:
+        raw.close()
+        if tmp_name is not None:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+        raise
+
+
+# Wiederverwendete Encoder (json.dumps mit Optionen baut bei jedem Aufruf einen neuen)
+_PRETTY_ENCODER = json.JSONEncoder(indent=4, ensure_ascii=False)
+_COMPACT_ENCODER = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False)
+
+
+def _encode(data: Any, compact: bool) -> Iterator[str]:
+    """
+    Kodiert data stückweise, ohne einen einzigen riesigen String zu bauen.
+
+    Kompakt werden Listen und Dicts auf oberster Ebene elementweise über den
+    schnellen C-Encoder kodiert; eingerückt liefert JSONEncoder.iterencode
+    die Stücke. Das Ergebnis entspricht json.dump mit denselben Optionen.
+    """
+    if not compact:
+        yield from _PRETTY_ENCODER.iterencode(data)
+        return
+
+    encode = _COMPACT_ENCODER.encode
+    if isinstance(data, list):
+        yield '['
+        for i, item in enumerate(data):
+            yield (',' if i else '') + encode(item)
+        yield ']'
+    elif isinstance(data, dict) and all(isinstance(k, str) for k in data):
+        yield '{'
+        for i, (key, value) in enumerate(data.items()):
+            yield (',' if i else '') + encode(key) + ':' + encode(value)
+        yield '}'
+    else:
+        yield encode(data)
+
+
+def _compact_dumps(value: Any) -> str:
+    return _COMPACT_ENCODER.encode(value)
+
+
+def _pretty_dumps(value: Any) -> str:
+    """Wie json.dumps(indent=4), eingerückt als Element der obersten Ebene."""
+    return _PRETTY_ENCODER.encode(value).replace('\n', '\n' + _INDENT)
+
+
+def save_json(path: Union[str, Path], data: Any, compact: bool = False, atomic: bool = True,
+              fsync: str = 'none') -> bool:
     """
     Speichert Daten als JSON-Datei. Erstellt fehlende Ordner automatisch.
+
+    Endet der Pfad auf .gz oder .xz, wird komprimiert geschrieben (load_json
+    liest solche Dateien transparent). Standardmäßig wird atomar geschrieben:
+    ein Absturz hinterlässt nie eine halbe Datei.
     
     Args:
         path: Pfad zur JSON-Datei (String oder Path-Objekt)
         data: Daten, die gespeichert werden sollen (muss JSON-serialisierbar sein)
+        compact: Ohne Einrückung und Leerzeichen schreiben (kleiner und schneller)
+        atomic: Über temporäre Datei + Umbenennen schreiben
+        fsync: "none", "file" oder "full" (siehe _writer)
     
     Returns:
         True bei Erfolg, False bei Fehler.
     """
     path = Path(path)
     try:
-        # Elternverzeichnis anlegen, falls nicht vorhanden
-        path.parent.mkdir(parents=True, exist_ok=True)
-        with open(path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
+        # Elternverzeichnis wird in _writer angelegt
+        with _writer(path, atomic, fsync) as f:
+            write = f.write
+            for chunk in _encode(data, compact):
+                write(chunk)
+        return True
+    except (IOError, OSError, TypeError, ValueError):
+        return False
+    finally:
+        _invalidate(path)
+
+def save_json_stream(path: Union[str, Path], records: Iterable[Any],
+                     ndjson: bool = False, chunk_size: int = 1000, compact: bool = False,
+                     atomic: bool = True, fsync: str = 'none') -> bool:
+    """
+    Schreibt Datensätze schrittweise als JSON-Array oder NDJSON.
+
+    Im Gegensatz zu save_json muss die Datenmenge nicht komplett im Speicher
+    liegen: die Datensätze werden in Blöcken zu je chunk_size Einträgen
+    serialisiert und geschrieben. Das JSON-Array hat dasselbe Format wie
+    bei save_json (indent=4), NDJSON enthält einen Datensatz pro Zeile.
+
+    Args:
+        path: Pfad zur Ausgabedatei (String oder Path-Objekt, .gz/.xz komprimiert)
+        records: Beliebiges Iterable mit JSON-serialisierbaren Datensätzen
+        ndjson: True für NDJSON (eine Zeile pro Datensatz), sonst JSON-Array
+        chunk_size: Anzahl Datensätze pro Schreibvorgang
+        compact, atomic, fsync: wie bei save_json
+
+    Returns:
+        True bei Erfolg, False bei Fehler.
+    """
+    path = Path(path)
+    chunk_size = max(1, int(chunk_size))
+    if ndjson or compact:
+        dumps, item_sep, close_sep = _compact_dumps, ',', ''
+    else:
+        dumps, item_sep, close_sep = _pretty_dumps, ',\n' + _INDENT, '\n'
+    try:
+        with _writer(path, atomic, fsync) as f:
+            iterator = iter(records)
+            first = True
+            if not ndjson:
+                f.write('[')
+            while True:
+                chunk = list(islice(iterator, chunk_size))
+                if not chunk:
+                    break
+                parts = []
+                for record in chunk:
+                    if ndjson:
+                        parts.append(dumps(record))
+                        parts.append('\n')
+                    else:
+                        # Gleiche Form wie save_json für eine Liste
+                        if first:
+                            parts.append('' if compact else '\n' + _INDENT)
+                        else:
+                            parts.append(item_sep)
+                        parts.append(dumps(record))
+                    first = False
+                f.write(''.join(parts))
+            if not ndjson:
+                f.write(']' if first else close_sep + ']')
         return True
-    except (IOError, OSError, TypeError):
-        return False
\ No newline at end of file
+    except (IOError, OSError, TypeError, ValueError):
+        return False
+    finally:
+        _invalidate(path)
+
+
+# ----------------------------------------------------------------------
+# Elementweises Lesen großer JSON-Arrays
+# ----------------------------------------------------------------------
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_DELIMITERS = ' \t\n\r,]'
+# Elementanfang in einer mit indent=4 geschriebenen Liste (Zeile mit genau 4 Leerzeichen;
+# echte Zeilenumbrüche kommen in JSON-Strings nicht vor). Schließende Klammern zählen nicht.
+_PRETTY_ELEMENT = re.compile(rb'\n    [^ \]}]')
+_PRETTY_START = re.compile(rb'(?:\xef\xbb\xbf)?\[\r?\n    [^ ]')
+# Abweichung von genau diesem Format (dann wird geparst): eine Zeile, die weder die
+# schließende Klammer am Ende ist, noch tiefer eingerückt, noch mit 4 Leerzeichen genau
+# ein Element (Skalar, leerer Container, Öffner) oder eine Schließklammer enthält –
+# z.B. "    1, 2," oder "    {...}, {...}".
+_PRETTY_BAD_LINE = re.compile(
+    rb'\n(?!\][ \t\r\n]*\Z|    (?: |[\[{]\r?\n|[\]}],?\r?\n'
+    rb'|(?:"(?:[^"\\\n]|\\.)*"|-?[0-9][0-9.eE+-]*|true|false|null|\{\}|\[\]),?\r?\n))')
+
+
+def _read_chunks(f, chunk_size: int, use_mmap: bool) -> Iterator[bytes]:
+    """Liest eine Datei blockweise – direkt oder über eine Speicherabbildung."""
+    if use_mmap and os.fstat(f.fileno()).st_size > 0:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for start in range(0, len(mm), chunk_size):
+                yield mm[start:start + chunk_size]
+        return
+    for block in iter(lambda: f.read(chunk_size), b''):
+        yield block
+
+
+def iter_json_array(path: Union[str, Path], use_mmap: bool = False,
+                    chunk_size: int = 64 * 1024) -> Iterator[Any]:
+    """
+    Liefert die Elemente eines JSON-Arrays auf oberster Ebene nacheinander.
+
+    Es wird immer nur ein Block der Datei plus das aktuelle Element im
+    Speicher gehalten; ein Abbruch der Schleife (break) beendet das Lesen.
+    Funktioniert mit jeder Formatierung, auch mit der von save_json.
+
+    Args:
+        path: Pfad zur JSON-Datei
+        use_mmap: Datei per mmap lesen statt mit read() (nicht bei .gz/.xz)
+        chunk_size: Blockgröße in Bytes
+
+    Yields:
+        Die Elemente des Arrays.
+
+    Raises:
+        OSError: Datei nicht lesbar
+        ValueError: Kein JSON-Array oder ungültiges JSON
+    """
+    decoder = json.JSONDecoder()
+    path = Path(path)
+    compressed = _compression(path) is not None
+    with _open_binary(path) as f:
+        # Komprimierte Dateien lassen sich nicht sinnvoll abbilden
+        chunks = _read_chunks(f, chunk_size, use_mmap and not compressed)
+        text_decoder = codecs.getincrementaldecoder('utf-8-sig')()
+        buf, pos, eof = "", 0, False
+
+        def fill() -> bool:
+            """Hängt den nächsten Block an den Puffer an; False am Dateiende."""
+            nonlocal buf, pos, eof
+            if eof:
+                return False
+            block = next(chunks, None)
+            eof = block is None
+            buf = buf[pos:] + text_decoder.decode(block or b'', final=eof)
+            pos = 0
+            return not eof or bool(buf)
+
+        def next_char() -> str:
+            """Überspringt Leerraum und liefert das nächste Zeichen ('' am Ende)."""
+            nonlocal pos
+            while True:
+                pos = _WHITESPACE.match(buf, pos).end()
+                if pos < len(buf):
+                    return buf[pos]
+                if eof or not fill():
+                    return ''
+
+        if next_char() != '[':
+            raise ValueError(f"{path}: kein JSON-Array")
+        pos += 1
+        if next_char() == ']':
+            return
+
+        while True:
+            # Element dekodieren; folgt darauf kein Trennzeichen, könnte es
+            # abgeschnitten sein (z.B. "2" von "2.5") – dann mehr lesen.
+            while True:
+                try:
+                    item, end = decoder.raw_decode(buf, pos)
+                    if eof or (end < len(buf) and buf[end] in _DELIMITERS):
+                        break
+                except ValueError:
+                    if eof:
+                        raise
+                fill()
+            pos = end
+            yield item
+
+            c = next_char()
+            if c == ']':
+                return
+            if c != ',':
+                raise ValueError(f"{path}: ',' oder ']' erwartet, gefunden {c!r}")
+            pos += 1
+            next_char()
+
+
+def iter_ndjson(path: Union[str, Path]) -> Iterator[Any]:
+    """
+    Liefert die Datensätze einer NDJSON-Datei (eine JSON-Zeile pro Datensatz).
+
+    Leerzeilen werden übersprungen.
+
+    Raises:
+        OSError: Datei nicht lesbar
+        ValueError: Ungültige Zeile (mit Zeilennummer)
+    """
+    path = Path(path)
+    with _open_text(path) as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"{path}, Zeile {number}: {e}") from None
+
+
+def iter_records(path: Union[str, Path]) -> Iterator[Any]:
+    """Datensätze einer Importer-Ausgabe: .ndjson zeilenweise, sonst als JSON-Array."""
+    path = Path(path)
+    suffixes = path.suffixes
+    if _compression(path):
+        suffixes = suffixes[:-1]
+    if suffixes and suffixes[-1] == '.ndjson':
+        return iter_ndjson(path)
+    return iter_json_array(path)
+
+
+def count_json_array(path: Union[str, Path]) -> int:
+    """
+    Zählt die Elemente eines JSON-Arrays auf oberster Ebene.
+
+    Für Dateien genau im Format von save_json (indent=4, ein Element je Zeile)
+    genügt eine Suche nach Zeilenanfängen über eine Speicherabbildung, ohne
+    etwas zu parsen. Weicht die Formatierung irgendwo ab, wird mit
+    iter_json_array durchgezählt.
+    """
+    path = Path(path)
+    if _compression(path):
+        return sum(1 for _ in iter_json_array(path))
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size > 0:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if _PRETTY_START.match(mm) and not _PRETTY_BAD_LINE.search(mm):
+                    return sum(1 for _ in _PRETTY_ELEMENT.finditer(mm))
+    return sum(1 for _ in iter_json_array(path))
@@ -0,0 +1,441 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+kursplanung.py – Verteilt Schüler nach Wunschliste auf Kurse mit Kapazität.
+
+Gesucht ist die Zuteilung mit den geringsten Gesamtkosten: Kosten eines
+Schülers sind rank_cost(rang) für seinen Wunsch auf Rang 0, 1, 2, ... bzw.
+unassigned_cost, wenn er keinen seiner Wünsche bekommt. Das ist ein
+Min-Cost-Flow-Problem; gelöst wird es mit kürzesten erweiternden Wegen,
+allerdings nicht auf dem Graphen aller Schüler, sondern auf einem Graphen der
+Kurse (plus einem Knoten "ohne Kurs"):
+
+    Kante a -> b mit Gewicht w(a, b) = min über Schüler s in a, die b gewählt
+    haben, von kosten(s, b) - kosten(s, a)  (ein Schüler wechselt von a nach b)
+
+Ein neuer Schüler kommt mit einem kürzesten Weg (SPFA, Gewichte können
+negativ sein) von seinen Wünschen zu einem Kurs mit freiem Platz in den Plan;
+unterwegs wechseln einzelne Schüler den Kurs. Je Kante merkt sich ein Heap
+die Kandidaten, sodass w(a, b) immer sofort bereitsteht. Ist der Erstwunsch
+noch frei, ist das immer optimal (Schnellweg, ohne Suche).
+
+Änderungen (change_student, remove_student, set_capacity) lösen nicht neu:
+Ein frei gewordener Platz wird über einen Weg mit negativen Kosten an den
+Schüler weitergereicht, der davon am meisten profitiert, bis es keinen
+solchen Weg mehr gibt – danach ist der Plan wieder optimal.
+
+Verwendung:
+    plan = Kursplanung(load_kurse())                      # {"Ma": 25, ...}
+    plan.add_students(registry_wahlen(SchuelerRegistry.load()))
+    plan.change_student(4711, ["Ph", "Ma"])
+    save_assignment(plan, "kurszuteilung.json")
+
+    python kursplanung.py [--output DATEI]   # Master-Liste + kurse.json -> Zuteilung
+"""
+
+import heapq
+import sys
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from file_manager import FilePaths
+from json_helper import load_json, save_json
+from logger import Logger
+
+log = Logger()
+
+# Kosten für "keinen Wunsch bekommen"; muss über allen Rangkosten liegen
+DEFAULT_UNASSIGNED_COST = 10_000
+_INF = float("inf")
+
+
+def default_rank_cost(rank: int) -> int:
+    """Quadratisch: lieber zwei Zweitwünsche als ein Erst- und ein Drittwunsch."""
+    return rank * rank
+
+
+def load_kurse(path: Union[str, Path, None] = None) -> Dict[str, int]:
+    """
+    Kapazitäten aus kurse.json.
+
+    Erlaubt sind {"Ma": 25, ...} oder eine Liste von Dicts mit "id"/"kurs"
+    und "kapazitaet"/"max"/"plaetze".
+
+    Raises:
+        ValueError: Datei fehlt, ist unlesbar oder enthält keine Kapazität.
+    """
+    path = Path(path) if path is not None else FilePaths.KURSE
+    data = load_json(path)
+    if data is None:
+        raise ValueError(f"Kursliste fehlt oder ist nicht lesbar: {path}")
+    if isinstance(data, dict):
+        data = data.get("kurse", data)
+    if isinstance(data, dict):
+        items = data.items()
+    else:
+        items = []
+        for entry in data:
+            kurs = entry.get("id", entry.get("kurs"))
+            items.append((kurs, entry.get("kapazitaet", entry.get("max", entry.get("plaetze")))))
+    capacities = {}
+    for kurs, capacity in items:
+        if kurs is None or capacity is None or int(capacity) < 0:
+            raise ValueError(f"Kurs ohne gültige Kapazität: {kurs!r}")
+        capacities[str(kurs)] = int(capacity)
+    return capacities
+
+
+def registry_wahlen(registry) -> Iterable[Tuple[Any, Sequence[str]]]:
+    """(id, kurswünsche) aller Schüler einer SchuelerRegistry."""
+    return ((record.id, record.kurse) for record in registry)
+
+
+class Kursplanung:
+    """
+    Optimale Kurszuteilung mit schrittweiser Anpassung.
+
+    Args:
+        capacities: Kurs -> Anzahl Plätze
+        rank_cost: Kosten je Wunschrang (0 = Erstwunsch), Standard rang²
+        unassigned_cost: Kosten, wenn kein Wunsch erfüllt wird
+
+    Attribute:
+        kurse (list): Kursnamen; Knoten len(kurse) ist "ohne Kurs".
+        fast_path (int): Schüler, die ohne Suche ihren Erstwunsch bekamen.
+        searches (int): Kürzeste-Wege-Suchen (Einfügen und Reparatur).
+        moves (int): Kurswechsel bereits eingeteilter Schüler.
+    """
+
+    def __init__(self, capacities: Dict[str, int], rank_cost: Callable[[int], int] = default_rank_cost,
+                 unassigned_cost: int = DEFAULT_UNASSIGNED_COST):
+        self.kurse = list(capacities)
+        self._node = {kurs: i for i, kurs in enumerate(self.kurse)}
+        self._none = len(self.kurse)                      # Knoten "ohne Kurs"
+        nodes = self._none + 1
+        self._capacity = [int(capacities[k]) for k in self.kurse] + [sys.maxsize]
+        self._load = [0] * nodes
+        self.rank_cost = rank_cost
+        self.unassigned_cost = unassigned_cost
+        # Schüler: id -> Kosten je Knoten, aktueller Knoten, Stempel des Eintritts
+        # (Heap-Einträge mit anderem Stempel sind veraltet)
+        self._options: Dict[Any, Dict[int, int]] = {}
+        self._where: Dict[Any, int] = {}
+        self._stamp: Dict[Any, int] = {}
+        self._next_stamp = 0
+        self._members: List[Dict[Any, None]] = [{} for _ in range(nodes)]
+        # Je Kante a -> b: Heap (delta, stempel, id) und das aktuelle Minimum
+        self._heaps = [[[] for _ in range(nodes)] for _ in range(nodes)]
+        self._weight = [[_INF] * nodes for _ in range(nodes)]
+        self.unknown = 0
+        self.fast_path = 0
+        self.searches = 0
+        self.moves = 0
+
+    # ------------------------------------------------------------------
+    # Öffentliche Schnittstelle
+    # ------------------------------------------------------------------
+    def add_student(self, student_id, wahlen: Sequence[str]) -> Optional[str]:
+        """
+        Teilt einen Schüler ein (Plan bleibt optimal). Liefert seinen Kurs.
+
+        Unbekannte Kurse in den Wünschen werden übersprungen (gezählt in unknown).
+
+        Raises:
+            ValueError: Wenn der Schüler schon eingeteilt ist.
+        """
+        if student_id in self._where:
+            raise ValueError(f"Schüler {student_id!r} ist schon eingeteilt")
+        options = {}
+        for kurs in wahlen:
+            node = self._node.get(kurs)
+            if node is None:
+                self.unknown += 1
+            elif node not in options:
+                options[node] = self.rank_cost(len(options))
+        options[self._none] = self.unassigned_cost
+        self._options[student_id] = options
+        self._insert(student_id)
+        return self.kurs_of(student_id)
+
+    def add_students(self, students: Iterable[Tuple[Any, Sequence[str]]]) -> "Kursplanung":
+        """Teilt viele Schüler ein: (id, wünsche) je Schüler."""
+        for student_id, wahlen in students:
+            self.add_student(student_id, wahlen)
+        return self
+
+    def remove_student(self, student_id):
+        """Nimmt einen Schüler heraus und gibt seinen Platz optimal weiter."""
+        node = self._where[student_id]
+        self._leave(student_id)
+        del self._where[student_id], self._options[student_id]
+        self._repair(node)
+
+    def change_student(self, student_id, wahlen: Sequence[str]) -> Optional[str]:
+        """Neue Wünsche für einen Schüler – schrittweise, ohne neu zu lösen."""
+        self.remove_student(student_id)
+        return self.add_student(student_id, wahlen)
+
+    def set_capacity(self, kurs: str, capacity: int):
+        """Ändert die Kapazität eines Kurses; überzählige Schüler werden neu eingeteilt."""
+        node = self._node[kurs]
+        capacity = int(capacity)
+        if capacity > self._capacity[node]:
+            # Platz für Platz: dann gibt es je Reparatur nur einen neuen freien
+            # Platz, und der Plan ist danach wieder optimal
+            while self._capacity[node] < capacity:
+                self._capacity[node] += 1
+                if not self._repair(node):
+                    break                  # keiner will nachrücken, weitere Plätze auch nicht
+            self._capacity[node] = capacity
+            return
+        self._capacity[node] = capacity
+        # Zu viele Schüler: die mit den geringsten Mehrkosten herausnehmen und neu einteilen
+        excess = self._load[node] - capacity
+        if excess > 0:
+            members = sorted(self._members[node], key=lambda sid: self._second_best(sid, node))
+            evicted = members[:excess]
+            for sid in evicted:
+                self._leave(sid)
+                del self._where[sid]
+            for sid in evicted:
+                self._insert(sid)
+
+    def kurs_of(self, student_id) -> Optional[str]:
+        """Kurs eines Schülers (None = kein Wunsch erfüllt)."""
+        node = self._where[student_id]
+        return None if node == self._none else self.kurse[node]
+
+    def rank_of(self, student_id) -> Optional[int]:
+        """Erfüllter Wunschrang (0 = Erstwunsch, None = ohne Kurs)."""
+        node = self._where[student_id]
+        if node == self._none:
+            return None
+        return list(self._options[student_id]).index(node)
+
+    def assignment(self) -> Dict[Any, Optional[str]]:
+        """Schüler-id -> Kurs (None = ohne Kurs)."""
+        return {sid: self.kurs_of(sid) for sid in self._where}
+
+    def loads(self) -> Dict[str, int]:
+        """Belegung je Kurs."""
+        return {kurs: self._load[i] for i, kurs in enumerate(self.kurse)}
+
+    def capacities(self) -> Dict[str, int]:
+        """Aktuelle Kapazität je Kurs."""
+        return {kurs: self._capacity[i] for i, kurs in enumerate(self.kurse)}
+
+    def total_cost(self) -> int:
+        return sum(self._options[sid][node] for sid, node in self._where.items())
+
+    def stats(self) -> dict:
+        """Kennzahlen: Anzahl je erfülltem Rang, ohne Kurs, Kosten, Suchen."""
+        ranks = {}
+        for sid in self._where:
+            rank = self.rank_of(sid)
+            ranks[rank] = ranks.get(rank, 0) + 1
+        return {"students": len(self._where), "by_rank": {r: ranks[r] for r in sorted(ranks, key=lambda r: (r is None, r))},
+                "unassigned": ranks.get(None, 0), "cost": self.total_cost(), "fast_path": self.fast_path,
+                "searches": self.searches, "moves": self.moves, "unknown_courses": self.unknown}
+
+    def __len__(self):
+        return len(self._where)
+
+    # ------------------------------------------------------------------
+    # Graph der Kurse
+    # ------------------------------------------------------------------
+    def _enter(self, sid, node: int):
+        """Schüler kommt in node; seine Wechselkanten node -> b werden eingetragen."""
+        self._where[sid] = node
+        self._members[node][sid] = None
+        self._load[node] += 1
+        options = self._options[sid]
+        here = options[node]
+        stamp = self._stamp[sid] = self._next_stamp
+        self._next_stamp += 1
+        heaps, weights = self._heaps[node], self._weight[node]
+        for target, cost in options.items():
+            if target != node:
+                delta = cost - here
+                heapq.heappush(heaps[target], (delta, stamp, sid))
+                if delta < weights[target]:
+                    weights[target] = delta
+
+    def _leave(self, sid):
+        """Schüler verlässt seinen Knoten; Kanten, deren Minimum er war, werden erneuert."""
+        node = self._where[sid]
+        del self._members[node][sid]
+        self._load[node] -= 1
+        del self._stamp[sid]                           # alte Heap-Einträge sind damit ungültig
+        heaps, weights = self._heaps[node], self._weight[node]
+        for target in self._options[sid]:
+            if target != node and heaps[target] and heaps[target][0][2] == sid:
+                weights[target] = self._clean(node, target)
+
+    def _clean(self, node: int, target: int) -> float:
+        """Entfernt ungültige Einträge oben im Heap; liefert das neue Kantengewicht."""
+        heap = self._heaps[node][target]
+        where, stamps = self._where, self._stamp
+        while heap:
+            _, stamp, sid = heap[0]
+            if stamps.get(sid) == stamp and where[sid] == node:
+                return heap[0][0]
+            heapq.heappop(heap)
+        return _INF
+
+    def _move(self, sid, target: int):
+        self._leave(sid)
+        self._enter(sid, target)
+        self.moves += 1
+
+    def _second_best(self, sid, node: int) -> int:
+        """Mehrkosten, wenn der Schüler node verlassen muss (günstigste andere Option)."""
+        options = self._options[sid]
+        return min(cost for target, cost in options.items() if target != node) - options[node]
+
+    # ------------------------------------------------------------------
+    # Einfügen und Reparatur
+    # ------------------------------------------------------------------
+    def _insert(self, sid):
+        """Kürzester Weg von den Wünschen des Schülers zu einem freien Platz."""
+        options = self._options[sid]
+        capacity, load = self._capacity, self._load
+        first = next(iter(options))
+        if load[first] < capacity[first] and options[first] == min(options.values()):
+            # Erstwunsch frei: Kosten minimal, Wechsel anderer Schüler können
+            # im optimalen Plan nichts mehr verbessern
+            self.fast_path += 1
+            self._enter(sid, first)
+            return
+
+        self.searches += 1
+        nodes = len(load)
+        dist = [_INF] * nodes
+        parent = [-1] * nodes
+        for node, cost in options.items():
+            dist[node] = cost
+        self._spfa(dist, parent, list(options), forward=True)
+        target = min((node for node in range(nodes) if load[node] < capacity[node]), key=dist.__getitem__)
+
+        # Weg rückwärts abgehen: jeder Knoten gibt einen Schüler an den nächsten ab
+        node = target
+        while parent[node] != -1:
+            source = parent[node]
+            self._move(self._heaps[source][node][0][2], node)
+            node = source
+        self._enter(sid, node)
+
+    def _repair(self, freed: int) -> bool:
+        """
+        Ein Platz in `freed` ist frei geworden: Solange ein Weg u -> ... -> freed
+        die Kosten senkt, wandern Schüler entlang des Wegs nach; der frei
+        gewordene Platz liegt danach in u. True, wenn sich etwas geändert hat.
+        """
+        changed = False
+        while freed != self._none and self._load[freed] < self._capacity[freed]:
+            self.searches += 1
+            nodes = len(self._load)
+            dist = [_INF] * nodes
+            parent = [-1] * nodes
+            dist[freed] = 0
+            self._spfa(dist, parent, [freed], forward=False)
+            start = min(range(nodes), key=dist.__getitem__)
+            if dist[start] >= 0:
+                break
+            # parent zeigt hier in Wegrichtung: start -> parent[start] -> ... -> freed
+            node = start
+            moves = []
+            while node != freed:
+                moves.append((self._heaps[node][parent[node]][0][2], parent[node]))
+                node = parent[node]
+            for sid, target in moves:
+                self._move(sid, target)
+            changed = True
+            freed = start
+        return changed
+
+    def _spfa(self, dist: List[float], parent: List[int], start: List[int], forward: bool):
+        """
+        Kürzeste Wege mit negativen Kantengewichten (Bellman-Ford mit Warteschlange).
+
+        forward=True: Wege ab den Startknoten (parent = Vorgänger);
+        forward=False: Wege zu den Startknoten auf umgedrehten Kanten
+        (parent = Nachfolger in Wegrichtung).
+        """
+        weight = self._weight
+        nodes = len(dist)
+        queue = deque(start)
+        queued = [False] * nodes
+        for node in start:
+            queued[node] = True
+        enqueued = [0] * nodes
+        while queue:
+            u = queue.popleft()
+            queued[u] = False
+            du = dist[u]
+            if forward:
+                edges = enumerate(weight[u])
+            else:
+                edges = ((v, weight[v][u]) for v in range(nodes))
+            for v, w in edges:
+                if w == _INF:
+                    continue
+                candidate = du + w
+                if candidate < dist[v]:
+                    dist[v] = candidate
+                    parent[v] = u
+                    if not queued[v]:
+                        queued[v] = True
+                        queue.append(v)
+                        enqueued[v] += 1
+                        if enqueued[v] > nodes:
+                            # Darf im optimalen Plan nicht vorkommen
+                            raise RuntimeError("negativer Zyklus im Kursgraphen")
+
+
+# ----------------------------------------------------------------------
+# Ein- und Ausgabe
+# ----------------------------------------------------------------------
+def save_assignment(plan: Kursplanung, path: Union[str, Path]) -> bool:
+    """Speichert Zuteilung, Belegung und Kennzahlen als JSON."""
+    stats = plan.stats()
+    stats["by_rank"] = {("ohne" if r is None else str(r + 1)): n for r, n in stats["by_rank"].items()}
+    capacities = plan.capacities()
+    data = {
+        "zuteilung": [{"id": sid, "kurs": kurs, "wunsch": None if kurs is None else plan.rank_of(sid) + 1}
+                      for sid, kurs in plan.assignment().items()],
+        "belegung": {kurs: {"schueler": load, "kapazitaet": capacities[kurs]}
+                     for kurs, load in plan.loads().items()},
+        "statistik": stats,
+    }
+    return save_json(path, data)
+
+
+def main():
+    import argparse
+    from schueler_registry import SchuelerRegistry
+
+    parser = argparse.ArgumentParser(description="Kurszuteilung nach Wunschliste (Min-Cost-Flow)")
+    parser.add_argument("--schueler", help="Schülerliste (Standard: schueler_master_liste.json)")
+    parser.add_argument("--kurse", help="Kursliste mit Kapazitäten (Standard: kurse.json)")
+    parser.add_argument("--output", help="Ausgabe (Standard: OUTPUT/kurszuteilung.json)")
+    args = parser.parse_args()
+
+    try:
+        capacities = load_kurse(args.kurse)
+        registry = SchuelerRegistry.load(args.schueler)
+    except ValueError as e:
+        log.error(str(e))
+        sys.exit(1)
+    plan = Kursplanung(capacities).add_students(registry_wahlen(registry))
+    output = Path(args.output) if args.output else FilePaths.get_output_file("kurszuteilung.json")
+    if not save_assignment(plan, output):
+        log.error(f"Zuteilung konnte nicht gespeichert werden: {output}")
+        sys.exit(1)
+    stats = plan.stats()
+    log.info(f"{stats['students']} Schüler eingeteilt, ohne Kurs: {stats['unassigned']}, "
+             f"Kosten {stats['cost']} -> {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+log_collector.py – Sammelt Logzeilen mehrerer Prozesse in einer Logdatei.
+
+Der Collector ist der einzige Prozess, der in die Logdatei schreibt. Logger
+in anderen Prozessen (Dashboard-Skripte, Batch-Worker, ...) verbinden sich
+über eine lokale TCP-Verbindung und schicken ihre fertig formatierten
+Zeilen; der Collector schreibt sie gepuffert mit einem einzigen Dateihandle.
+Dadurch vermischen oder zerreißen keine Zeilen mehr, wenn viele Prozesse
+gleichzeitig loggen.
+
+Protokoll (UTF-8, zeilenbasiert):
+    Client -> "HELLO <absoluter Pfad der Logdatei>\n"
+    Server -> "OK\n" (gleiche Datei) oder "NO\n" (Client schreibt dann selbst)
+    Client -> beliebig viele Logzeilen, jeweils mit "\n" abgeschlossen
+
+Verwendung:
+    python log_collector.py [--log-file pfad] [--host 127.0.0.1] [--port 47311]
+                            [--max-bytes 10000000] [--backups 5]
+
+Die Adresse für die Logger wird über die Umgebungsvariable
+TOOLBOX_LOG_COLLECTOR="host:port" gesetzt (Standard 127.0.0.1:47311,
+"off" schaltet die Verbindung ab).
+"""
+
+import argparse
+import socketserver
+import threading
+from pathlib import Path
+from typing import Optional
+
+from file_manager import FilePaths
+from logger import DEFAULT_COLLECTOR_ADDRESS, _get_writer, flush_all
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """Nimmt die Zeilen eines verbundenen Loggers entgegen."""
+
+    def handle(self):
+        server = self.server
+        hello = self.rfile.readline().decode("utf-8", errors="replace").strip()
+        if not hello.startswith("HELLO ") or Path(hello[6:]).resolve() != server.log_file:
+            self.wfile.write(b"NO\n")
+            return
+        self.wfile.write(b"OK\n")
+
+        for raw in self.rfile:
+            if not raw.endswith(b"\n"):
+                break  # Client mitten in der Zeile abgebrochen – Rest verwerfen
+            server.writer.write(raw.decode("utf-8", errors="replace"))
+
+
+class LogCollector(socketserver.ThreadingTCPServer):
+    """
+    TCP-Server, der Logzeilen annimmt und in eine Datei schreibt.
+
+    Attribute:
+        log_file (Path): Die gesammelte Logdatei.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, log_file: Optional[Path] = None, host: str = DEFAULT_COLLECTOR_ADDRESS[0],
+                 port: int = DEFAULT_COLLECTOR_ADDRESS[1], max_bytes: int = 0, backups: int = 5):
+        self.log_file = Path(log_file or FilePaths.LOGFILE).resolve()
+        self.log_file.parent.mkdir(parents=True, exist_ok=True)
+        # Eigener Schreiber ohne Collector (getrennt von den Loggern dieses Prozesses),
+        # sonst würde er seine Zeilen an sich selbst schicken.
+        # Als einziger Schreiber ist der Collector auch für die Rotation zuständig.
+        self.writer = _get_writer(self.log_file, batch_size=1024, flush_interval=0.5, use_collector=False,
+                                  max_bytes=max_bytes, backups=backups)
+        super().__init__((host, port), _Handler)
+
+    @property
+    def address(self):
+        """Tatsächliche Adresse (host, port) – nützlich bei port=0."""
+        return self.server_address[:2]
+
+    def serve_in_background(self) -> threading.Thread:
+        """Startet den Collector in einem Daemon-Thread (z.B. im Dashboard)."""
+        thread = threading.Thread(target=self.serve_forever, name="LogCollector", daemon=True)
+        thread.start()
+        return thread
+
+    def server_close(self):
+        super().server_close()
+        self.writer.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Log-Collector für die Toolbox")
+    parser.add_argument("--log-file", help=f"Logdatei (Standard {FilePaths.LOGFILE})")
+    parser.add_argument("--host", default=DEFAULT_COLLECTOR_ADDRESS[0], help="Adresse (Standard 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=DEFAULT_COLLECTOR_ADDRESS[1], help="Port (Standard 47311)")
+    parser.add_argument("--max-bytes", type=int, default=0, help="Rotieren ab dieser Größe (0 = nie)")
+    parser.add_argument("--backups", type=int, default=5, help="Anzahl aufbewahrter Segmente")
+    args = parser.parse_args()
+
+    collector = LogCollector(args.log_file, args.host, args.port, args.max_bytes, args.backups)
+    print(f"Log-Collector läuft auf {args.host}:{collector.address[1]} -> {collector.log_file} (Strg+C beendet)")
+    try:
+        collector.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        collector.server_close()
+        flush_all()
+
+
+if __name__ == "__main__":
+    main()
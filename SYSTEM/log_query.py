@@ -0,0 +1,301 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+log_query.py – Schnelle Abfragen über die Logdatei mit Index und Rotation.
+
+Zu jeder Logdatei wird eine Index-Datei (<log>.idx.json) geführt. Sie teilt
+die Datei in Blöcke von ca. 64 KiB und merkt sich je Block:
+    - Byte-Offset des Blockanfangs
+    - kleinster und größter Zeitstempel
+    - welche Level im Block vorkommen (Bitmaske)
+Der Index wird inkrementell fortgeschrieben, wenn die Datei wächst. Abfragen
+lesen nur die Blöcke, die zum Zeitraum und zu den Leveln passen.
+
+Rotation: rotate() benennt dashboard_log.txt in dashboard_log.txt.1 um
+(ältere Segmente rücken nach, höchstens `backups` Stück) und verschiebt den
+Index mit. Abfragen laufen über alle Segmente, ältestes zuerst.
+
+Verwendung:
+    python log_query.py --level ERROR --since "2026-10-17 18:00" --until "2026-10-18 06:00"
+    python log_query.py --contains "Import" --last 1h
+    python log_query.py --rotate --max-bytes 10000000
+"""
+
+import argparse
+import hashlib
+import os
+import re
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+from file_manager import FilePaths
+from json_helper import load_json, save_json
+from logger import LEVELS
+
+INDEX_VERSION = 1
+BLOCK_SIZE = 64 * 1024
+_FINGERPRINT_BYTES = 256
+
+# Bit je Level in der Blockmaske; unbekannte Level -> Bit 0
+_LEVEL_BITS = {name: 1 << (i + 1) for i, name in enumerate(LEVELS)}
+
+# "2026-10-18 17:23:01 | INFO     | Meldung"
+_LINE_RE = re.compile(rb"^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}) \| (\w+)\s*\| ")
+_TS_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def index_path(log_file: Union[str, Path]) -> Path:
+    """Pfad der Index-Datei zu einer Logdatei."""
+    log_file = Path(log_file)
+    return log_file.with_name(log_file.name + ".idx.json")
+
+
+def segments(log_file: Union[str, Path]) -> list:
+    """Alle Segmente einer Logdatei, ältestes zuerst (log.3, log.2, log.1, log)."""
+    log_file = Path(log_file)
+    rotated = []
+    n = 1
+    while log_file.with_name(f"{log_file.name}.{n}").exists():
+        rotated.append(log_file.with_name(f"{log_file.name}.{n}"))
+        n += 1
+    result = list(reversed(rotated))
+    if log_file.exists():
+        result.append(log_file)
+    return result
+
+
+def _fingerprint(f, size: int) -> str:
+    """Hash über den Dateianfang – erkennt abgeschnittene oder ersetzte Dateien."""
+    f.seek(0)
+    return hashlib.sha1(f.read(min(size, _FINGERPRINT_BYTES))).hexdigest()
+
+
+def _parse(line: bytes, last_ts: str, last_level: str):
+    """Liefert (Zeitstempel, Level) einer Zeile; Folgezeilen erben die Werte davor."""
+    m = _LINE_RE.match(line)
+    if m is None:
+        return last_ts, last_level
+    return m.group(1).decode("ascii"), m.group(2).decode("ascii", errors="replace")
+
+
+# ----------------------------------------------------------------------
+# Index
+# ----------------------------------------------------------------------
+def update_index(log_file: Union[str, Path], block_size: int = BLOCK_SIZE) -> dict:
+    """
+    Bringt den Index einer Logdatei auf den aktuellen Stand und speichert ihn.
+
+    Es wird nur der neue Teil der Datei gelesen. Ist die Datei kürzer als
+    beim letzten Mal oder hat sich ihr Anfang geändert, wird neu aufgebaut.
+
+    Returns:
+        Der Index (dict mit size, fingerprint und blocks).
+    """
+    log_file = Path(log_file)
+    idx_file = index_path(log_file)
+    index = load_json(idx_file, default=None)
+
+    with open(log_file, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        fingerprint = _fingerprint(f, size)
+        valid = (isinstance(index, dict) and index.get("version") == INDEX_VERSION
+                 and index.get("block_size") == block_size and index.get("size", 0) <= size
+                 and (index.get("fingerprint") == fingerprint or index.get("size", 0) < _FINGERPRINT_BYTES))
+        if not valid:
+            index = {"version": INDEX_VERSION, "block_size": block_size, "size": 0, "blocks": []}
+        if index["size"] == size and index.get("fingerprint") == fingerprint:
+            return index
+
+        blocks = index["blocks"]
+        # Den letzten (evtl. unvollständigen) Block neu aufbauen
+        offset = blocks.pop()[0] if blocks else 0
+        f.seek(offset)
+        last_ts, last_level = "", ""
+        block = None
+        for line in f:
+            if not line.endswith(b"\n"):
+                break  # unvollständige letzte Zeile – beim nächsten Mal
+            ts, level = _parse(line, last_ts, last_level)
+            if block is None:
+                block = [offset, ts, ts, 0]
+            if ts:
+                block[1] = min(block[1], ts) if block[1] else ts
+                block[2] = max(block[2], ts)
+            block[3] |= _LEVEL_BITS.get(level, 1)
+            last_ts, last_level = ts, level
+            offset += len(line)
+            if offset - block[0] >= block_size:
+                blocks.append(block)
+                block = None
+        if block is not None:
+            blocks.append(block)
+
+    index["size"] = offset
+    index["fingerprint"] = fingerprint
+    save_json(idx_file, index)
+    return index
+
+
+# ----------------------------------------------------------------------
+# Abfragen
+# ----------------------------------------------------------------------
+def query(log_file: Union[str, Path, None] = None, levels=None, since: Optional[str] = None,
+          until: Optional[str] = None, contains: Optional[str] = None,
+          limit: Optional[int] = None) -> Iterator[str]:
+    """
+    Liefert passende Logzeilen aus allen Segmenten (ältestes zuerst).
+
+    Args:
+        log_file: Logdatei (Standard FilePaths.LOGFILE)
+        levels: Iterable von Leveln (z.B. {"ERROR", "CRITICAL"}) oder None für alle
+        since, until: Zeitstempel "YYYY-MM-DD HH:MM:SS" (einschließlich) oder None
+        contains: Teilstring, der in der Zeile vorkommen muss
+        limit: Höchstzahl an Treffern
+
+    Yields:
+        Zeilen ohne Zeilenumbruch.
+    """
+    levels = {lvl.upper() for lvl in levels} if levels else None
+    mask = sum(_LEVEL_BITS.get(lvl, 1) for lvl in levels) if levels else -1
+    needle = contains.encode("utf-8") if contains else None
+    found = 0
+
+    for segment in segments(log_file or FilePaths.LOGFILE):
+        index = update_index(segment)
+        blocks = index["blocks"]
+        with open(segment, "rb") as f:
+            for i, (offset, first_ts, last_ts, block_mask) in enumerate(blocks):
+                if not block_mask & mask:
+                    continue
+                if since and last_ts and last_ts < since:
+                    continue
+                if until and first_ts and first_ts > until:
+                    continue
+                end = blocks[i + 1][0] if i + 1 < len(blocks) else index["size"]
+                f.seek(offset)
+                last = ("", "")
+                for line in f.read(end - offset).splitlines():
+                    ts, level = last = _parse(line, *last)
+                    if levels and level not in levels:
+                        continue
+                    if (since and ts < since) or (until and ts > until):
+                        continue
+                    if needle and needle not in line:
+                        continue
+                    yield line.decode("utf-8", errors="replace")
+                    found += 1
+                    if limit and found >= limit:
+                        return
+
+
+# ----------------------------------------------------------------------
+# Rotation
+# ----------------------------------------------------------------------
+def rotate(log_file: Union[str, Path, None] = None, max_bytes: int = 10 * 1024 * 1024,
+           backups: int = 5) -> bool:
+    """
+    Rotiert die Logdatei, wenn sie mindestens max_bytes groß ist.
+
+    Der Index der aktuellen Datei wird vorher vervollständigt und zusammen
+    mit der Datei umbenannt, sodass alle Segmente gültige Indizes behalten.
+    Der schreibende Prozess muss seinen Dateihandle vorher schließen.
+
+    Returns:
+        True, wenn rotiert wurde.
+    """
+    log_file = Path(log_file or FilePaths.LOGFILE)
+    try:
+        if log_file.stat().st_size < max_bytes:
+            return False
+    except OSError:
+        return False
+
+    update_index(log_file)
+
+    def move(src: Path, dst: Path):
+        for a, b in ((src, dst), (index_path(src), index_path(dst))):
+            if a.exists():
+                os.replace(a, b)
+
+    def numbered(n: int) -> Path:
+        return log_file.with_name(f"{log_file.name}.{n}")
+
+    # Ältestes Segment verwerfen, Rest nachrücken
+    for path in (numbered(backups), index_path(numbered(backups))):
+        if path.exists():
+            path.unlink()
+    for n in range(backups - 1, 0, -1):
+        move(numbered(n), numbered(n + 1))
+    if backups > 0:
+        move(log_file, numbered(1))
+    else:
+        log_file.unlink()
+        index_path(log_file).unlink(missing_ok=True)
+    return True
+
+
+# ----------------------------------------------------------------------
+# Kommandozeile
+# ----------------------------------------------------------------------
+def _parse_time(text: str, end: bool = False) -> str:
+    """'2026-10-18', '2026-10-18 17:00' oder '2026-10-18 17:00:05' -> Vergleichsstring."""
+    for fmt in (_TS_FORMAT, "%Y-%m-%d %H:%M", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%dT%H:%M", "%Y-%m-%d"):
+        try:
+            value = datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+        if end and fmt == "%Y-%m-%d":
+            value += timedelta(days=1, seconds=-1)  # ganzer Tag
+        return value.strftime(_TS_FORMAT)
+    raise argparse.ArgumentTypeError(f"Ungültiger Zeitpunkt: {text}")
+
+
+def _parse_duration(text: str) -> timedelta:
+    """'90s', '30m', '1h', '2d' -> timedelta."""
+    m = re.fullmatch(r"(\d+)([smhd])", text.strip())
+    if not m:
+        raise argparse.ArgumentTypeError(f"Ungültige Dauer: {text} (z.B. 30m, 1h, 2d)")
+    unit = {"s": "seconds", "m": "minutes", "h": "hours", "d": "days"}[m.group(2)]
+    return timedelta(**{unit: int(m.group(1))})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Abfragen über die Logdatei")
+    parser.add_argument("--log-file", help=f"Logdatei (Standard {FilePaths.LOGFILE})")
+    parser.add_argument("--level", action="append", help="Level filtern (mehrfach möglich), z.B. ERROR")
+    parser.add_argument("--since", type=_parse_time, help="Ab Zeitpunkt, z.B. '2026-10-17 18:00'")
+    parser.add_argument("--until", type=lambda t: _parse_time(t, end=True), help="Bis Zeitpunkt")
+    parser.add_argument("--last", type=_parse_duration, help="Nur die letzte Zeitspanne, z.B. 1h")
+    parser.add_argument("--contains", help="Teilstring, der vorkommen muss")
+    parser.add_argument("--limit", type=int, help="Höchstzahl an Treffern")
+    parser.add_argument("--count", action="store_true", help="Nur die Anzahl der Treffer ausgeben")
+    parser.add_argument("--rotate", action="store_true", help="Logdatei rotieren, wenn sie zu groß ist")
+    parser.add_argument("--max-bytes", type=int, default=10 * 1024 * 1024, help="Größe für --rotate")
+    parser.add_argument("--backups", type=int, default=5, help="Anzahl aufbewahrter Segmente")
+    args = parser.parse_args()
+
+    log_file = Path(args.log_file) if args.log_file else FilePaths.LOGFILE
+    if args.rotate:
+        rotated = rotate(log_file, args.max_bytes, args.backups)
+        print("Rotiert." if rotated else "Keine Rotation nötig.")
+        return
+
+    since = args.since
+    if args.last:
+        since = max(since or "", (datetime.now() - args.last).strftime(_TS_FORMAT))
+
+    matches = query(log_file, args.level, since, args.until, args.contains, args.limit)
+    if args.count:
+        print(sum(1 for _ in matches))
+        return
+    try:
+        for line in matches:
+            print(line)
+    except BrokenPipeError:  # z.B. bei | head
+        sys.stderr.close()
+
+
+if __name__ == "__main__":
+    main()
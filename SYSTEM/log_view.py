@@ -0,0 +1,133 @@
+# SYSTEM/log_view.py
+"""Puffer und Taktung für die Log-Anzeige im Dashboard (ohne Tk-Abhängigkeit).
+
+Kindprozesse können zehntausende Zeilen pro Sekunde ausgeben. Würde jede
+Zeile einzeln in das Text-Widget eingefügt, stünde die Tk-Hauptschleife
+still. Deshalb:
+
+- LogBuffer sammelt Zeilen aus beliebigen Threads. Er hält höchstens
+  max_lines noch nicht angezeigte Zeilen; ältere werden verworfen und
+  gezählt (sie wären ohnehin sofort wieder aus der Anzeige gefallen).
+- Die Anzeige holt pro Takt alle neuen Zeilen mit take() und fügt sie mit
+  einem einzigen insert ein; was über max_lines hinausgeht, wird oben
+  abgeschnitten (trimmed()).
+- AdaptiveInterval passt den Abfragetakt an: im Leerlauf selten, bei
+  Ausgabe häufig, aber nie so oft, dass das Zeichnen die Schleife auffrisst.
+
+Verwendung (im Dashboard):
+    buffer = LogBuffer(max_lines=5000)
+    buffer.append("Zeile")               # aus jedem Thread
+    lines, trim = buffer.take()          # im Tk-Thread, einmal pro Takt
+    text.insert("end", "\n".join(lines) + "\n")
+    if trim:
+        text.delete("1.0", f"{trim + 1}.0")  # älteste Zeilen oben entfernen
+"""
+
+import threading
+from collections import deque
+from typing import Iterable, List, Tuple
+
+DEFAULT_MAX_LINES = 5000
+
+
+class LogBuffer:
+    """
+    Thread-sicherer Ringpuffer für anzuzeigende Logzeilen.
+
+    Attribute:
+        max_lines (int): Höchstzahl gepufferter bzw. angezeigter Zeilen.
+        received (int): Insgesamt angenommene Zeilen.
+        dropped (int): Zeilen, die verworfen wurden, bevor sie angezeigt wurden.
+        trimmed (int): Zeilen, die oben aus der Anzeige entfernt wurden.
+    """
+
+    def __init__(self, max_lines: int = DEFAULT_MAX_LINES):
+        self.max_lines = max(1, int(max_lines))
+        self._pending = deque()
+        self._lock = threading.Lock()
+        self.received = 0
+        self.dropped = 0
+        self.trimmed = 0
+        self._shown = 0
+
+    def append(self, line: str):
+        """Nimmt eine Zeile an (aus jedem Thread)."""
+        with self._lock:
+            self._pending.append(line)
+            self.received += 1
+            if len(self._pending) > self.max_lines:
+                self._pending.popleft()
+                self.dropped += 1
+
+    def extend(self, lines: Iterable[str]):
+        """Nimmt mehrere Zeilen auf einmal an."""
+        with self._lock:
+            for line in lines:
+                self._pending.append(line)
+                self.received += 1
+            excess = len(self._pending) - self.max_lines
+            for _ in range(max(0, excess)):
+                self._pending.popleft()
+            self.dropped += max(0, excess)
+
+    def take(self) -> Tuple[List[str], int]:
+        """
+        Liefert alle neuen Zeilen und wie viele Zeilen danach oben zu entfernen sind.
+
+        Der Aufrufer fügt die Zeilen ein, löscht die ersten `trim` Zeilen des
+        Widgets und hat dann wieder höchstens max_lines Zeilen.
+
+        Returns:
+            (lines, trim)
+        """
+        with self._lock:
+            lines = list(self._pending)
+            self._pending.clear()
+        trim = max(0, self._shown + len(lines) - self.max_lines)
+        self._shown += len(lines) - trim
+        self.trimmed += trim
+        return lines, trim
+
+    def clear(self):
+        """Verwirft Ausstehendes und setzt die Zähler zurück (Anzeige geleert)."""
+        with self._lock:
+            self._pending.clear()
+            self.received = self.dropped = self.trimmed = self._shown = 0
+
+    @property
+    def pending(self) -> int:
+        """Anzahl noch nicht abgeholter Zeilen."""
+        return len(self._pending)
+
+    def status(self) -> str:
+        """Kurzer Text für die Statuszeile der Anzeige."""
+        text = f"{self._shown} Zeilen"
+        if self.dropped or self.trimmed:
+            text += f" | {self.dropped} verworfen, {self.trimmed} entfernt"
+        return text
+
+
+class AdaptiveInterval:
+    """
+    Abfragetakt (in ms) abhängig von der Last.
+
+    Ohne neue Zeilen wird der Takt schrittweise bis max_ms verlängert. Mit
+    Ausgabe wird er auf min_ms verkürzt, aber mindestens auf das `factor`-
+    fache der letzten Zeichenzeit gesetzt – so bleibt der Tk-Schleife immer
+    Zeit für Eingaben und Neuzeichnen.
+    """
+
+    def __init__(self, min_ms: int = 30, max_ms: int = 250, factor: float = 4.0):
+        self.min_ms = min_ms
+        self.max_ms = max_ms
+        self.factor = factor
+        self.current = max_ms
+
+    def next(self, lines: int, render_seconds: float) -> int:
+        """Nächster Takt nach einem Durchlauf mit `lines` Zeilen und der gemessenen Zeichenzeit."""
+        if lines:
+            self.current = max(self.min_ms, int(render_seconds * 1000 * self.factor))
+        else:
+            self.current = int(self.current * 1.5) + 1
+        self.current = min(self.current, self.max_ms)
+        return self.current
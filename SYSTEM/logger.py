@@ -1,8 +1,30 @@
 # SYSTEM/logger.py
-"""Einfacher Logger für Konsolen- und Dateiausgabe."""
+"""Einfacher Logger für Konsolen- und Dateiausgabe.
 
+Dateiausgaben werden standardmäßig gepuffert: alle Logger, die in dieselbe
+Datei schreiben, teilen sich einen offenen Dateihandle, und ein
+Hintergrund-Thread schreibt die Zeilen blockweise (bei genug Zeilen, nach
+flush_interval Sekunden oder sofort bei ERROR/CRITICAL). Beim Beenden des
+Interpreters wird alles Ausstehende geschrieben.
+
+Läuft ein Log-Collector (siehe log_collector.py), schickt der Schreiber die
+Zeilen über eine lokale TCP-Verbindung an ihn, statt selbst in die Datei zu
+schreiben – so gibt es pro Logdatei nur einen schreibenden Prozess. Ist kein
+Collector erreichbar, wird direkt in die Datei geschrieben.
+
+Meldungen werden erst formatiert, wenn sie das Level-Filter passieren:
+    log.debug("%d Zeilen gelesen", n)            # %-Format mit Argumenten
+    log.debug(lambda: teure_zusammenfassung())   # Callable
+Zusätzliche Schlüsselwort-Argumente landen als Felder im optionalen
+NDJSON-Log (json_file), z.B. log.info("Import fertig", file=name, rows=n).
+"""
+
+import atexit
+import json
+import os
 import sys
-from datetime import datetime
+import threading
+import time
 from pathlib import Path
 from typing import Optional, TextIO
 
@@ -15,33 +37,355 @@ LEVELS = {
     "CRITICAL": 50,
 }
 
+# Standardwerte für die gepufferte Dateiausgabe
+DEFAULT_BATCH_SIZE = 256        # Zeilen, ab denen sofort geschrieben wird
+DEFAULT_FLUSH_INTERVAL = 0.5    # Sekunden, nach denen spätestens geschrieben wird
+
+# Log-Collector: Adresse per Umgebungsvariable TOOLBOX_LOG_COLLECTOR="host:port"
+DEFAULT_COLLECTOR_ADDRESS = ("127.0.0.1", 47311)
+_COLLECTOR_RETRY = 5.0          # Sekunden bis zum nächsten Verbindungsversuch
+_COLLECTOR_TIMEOUT = 0.5        # Sekunden für Verbindungsaufbau und Handshake
+_COLLECTOR_SEND_TIMEOUT = 2.0   # Sekunden, die ein Block höchstens an den Collector gesendet wird
+
+_address_cache = (None, None)   # (Wert der Umgebungsvariable, Adresse) – nur einmal auswerten
+_address_warned = set()         # ungültige Werte, zu denen schon gewarnt wurde
+
+def collector_address():
+    """
+    Adresse des Log-Collectors (host, port) – oder None, wenn abgeschaltet ("off").
+
+    Ein ungültiger Wert (z.B. "localhost" ohne Port) gilt wie "off"; dazu gibt
+    es einmal eine Warnung auf stderr.
+    """
+    global _address_cache
+    value = os.environ.get("TOOLBOX_LOG_COLLECTOR", "").strip()
+    cached = _address_cache
+    if cached[0] == value:
+        return cached[1]
+    if not value:
+        address = DEFAULT_COLLECTOR_ADDRESS
+    elif value.lower() == "off":
+        address = None
+    else:
+        host, _, port = value.rpartition(":")
+        if port.isdigit() and 0 < int(port) < 65536:
+            address = (host or DEFAULT_COLLECTOR_ADDRESS[0], int(port))
+        else:
+            address = None
+            if value not in _address_warned:
+                _address_warned.add(value)
+                print(f"WARNUNG: TOOLBOX_LOG_COLLECTOR={value!r} ist keine Adresse host:port – "
+                      f"Log-Collector abgeschaltet.", file=sys.stderr)
+    _address_cache = (value, address)
+    return address
+
+# ----------------------------------------------------------------------
+# Zeitstempel – strftime nur einmal pro Sekunde
+# ----------------------------------------------------------------------
+_ts_cache = (-1, "")
+
+def _timestamp(second: int) -> str:
+    global _ts_cache
+    cached = _ts_cache
+    if cached[0] != second:
+        cached = _ts_cache = (second, time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(second)))
+    return cached[1]
+
+# ----------------------------------------------------------------------
+# Gepufferter Datei-Schreiber (einer pro Logdatei und Prozess)
+# ----------------------------------------------------------------------
+class _LogWriter:
+    """Hält eine Logdatei offen und schreibt gepufferte Zeilen im Hintergrund."""
+
+    def __init__(self, path: Path, batch_size: int, flush_interval: float, use_collector: bool = True,
+                 max_bytes: int = 0, backups: int = 5):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.use_collector = use_collector
+        self.max_bytes = max_bytes             # > 0: Rotation über log_query.rotate
+        self.backups = backups
+        self._init_state()
+
+    def _init_state(self):
+        self._pending = []                     # noch nicht geschriebene Zeilen
+        self._urgent = False                   # ERROR/CRITICAL -> sofort schreiben
+        self._closed = False
+        self._cond = threading.Condition()     # schützt _pending/_urgent/_closed
+        self._io_lock = threading.Lock()       # Reihenfolge beim Schreiben
+        self._handle = None
+        self._thread = None
+        self._sock = None                      # Verbindung zum Log-Collector
+        self._next_connect = 0.0               # frühester nächster Verbindungsversuch
+
+    def write(self, line: str, urgent: bool = False):
+        """Reiht eine fertige Zeile ein (blockiert nicht auf Datei-I/O)."""
+        with self._cond:
+            if self._closed:
+                self._write_lines([line])      # nach close(): direkt schreiben
+                return
+            self._pending.append(line)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=f"LogWriter({self.path.name})", daemon=True)
+                self._thread.start()
+            if urgent:
+                self._urgent = True
+            if urgent or len(self._pending) >= self.batch_size:
+                self._cond.notify()
+
+    def flush(self):
+        """Schreibt alle ausstehenden Zeilen sofort (im aufrufenden Thread)."""
+        with self._io_lock:
+            with self._cond:
+                lines, self._pending = self._pending, []
+                self._urgent = False
+            self._write_lines(lines)
+
+    def close(self):
+        """Schreibt Ausstehendes, beendet den Thread und schließt die Datei."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+            thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=5)
+        self.flush()
+        with self._io_lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+            if self._sock is not None:
+                self._sock.close()
+                self._sock = None
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: self._closed or self._urgent or len(self._pending) >= self.batch_size,
+                    timeout=self.flush_interval,
+                )
+                closed = self._closed
+            self.flush()
+            if closed:
+                return
+
+    def _write_lines(self, lines):
+        if not lines:
+            return
+        text = self._send_to_collector("".join(lines))
+        if not text:
+            return
+        try:
+            if self._handle is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)  # erst beim ersten Schreiben
+                self._handle = open(self.path, "a", encoding="utf-8")
+            self._handle.write(text)
+            self._handle.flush()
+            if self.max_bytes and self._handle.tell() >= self.max_bytes:
+                self._rotate()
+        except Exception:
+            print(f"FEHLER: Konnte nicht in Logdatei schreiben: {self.path}", file=sys.stderr)
+
+    def _rotate(self):
+        """Schließt die Datei und rotiert sie samt Index (siehe log_query)."""
+        from log_query import rotate  # erst bei Bedarf laden
+        self._handle.close()
+        self._handle = None
+        rotate(self.path, self.max_bytes, self.backups)
+
+    def _send_to_collector(self, text: str) -> str:
+        """
+        Schickt die Zeilen an den Collector und liefert den nicht zugestellten Rest
+        ("" = alles angekommen, text = kein Collector erreichbar).
+        """
+        if self._sock is None:
+            self._sock = self._connect()
+            if self._sock is None:
+                return text
+        data = text.encode("utf-8")
+        sent = 0
+        try:
+            view = memoryview(data)
+            while sent < len(data):
+                sent += self._sock.send(view[sent:])
+            return ""
+        except OSError:
+            # Collector weg oder hängt (Timeout) – Verbindung verwerfen; der Rest geht
+            # direkt in die Datei. Vollständig gesendete Zeilen hat der Collector schon,
+            # eine halb gesendete verwirft er – sie wird ab ihrem Anfang neu geschrieben.
+            self._sock.close()
+            self._sock = None
+            self._next_connect = time.monotonic() + _COLLECTOR_RETRY
+            return data[data.rfind(b"\n", 0, sent) + 1:].decode("utf-8")
+
+    def _connect(self):
+        """Baut die Verbindung zum Collector auf (höchstens alle _COLLECTOR_RETRY Sekunden)."""
+        address = collector_address() if self.use_collector else None
+        if address is None or time.monotonic() < self._next_connect:
+            return None
+        import socket  # erst bei Bedarf – die meisten Skripte loggen ohne Collector
+        sock = None
+        try:
+            sock = socket.create_connection(address, timeout=_COLLECTOR_TIMEOUT)
+            sock.sendall(f"HELLO {self.path.resolve()}\n".encode("utf-8"))
+            if sock.recv(3) == b"OK\n":
+                # Nie unbegrenzt blockieren: sonst hinge auch close() beim Beenden
+                sock.settimeout(_COLLECTOR_SEND_TIMEOUT)
+                return sock
+        except OSError:
+            pass
+        if sock is not None:
+            sock.close()
+        self._next_connect = time.monotonic() + _COLLECTOR_RETRY
+        return None
+
+    def _after_fork(self):
+        """Im Kindprozess: Zustand neu aufsetzen (der Elternprozess schreibt seine Zeilen selbst)."""
+        self._init_state()
+
+
+_writers = {}
+_writers_lock = threading.Lock()
+
+def _get_writer(path: Path, batch_size: int, flush_interval: float,
+                use_collector: bool = True, max_bytes: int = 0, backups: int = 5) -> _LogWriter:
+    """
+    Liefert den gemeinsamen Schreiber für eine Logdatei.
+
+    Schreiber mit und ohne Collector werden getrennt geführt – der Collector
+    selbst braucht einen Schreiber, der direkt in die Datei schreibt.
+    Pro Datei gibt es sonst nur einen Schreiber (ein Dateihandle, eine
+    Rotation); weichen die übrigen Einstellungen vom bestehenden Schreiber ab,
+    gelten dessen Einstellungen und es wird eine Warnung ausgegeben.
+    """
+    key = (str(path.resolve()), bool(use_collector))
+    with _writers_lock:
+        writer = _writers.get(key)
+        if writer is None:
+            writer = _writers[key] = _LogWriter(path, batch_size, flush_interval, use_collector,
+                                                max_bytes, backups)
+        elif (writer.batch_size, writer.flush_interval, writer.max_bytes, writer.backups) != \
+                (batch_size, flush_interval, max_bytes, backups):
+            print(f"WARNUNG: Logdatei {path} wird bereits mit anderen Einstellungen geschrieben "
+                  f"(batch_size={writer.batch_size}, flush_interval={writer.flush_interval}, "
+                  f"max_bytes={writer.max_bytes}, backups={writer.backups}) – diese gelten weiter.",
+                  file=sys.stderr)
+        return writer
+
+def flush_all():
+    """Schreibt die Puffer aller Logdateien sofort."""
+    with _writers_lock:
+        writers = list(_writers.values())
+    for writer in writers:
+        writer.flush()
+
+def _shutdown():
+    with _writers_lock:
+        writers = list(_writers.values())
+    for writer in writers:
+        writer.close()
+
+def _after_fork_in_child():
+    global _writers_lock
+    _writers_lock = threading.Lock()
+    for writer in _writers.values():
+        writer._after_fork()
+
+atexit.register(_shutdown)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
 class Logger:
     """Logger mit Ausgabe in Datei und optional auf Konsole."""
 
-    def __init__(self, log_file: Optional[Path] = None, console: bool = True, min_level: str = "INFO"):
+    def __init__(self, log_file: Optional[Path] = None, console: bool = True, min_level: str = "INFO",
+                 buffered: bool = True, batch_size: int = DEFAULT_BATCH_SIZE,
+                 flush_interval: float = DEFAULT_FLUSH_INTERVAL, use_collector: bool = True,
+                 json_file: Optional[Path] = None, max_bytes: int = 0, backups: int = 5):
         """
         Args:
             log_file: Pfad zur Logdatei (wenn None, wird nur auf Konsole geschrieben)
             console: Ausgabe auf Konsole aktivieren?
             min_level: Minimales Level (z.B. "INFO" – DEBUG wird dann ignoriert)
+            buffered: Dateiausgabe über den gemeinsamen Hintergrund-Schreiber
+                (False: Datei bei jeder Meldung öffnen und schließen)
+            batch_size: Zeilen, ab denen der Puffer sofort geschrieben wird
+            flush_interval: Sekunden, nach denen der Puffer spätestens geschrieben wird
+            use_collector: Zeilen an einen laufenden Log-Collector schicken (nur gepuffert)
+            json_file: Optionale NDJSON-Datei mit einem JSON-Objekt pro Meldung
+                (ts, level, msg und alle zusätzlichen Felder)
+            max_bytes: Logdatei rotieren, sobald sie so groß ist (0 = nie, nur gepuffert).
+                Bei mehreren Prozessen sollte nur der Log-Collector rotieren.
+            backups: Anzahl aufbewahrter rotierter Segmente
         """
         self.log_file = Path(log_file) if log_file else None
+        self.json_file = Path(json_file) if json_file else None
         self.console = console
         self.min_level = LEVELS.get(min_level.upper(), 20)
+        self._writer = None
+        self._json_writer = None
+        self._dir_ready = False
 
-        # Falls Logdatei angegeben, Verzeichnis anlegen
+        # Verzeichnisse werden erst beim ersten Schreiben angelegt (Import ohne Nebenwirkungen)
         if self.log_file:
-            self.log_file.parent.mkdir(parents=True, exist_ok=True)
+            if buffered:
+                self._writer = _get_writer(self.log_file, batch_size, flush_interval, use_collector,
+                                           max_bytes, backups)
+        if self.json_file:
+            # Das NDJSON-Log wird immer gepuffert geschrieben
+            self._json_writer = _get_writer(self.json_file, batch_size, flush_interval, use_collector)
+
+    def flush(self):
+        """Schreibt gepufferte Meldungen sofort in die Logdatei(en)."""
+        if self._writer is not None:
+            self._writer.flush()
+        if self._json_writer is not None:
+            self._json_writer.flush()
+
+    @staticmethod
+    def _render(message, args) -> str:
+        """Erzeugt den Meldungstext erst, wenn er wirklich gebraucht wird."""
+        try:
+            if callable(message):
+                message = message()
+            if args:
+                return str(message) % args
+            return str(message)
+        except Exception as e:
+            # Logging darf nie den Aufrufer abbrechen
+            return f"{message} {args!r} (Formatfehler: {e})"
 
-    def _write(self, level: str, message: str):
+    def _write(self, level: str, message, args: tuple = (), fields: Optional[dict] = None):
         """Schreibt eine formatierte Nachricht in Datei und/oder Konsole."""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        now = time.time()
+        timestamp = _timestamp(int(now))
+        message = self._render(message, args)
+        urgent = level in ("ERROR", "CRITICAL")
+
+        # Strukturiertes Log
+        if self._json_writer is not None:
+            record = {"ts": f"{timestamp.replace(' ', 'T')}.{int(now % 1 * 1000):03d}",
+                      "level": level, "msg": message}
+            if fields:
+                record.update(fields)
+            self._json_writer.write(json.dumps(record, ensure_ascii=False, default=str) + "\n", urgent=urgent)
+
+        # Felder im Textlog als key=value anhängen
+        if fields:
+            message += " | " + " ".join(f"{key}={value}" for key, value in fields.items())
         level_padded = level.ljust(8)
         formatted = f"{timestamp} | {level_padded} | {message}"
 
         # In Datei schreiben
-        if self.log_file:
+        if self._writer is not None:
+            self._writer.write(formatted + "\n", urgent=urgent)
+        elif self.log_file:
             try:
+                if not self._dir_ready:
+                    self.log_file.parent.mkdir(parents=True, exist_ok=True)
+                    self._dir_ready = True
                 with open(self.log_file, "a", encoding="utf-8") as f:
                     f.write(formatted + "\n")
             except Exception:
@@ -56,40 +400,45 @@ class Logger:
             else:
                 print(formatted)
 
-    def debug(self, message: str):
+    def is_enabled(self, level: str) -> bool:
+        """True, wenn Meldungen dieses Levels ausgegeben werden."""
+        return self.min_level <= LEVELS.get(level.upper(), 0)
+
+    def debug(self, message, *args, **fields):
         if self.min_level <= LEVELS["DEBUG"]:
-            self._write("DEBUG", message)
+            self._write("DEBUG", message, args, fields)
 
-    def info(self, message: str):
+    def info(self, message, *args, **fields):
         if self.min_level <= LEVELS["INFO"]:
-            self._write("INFO", message)
+            self._write("INFO", message, args, fields)
 
-    def warning(self, message: str):
+    def warning(self, message, *args, **fields):
         if self.min_level <= LEVELS["WARNING"]:
-            self._write("WARNING", message)
+            self._write("WARNING", message, args, fields)
 
-    def error(self, message: str):
+    def error(self, message, *args, **fields):
         if self.min_level <= LEVELS["ERROR"]:
-            self._write("ERROR", message)
+            self._write("ERROR", message, args, fields)
 
-    def critical(self, message: str):
+    def critical(self, message, *args, **fields):
         if self.min_level <= LEVELS["CRITICAL"]:
-            self._write("CRITICAL", message)
+            self._write("CRITICAL", message, args, fields)
 
 
 # Globale Standard-Instanz (für einfachen Import)
 _default_logger = None
 
-def get_logger(log_file: Optional[Path] = None, console: bool = True, min_level: str = "INFO") -> Logger:
+def get_logger(log_file: Optional[Path] = None, console: bool = True, min_level: str = "INFO",
+               json_file: Optional[Path] = None) -> Logger:
     """Erzeugt oder holt eine Logger-Instanz (Singleton für Standard)."""
     global _default_logger
     if _default_logger is None:
-        _default_logger = Logger(log_file, console, min_level)
+        _default_logger = Logger(log_file, console, min_level, json_file=json_file)
     return _default_logger
 
 # Komfort-Funktionen für den Standard-Logger
-def debug(msg): get_logger().debug(msg)
-def info(msg): get_logger().info(msg)
-def warning(msg): get_logger().warning(msg)
-def error(msg): get_logger().error(msg)
-def critical(msg): get_logger().critical(msg)
\ No newline at end of file
+def debug(msg, *args, **fields): get_logger().debug(msg, *args, **fields)
+def info(msg, *args, **fields): get_logger().info(msg, *args, **fields)
+def warning(msg, *args, **fields): get_logger().warning(msg, *args, **fields)
+def error(msg, *args, **fields): get_logger().error(msg, *args, **fields)
+def critical(msg, *args, **fields): get_logger().critical(msg, *args, **fields)
\ No newline at end of file
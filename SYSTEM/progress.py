@@ -0,0 +1,224 @@
+# SYSTEM/progress.py
+"""Gedrosselte, maschinenlesbare Fortschrittsmeldungen von Werkzeugen an das Dashboard.
+
+Ein Werkzeug meldet seinen Fortschritt über einen Progress-Melder. Der Melder
+verschickt höchstens alle `interval` Sekunden einen Datensatz (plus einen
+abschließenden), egal wie oft update() aufgerufen wird – eine Meldung pro
+Zeile wäre viel zu teuer.
+
+Datensatz (dict, als eine JSON-Zeile):
+    {"label": "daten.csv", "unit": "Zeilen", "done": 1200, "total": null,
+     "bytes": 65536, "bytes_total": 1048576, "rate": 5400.0, "eta": 3.1, "final": false}
+
+Kanal (wird beim Anlegen des Melders bestimmt):
+    - set_channel(funktion): z.B. im Pool-Worker über dessen Verbindung
+    - TOOLBOX_PROGRESS_FD=<fd>: JSON-Zeilen auf eine eigene Pipe (job_runner, POSIX).
+      Die Variable wird beim ersten Lesen aus os.environ entfernt, damit
+      Enkelprozesse sie nicht erben; geschrieben wird nur, wenn der Deskriptor
+      wirklich eine Pipe ist.
+    - TOOLBOX_PROGRESS=stdout: Zeilen "@@PROGRESS {...}" auf stdout (Rückfall)
+    - sonst: keine Meldungen (Melder kostet dann praktisch nichts)
+
+Verwendung:
+    progress = Progress(label="daten.csv", unit="Zeilen", bytes_total=size)
+    for i, row in enumerate(rows, 1):
+        ...
+        progress.update(i, bytes_done=f.buffer.tell())
+    progress.finish()
+"""
+
+import json
+import os
+import stat
+import sys
+import time
+from typing import Callable, Optional
+
+PROGRESS_FD_ENV = "TOOLBOX_PROGRESS_FD"
+PROGRESS_ENV = "TOOLBOX_PROGRESS"
+MARKER = "@@PROGRESS "
+DEFAULT_INTERVAL = 0.25
+
+# Vom Prozess gesetzter Kanal (hat Vorrang vor den Umgebungsvariablen)
+_channel = None
+# Aus TOOLBOX_PROGRESS_FD übernommener Deskriptor
+_inherited_fd = None
+
+
+def set_channel(channel: Optional[Callable[[dict], None]]):
+    """Setzt den Kanal für alle danach angelegten Melder und liefert den bisherigen."""
+    global _channel
+    previous, _channel = _channel, channel
+    return previous
+
+
+def _fd_channel(fd: int) -> Callable[[dict], None]:
+    def send(record: dict):
+        os.write(fd, (json.dumps(record) + "\n").encode("utf-8"))
+    return send
+
+
+def _progress_fd() -> Optional[int]:
+    """Deskriptor aus TOOLBOX_PROGRESS_FD (die Variable wird dabei entfernt), nur wenn er eine Pipe ist."""
+    global _inherited_fd
+    value = os.environ.pop(PROGRESS_FD_ENV, None)
+    if value is not None:
+        _inherited_fd = int(value) if value.isdigit() else None
+    if _inherited_fd is None:
+        return None
+    try:
+        if stat.S_ISFIFO(os.fstat(_inherited_fd).st_mode):
+            return _inherited_fd
+    except OSError:
+        pass
+    _inherited_fd = None  # geschlossen oder keine Pipe – nie wieder versuchen
+    return None
+
+
+def _stdout_channel(record: dict):
+    print(MARKER + json.dumps(record), flush=True)
+
+
+def current_channel() -> Optional[Callable[[dict], None]]:
+    """Der Kanal, den ein neuer Melder verwenden würde (None = keine Meldungen)."""
+    if _channel is not None:
+        return _channel
+    fd = _progress_fd()
+    if fd is not None:
+        return _fd_channel(fd)
+    if os.environ.get(PROGRESS_ENV) == "stdout":
+        return _stdout_channel
+    return None
+
+
+def parse_marker(line: str) -> Optional[dict]:
+    """Datensatz aus einer stdout-Zeile "@@PROGRESS {...}" (sonst None)."""
+    if not line.startswith(MARKER):
+        return None
+    try:
+        record = json.loads(line[len(MARKER):])
+    except ValueError:
+        return None
+    return record if isinstance(record, dict) else None
+
+
+class Progress:
+    """
+    Gedrosselter Fortschrittsmelder.
+
+    Args:
+        total: Gesamtzahl der Einheiten, falls bekannt
+        unit: Einheit für die Anzeige (z.B. "Zeilen", "Dateien")
+        label: Worum es geht (z.B. Dateiname)
+        bytes_total: Gesamtgröße in Bytes (für ETA, wenn total unbekannt ist)
+        interval: Mindestabstand zwischen zwei Meldungen in Sekunden
+        channel: Eigener Kanal (Standard: current_channel())
+    """
+
+    def __init__(self, total: Optional[int] = None, unit: str = "", label: str = "",
+                 bytes_total: Optional[int] = None, interval: float = DEFAULT_INTERVAL,
+                 channel: Optional[Callable[[dict], None]] = None):
+        self.total = total
+        self.unit = unit
+        self.label = label
+        self.bytes_total = bytes_total
+        self.interval = interval
+        self.channel = channel or current_channel()
+        self.done = 0
+        self.bytes_done = None
+        self._start = time.monotonic()
+        self._next = self._start            # frühester Zeitpunkt der nächsten Meldung
+
+    @property
+    def enabled(self) -> bool:
+        return self.channel is not None
+
+    def update(self, done: int, bytes_done: Optional[int] = None, force: bool = False):
+        """Setzt den Stand; gemeldet wird nur, wenn das Intervall abgelaufen ist."""
+        self.done = done
+        if bytes_done is not None:
+            self.bytes_done = bytes_done
+        if self.channel is None:
+            return
+        now = time.monotonic()
+        if force or now >= self._next:
+            self._next = now + self.interval
+            self._emit(now, final=False)
+
+    def advance(self, n: int = 1, bytes_done: Optional[int] = None):
+        """Erhöht den Stand um n."""
+        self.update(self.done + n, bytes_done)
+
+    def finish(self, done: Optional[int] = None):
+        """Schickt die abschließende Meldung (immer); done setzt den Endstand."""
+        if done is not None:
+            self.done = done
+        if self.total is not None:
+            self.done = max(self.done, self.total)
+        if self.bytes_total is not None:
+            self.bytes_done = self.bytes_total
+        if self.channel is not None:
+            self._emit(time.monotonic(), final=True)
+
+    def record(self, now: Optional[float] = None, final: bool = False) -> dict:
+        """Der aktuelle Datensatz."""
+        elapsed = max((now or time.monotonic()) - self._start, 1e-9)
+        eta = None
+        if not final:
+            if self.total and self.done:
+                eta = (self.total - self.done) * elapsed / self.done
+            elif self.bytes_total and self.bytes_done:
+                eta = (self.bytes_total - self.bytes_done) * elapsed / self.bytes_done
+        return {"label": self.label, "unit": self.unit, "done": self.done, "total": self.total,
+                "bytes": self.bytes_done, "bytes_total": self.bytes_total,
+                "rate": round(self.done / elapsed, 1), "eta": None if eta is None else round(max(eta, 0.0), 1),
+                "final": final}
+
+    def _emit(self, now: float, final: bool):
+        try:
+            self.channel(self.record(now, final))
+        except (OSError, ValueError):
+            self.channel = None  # Empfänger weg (z.B. Pipe geschlossen) – still weiterarbeiten
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.finish()
+
+
+def fraction(record: dict) -> Optional[float]:
+    """Anteil 0..1 eines Datensatzes (None, wenn unbekannt)."""
+    if record.get("final"):
+        return 1.0
+    if record.get("total"):
+        return min(1.0, record["done"] / record["total"])
+    if record.get("bytes_total") and record.get("bytes") is not None:
+        return min(1.0, record["bytes"] / record["bytes_total"])
+    return None
+
+
+def format_progress(record: Optional[dict], width: int = 10) -> str:
+    """Textbalken für Tabellen, z.B. '█████░░░░░  52% 1200 Zeilen ETA 0:03'."""
+    if not record:
+        return ""
+    share = fraction(record)
+    parts = []
+    if share is not None:
+        filled = int(share * width)
+        parts.append("█" * filled + "░" * (width - filled) + f" {share * 100:3.0f}%")
+    parts.append(f"{record.get('done', 0)} {record.get('unit', '')}".strip())
+    eta = record.get("eta")
+    if eta is not None:
+        parts.append(f"ETA {int(eta) // 60}:{int(eta) % 60:02d}")
+    return " ".join(parts)
+
+
+if __name__ == "__main__":
+    # Kleine Vorführung: python progress.py (mit TOOLBOX_PROGRESS=stdout für Markerzeilen)
+    channel = current_channel() or (lambda record: print(format_progress(record), file=sys.stderr))
+    with Progress(total=50, unit="Schritte", label="Demo", interval=0.2, channel=channel) as demo:
+        for i in range(1, 51):
+            time.sleep(0.02)
+            demo.update(i)
@@ -0,0 +1,397 @@
+# SYSTEM/schema_import.py
+"""Typisierter, spaltenorientierter CSV-Import anhand eines Schemas.
+
+Statt einer Liste von Dicts mit Strings (ein Dict pro Zeile) werden die
+Daten spaltenweise abgelegt:
+    - int/float/bool/date -> array.array (kompakte Maschinenwerte)
+    - category            -> Codes in array.array + Liste der Kategorien
+    - alle übrigen Spalten -> Liste internierter Strings
+
+Schema-Format (Sidecar-Datei <name>.schema.json oder Config-Schlüssel
+"csv_import_schema"):
+    {
+        "primary_key": "id",
+        "columns": {
+            "id": "int",
+            "klasse": "category",
+            "geburtsdatum": "date",
+            "schnitt": "float",
+            "aktiv": "bool"
+        }
+    }
+
+Verwendung:
+    schema = load_schema(csv_path)
+    table = read_columnar(csv_path, schema)
+    table.get(4711)                      # Zeile per Primärschlüssel
+    save_columnar(table, "daten.json")   # oder save_records(...)
+"""
+
+import csv
+import sys
+import time
+from array import array
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Iterator, Optional, Union
+
+from json_helper import load_json, save_json, save_json_stream
+
+# Unterstützte Spaltentypen
+TYPES = ("int", "float", "bool", "date", "category", "str")
+
+# Werte, die als Wahrheitswert erkannt werden (Kleinschreibung)
+_TRUE = {"1", "true", "wahr", "ja", "j", "yes", "y", "x"}
+_FALSE = {"0", "false", "falsch", "nein", "n", "no"}
+
+# Datumsformate: ISO und deutsch
+_DATE_FORMATS = ("%Y-%m-%d", "%d.%m.%Y")
+
+
+# ----------------------------------------------------------------------
+# Schema laden
+# ----------------------------------------------------------------------
+def schema_path_for(csv_path: Union[str, Path]) -> Path:
+    """Pfad der Sidecar-Datei zu einer CSV (daten.csv -> daten.schema.json)."""
+    csv_path = Path(csv_path)
+    return csv_path.with_name(csv_path.stem + ".schema.json")
+
+
+def load_schema(csv_path: Union[str, Path], fallback: Optional[dict] = None) -> Optional[dict]:
+    """
+    Sucht das Schema zu einer CSV-Datei.
+
+    Reihenfolge: Sidecar-Datei neben der CSV, dann fallback (z.B. der
+    Config-Wert "csv_import_schema").
+
+    Returns:
+        Geprüftes Schema oder None, wenn keins vorhanden ist.
+    """
+    schema = load_json(schema_path_for(csv_path), default=None) or fallback
+    return validate_schema(schema) if schema else None
+
+
+def validate_schema(schema: dict) -> dict:
+    """Prüft ein Schema und wirft ValueError bei unbekannten Typen."""
+    columns = schema.get("columns")
+    if not isinstance(columns, dict) or not columns:
+        raise ValueError("Schema braucht ein nicht-leeres Objekt 'columns'")
+    for name, col_type in columns.items():
+        if col_type not in TYPES:
+            raise ValueError(f"Unbekannter Typ '{col_type}' für Spalte '{name}' (erlaubt: {', '.join(TYPES)})")
+    pk = schema.get("primary_key")
+    if pk is not None and pk not in columns:
+        raise ValueError(f"Primärschlüssel '{pk}' fehlt in 'columns'")
+    return schema
+
+
+# ----------------------------------------------------------------------
+# Spalten
+# ----------------------------------------------------------------------
+def _parse_int(text: str) -> int:
+    return int(text)
+
+def _parse_float(text: str) -> float:
+    return float(text.replace(",", "."))  # deutsches Dezimalkomma
+
+def _parse_bool(text: str) -> int:
+    value = text.lower()
+    if value in _TRUE:
+        return 1
+    if value in _FALSE:
+        return 0
+    raise ValueError(f"kein Wahrheitswert: {text!r}")
+
+def _parse_date(text: str) -> int:
+    # Schneller Weg für die beiden üblichen Formate – strptime ist sehr langsam
+    if len(text) == 10:
+        try:
+            if text[4] == "-" and text[7] == "-":
+                return date(int(text[:4]), int(text[5:7]), int(text[8:])).toordinal()
+            if text[2] == "." and text[5] == ".":
+                return date(int(text[6:]), int(text[3:5]), int(text[:2])).toordinal()
+        except ValueError:
+            pass
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).toordinal()
+        except ValueError:
+            pass
+    raise ValueError(f"kein Datum: {text!r}")
+
+
+class Column:
+    """
+    Eine Spalte mit fehlenden Werten (leerer String in der CSV = None).
+
+    Numerische Typen liegen in einem array.array; fehlende Werte werden in
+    einer Bytemaske markiert, die erst beim ersten fehlenden Wert entsteht.
+    """
+
+    # typ -> (typecode, parser, Platzhalter für fehlende Werte)
+    _ARRAY_TYPES = {
+        "int": ("q", _parse_int, 0),
+        "float": ("d", _parse_float, 0.0),
+        "bool": ("b", _parse_bool, 0),
+        "date": ("i", _parse_date, 0),
+        "category": ("i", None, -1),
+    }
+
+    def __init__(self, name: str, col_type: str = "str"):
+        self.name = name
+        self.type = col_type
+        self.nulls = None          # bytearray, 1 = fehlt
+        if col_type == "str":
+            self.values = []
+        else:
+            typecode, self._parse, self._missing = self._ARRAY_TYPES[col_type]
+            self.values = array(typecode)
+        if col_type == "category":
+            self.categories = []   # Code -> Wert
+            self._codes = {}       # Wert -> Code
+
+    def append(self, text: Optional[str]):
+        """Hängt einen Rohwert aus der CSV an."""
+        if self.type == "str":
+            self.values.append(sys.intern(text) if text else text)
+            return
+        if text is None or text == "":
+            if self.nulls is None:
+                self.nulls = bytearray(len(self.values))
+            self.nulls.append(1)
+            self.values.append(self._missing)
+            return
+        if self.type == "category":
+            code = self._codes.get(text)
+            if code is None:
+                code = self._codes[text] = len(self.categories)
+                self.categories.append(text)
+            self.values.append(code)
+        else:
+            self.values.append(self._parse(text))
+        if self.nulls is not None:
+            self.nulls.append(0)
+
+    def __len__(self):
+        return len(self.values)
+
+    def is_null(self, i: int) -> bool:
+        if self.type == "str":
+            return self.values[i] is None
+        return self.nulls is not None and self.nulls[i] == 1
+
+    def __getitem__(self, i: int) -> Any:
+        """Typisierter Wert in Zeile i (None bei fehlendem Wert)."""
+        if self.is_null(i):
+            return None
+        value = self.values[i]
+        if self.type == "bool":
+            return bool(value)
+        if self.type == "date":
+            return date.fromordinal(value)
+        if self.type == "category":
+            return self.categories[value]
+        return value
+
+    def json_value(self, i: int) -> Any:
+        """Wert in Zeile i als JSON-taugliches Objekt (Datum als ISO-String)."""
+        value = self[i]
+        return value.isoformat() if isinstance(value, date) else value
+
+    def to_json(self) -> dict:
+        """Spaltenform für den Export (fehlende Werte: None bzw. Code -1)."""
+        if self.type == "category":
+            return {"type": self.type, "categories": self.categories, "codes": self.values.tolist()}
+        if self.type == "str":
+            return {"type": self.type, "values": self.values}
+        return {"type": self.type, "values": [self.json_value(i) for i in range(len(self))]}
+
+    def nbytes(self) -> int:
+        """Ungefährer Speicherbedarf der Spalte in Bytes."""
+        size = sys.getsizeof(self.values)
+        if self.type == "str":
+            # Internierte Strings nur einmal zählen
+            size += sum(sys.getsizeof(v) for v in set(self.values) if v is not None)
+        if self.type == "category":
+            size += sys.getsizeof(self.categories) + sum(sys.getsizeof(c) for c in self.categories)
+        if self.nulls is not None:
+            size += sys.getsizeof(self.nulls)
+        return size
+
+
+# ----------------------------------------------------------------------
+# Tabelle
+# ----------------------------------------------------------------------
+class ColumnarTable:
+    """
+    Spaltenorientierte Tabelle mit optionalem Primärschlüssel-Index.
+
+    Attribute:
+        schema (dict): Das verwendete Schema.
+        columns (dict): Spaltenname -> Column (in CSV-Reihenfolge).
+        primary_key (str|None): Name der Schlüsselspalte.
+    """
+
+    def __init__(self, fieldnames, schema: dict):
+        self.schema = schema
+        types = schema.get("columns", {})
+        self.columns = {name: Column(name, types.get(name, "str")) for name in fieldnames}
+        missing = [name for name in types if name not in self.columns]
+        if missing:
+            raise ValueError(f"Spalten aus dem Schema fehlen in der CSV: {', '.join(missing)}")
+        self.primary_key = schema.get("primary_key")
+        self._column_list = list(self.columns.values())
+        self._index = {}
+        self._rows = 0
+
+    def append_row(self, row: dict):
+        """Hängt eine Zeile als Dict (wie von csv.DictReader) an."""
+        self.append_values([row.get(name) for name in self.columns])
+
+    def append_values(self, values):
+        """Hängt eine Zeile als Werteliste in Spaltenreihenfolge an."""
+        line = self._rows + 1
+        if len(values) < len(self.columns):
+            values = list(values) + [None] * (len(self.columns) - len(values))
+        for column, value in zip(self._column_list, values):
+            try:
+                column.append(value)
+            except ValueError as e:
+                raise ValueError(f"Zeile {line}, Spalte '{column.name}': {e}") from None
+        if self.primary_key is not None:
+            key = self.columns[self.primary_key][self._rows]
+            if key in self._index:
+                raise ValueError(f"Zeile {line}: doppelter Primärschlüssel {key!r}")
+            self._index[key] = self._rows
+        self._rows += 1
+
+    def __len__(self):
+        return self._rows
+
+    def row(self, i: int) -> dict:
+        """Zeile i als Dict mit typisierten Werten."""
+        return {name: column[i] for name, column in self.columns.items()}
+
+    def get(self, key, default=None) -> Optional[dict]:
+        """Zeile per Primärschlüssel (O(1))."""
+        i = self._index.get(key)
+        return default if i is None else self.row(i)
+
+    def iter_records(self) -> Iterator[dict]:
+        """Zeilen als JSON-taugliche Dicts (klassisches Format)."""
+        columns = list(self.columns.values())
+        for i in range(self._rows):
+            yield {c.name: c.json_value(i) for c in columns}
+
+    def to_columnar(self) -> dict:
+        """Spaltenform als JSON-taugliches Dict."""
+        return {
+            "format": "columnar",
+            "rows": self._rows,
+            "primary_key": self.primary_key,
+            "columns": {name: column.to_json() for name, column in self.columns.items()},
+        }
+
+    def nbytes(self) -> int:
+        """Ungefährer Speicherbedarf aller Spalten in Bytes (ohne Index)."""
+        return sum(column.nbytes() for column in self.columns.values())
+
+
+# ----------------------------------------------------------------------
+# Import / Export
+# ----------------------------------------------------------------------
+def read_columnar(csv_path: Union[str, Path], schema: dict, delimiter: str = ';',
+                  progress=None) -> ColumnarTable:
+    """
+    Liest eine CSV-Datei spaltenweise und typisiert nach Schema.
+
+    progress: Optionaler Melder (siehe progress.Progress) – bekommt alle
+    1024 Zeilen den Stand (Zeilen und gelesene Bytes).
+    """
+    with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f, delimiter=delimiter)
+        table = ColumnarTable(next(reader, []), validate_schema(schema))
+        append = table.append_values
+        if progress is None or not progress.enabled:
+            for values in reader:
+                if values:  # Leerzeilen überspringen wie csv.DictReader
+                    append(values)
+        else:
+            position = f.buffer.tell
+            for values in reader:
+                if values:
+                    append(values)
+                    if not len(table) & 1023:
+                        progress.update(len(table), position())
+    return table
+
+
+def save_columnar(table: ColumnarTable, path: Union[str, Path]) -> bool:
+    """Speichert die Spaltenform als JSON."""
+    return save_json(path, table.to_columnar())
+
+
+def save_records(table: ColumnarTable, path: Union[str, Path], ndjson: bool = False,
+                 chunk_size: int = 1000) -> bool:
+    """Speichert die Tabelle im klassischen Format (Liste von Dicts, typisiert)."""
+    return save_json_stream(path, table.iter_records(), ndjson=ndjson, chunk_size=chunk_size)
+
+
+def iter_columnar_records(data: dict) -> Iterator[dict]:
+    """
+    Zeilen aus der gespeicherten Spaltenform (to_columnar/save_columnar) als Dicts.
+
+    Werte bleiben JSON-Werte (Datum als ISO-String), fehlende Werte sind None.
+    """
+    if not isinstance(data, dict) or data.get("format") != "columnar":
+        raise ValueError("keine Spaltenform (format: columnar)")
+    names, columns = [], []
+    for name, column in data.get("columns", {}).items():
+        names.append(name)
+        if column.get("type") == "category":
+            categories = column["categories"]
+            columns.append([None if code < 0 else categories[code] for code in column["codes"]])
+        else:
+            columns.append(column["values"])
+    for values in zip(*columns):
+        yield dict(zip(names, values))
+
+
+def measure_import(csv_path: Union[str, Path], schema: dict, delimiter: str = ';') -> dict:
+    """
+    Vergleicht Speicher und Laufzeit von list(csv.DictReader) und read_columnar.
+
+    Jeder Import läuft zweimal: einmal ohne Messung für die Laufzeit und
+    einmal mit tracemalloc für den Speicher, der nach dem Einlesen belegt
+    bleibt. Nur für Auswertungen gedacht.
+
+    Returns:
+        dict mit rows, dict_bytes, dict_seconds, columnar_bytes, columnar_seconds
+    """
+    import tracemalloc  # nur für Messungen – nicht beim Import des Moduls laden
+
+    def run(func):
+        start = time.perf_counter()
+        func()
+        seconds = time.perf_counter() - start
+        tracemalloc.start()
+        try:
+            result = func()
+            current = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+        return result, current, seconds
+
+    def as_dicts():
+        with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+            return list(csv.DictReader(f, delimiter=delimiter))
+
+    rows, dict_bytes, dict_seconds = run(as_dicts)
+    table, columnar_bytes, columnar_seconds = run(lambda: read_columnar(csv_path, schema, delimiter))
+    return {
+        "rows": len(rows),
+        "dict_bytes": dict_bytes,
+        "dict_seconds": dict_seconds,
+        "columnar_bytes": columnar_bytes,
+        "columnar_seconds": columnar_seconds,
+    }
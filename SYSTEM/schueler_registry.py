@@ -0,0 +1,411 @@
+# SYSTEM/schueler_registry.py
+"""Indizierter Schülerbestand im Speicher (schueler_master_liste.json).
+
+Die Master-Liste wird einmal geladen und in kompakte Datensätze (Schueler
+mit __slots__) übersetzt. Dazu gibt es Indizes:
+    - Primärschlüssel: id -> Schueler                 (O(1))
+    - klasse, jahrgang, kurs -> Schüler dieser Gruppe  (O(1) + Größe der Gruppe)
+
+Änderungen laufen über die Registry (add, update, remove) und passen nur die
+betroffenen Indexeinträge an – kein Neuaufbau. Datensätze deshalb nicht
+direkt verändern.
+
+Eingabeformat (Liste von Dicts, z.B. aus csv_importer; auch die Spaltenform
+aus schema_import oder {"schueler": [...]}):
+    {"id": 4711, "nachname": "Muster", "vorname": "Max", "klasse": "10b",
+     "jahrgang": 10, "kurse": ["Ma", "Ph", "Ku"]}
+    - jahrgang fehlt -> aus der Klasse ("10b" -> 10)
+    - kurse als Liste, als Text "Ma,Ph,Ku" oder als Spalten wahl1, wahl2, ...
+      (Reihenfolge = Priorität)
+    - alle übrigen Felder bleiben erhalten und werden mitgespeichert
+
+Verwendung:
+    registry = SchuelerRegistry.load()            # FilePaths.SCHUELER_MASTER
+    registry.get(4711)
+    registry.by_klasse("10b")
+    registry.find(jahrgang=11, kurs="Ph")
+    registry.update(4711, klasse="10c")
+    registry.save()
+"""
+
+import gc
+import re
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+from file_manager import FilePaths
+from json_helper import load_json, save_json
+from schema_import import iter_columnar_records
+
+# Felder mit eigenem Slot (in dieser Reihenfolge gespeichert)
+FIELDS = ("id", "nachname", "vorname", "klasse", "jahrgang", "kurse")
+# Felder mit Sekundärindex
+INDEXED = ("klasse", "jahrgang", "kurse")
+
+# Spalten wahl1, wahl2, ... (bzw. wunsch1, ...) ergeben die Kursliste
+_CHOICE_COLUMN = re.compile(r"^(?:wahl|wunsch)_?(\d+)$", re.IGNORECASE)
+_KURS_SEPARATORS = re.compile(r"[,|/]")
+_JAHRGANG = re.compile(r"^\s*(\d+)")
+
+# Spaltenname der Quelle -> ("field", feld) | ("choice", nummer) | ("extra", name);
+# die Zuordnung wird einmal je Spaltenname bestimmt, nicht je Datensatz
+_KEY_KINDS: Dict[Any, tuple] = {}
+# Geteilte Namenstupel für Schueler.extra
+_EXTRA_KEYS: Dict[tuple, tuple] = {}
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _classify(key) -> tuple:
+    name = key.strip().lower() if isinstance(key, str) else key
+    match = _CHOICE_COLUMN.match(name) if isinstance(name, str) else None
+    if name in FIELDS:
+        kind = ("field", name)
+    elif match:
+        kind = ("choice", int(match.group(1)))
+    else:
+        kind = ("extra", key)
+    if len(_KEY_KINDS) < 10000:
+        _KEY_KINDS[key] = kind
+    return kind
+
+
+def parse_kurse(value) -> tuple:
+    """Kursliste aus Liste oder Text ("Ma, Ph|Ku") – leere Einträge fallen weg."""
+    if value is None:
+        return ()
+    if isinstance(value, str):
+        value = _KURS_SEPARATORS.split(value)
+    try:
+        kurse = tuple(map(sys.intern, map(str.strip, value)))  # Normalfall: nur Strings
+    except TypeError:
+        kurse = tuple(_intern(k.strip() if isinstance(k, str) else k) for k in value if k is not None)
+    if "" in kurse:
+        kurse = tuple(k for k in kurse if k != "")
+    return kurse
+
+
+@lru_cache(maxsize=1024)
+def jahrgang_aus_klasse(klasse) -> Optional[int]:
+    """Jahrgang aus der Klassenbezeichnung ("10b" -> 10, "Q1" -> None)."""
+    match = _JAHRGANG.match(str(klasse)) if klasse is not None else None
+    return int(match.group(1)) if match else None
+
+
+class Schueler:
+    """
+    Ein Schüler (kompakt dank __slots__).
+
+    Attribute:
+        id: Primärschlüssel (int oder str, wie in der Quelle)
+        nachname, vorname (str|None)
+        klasse (str|None), jahrgang (int|None)
+        kurse (tuple): Kurswahlen in Prioritätsreihenfolge
+        extra (dict|None): Alle übrigen Felder der Quelle – intern als Tupel
+            der Werte plus ein von allen Datensätzen geteiltes Tupel der Namen
+    """
+
+    __slots__ = FIELDS + ("_extra_keys", "_extra_values")
+
+    def __init__(self, id, nachname=None, vorname=None, klasse=None, jahrgang=None,
+                 kurse=(), extra: Optional[dict] = None):
+        self.id = id
+        self.nachname = _intern(nachname)
+        self.vorname = _intern(vorname)
+        self.klasse = _intern(klasse)
+        self.jahrgang = jahrgang if jahrgang is not None else jahrgang_aus_klasse(klasse)
+        self.kurse = parse_kurse(kurse)
+        self.extra = extra
+
+    @property
+    def extra(self) -> Optional[dict]:
+        if not self._extra_keys:
+            return None
+        return dict(zip(self._extra_keys, self._extra_values))
+
+    @extra.setter
+    def extra(self, extra: Optional[dict]):
+        if extra:
+            keys = tuple(extra)
+            if len(_EXTRA_KEYS) < 10000:
+                keys = _EXTRA_KEYS.setdefault(keys, keys)
+            self._extra_keys = keys
+            self._extra_values = tuple(extra.values())
+        else:
+            self._extra_keys = self._extra_values = ()
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Schueler":
+        """
+        Datensatz aus einem Dict der Quelle.
+
+        Raises:
+            ValueError: Wenn die id fehlt.
+        """
+        values = {}
+        extra = {}
+        choices = None
+        for key, value in data.items():
+            kind, name = _KEY_KINDS.get(key) or _classify(key)
+            if kind == "field":
+                values[name] = value
+            elif kind == "choice":
+                if choices is None:
+                    choices = []
+                choices.append((name, value))
+            else:
+                extra[key] = value
+        if values.get("id") is None or values.get("id") == "":
+            raise ValueError(f"Datensatz ohne id: {data!r}")
+        if choices and not values.get("kurse"):
+            values["kurse"] = [value for _, value in sorted(choices)]
+        jahrgang = values.get("jahrgang")
+        if isinstance(jahrgang, str):
+            jahrgang = int(jahrgang) if jahrgang.strip().isdigit() else None
+        get = values.get
+        return cls(get("id"), get("nachname"), get("vorname"), get("klasse"), jahrgang,
+                   get("kurse", ()), extra)
+
+    def to_dict(self) -> dict:
+        """JSON-taugliches Dict (Felder der Quelle bleiben erhalten)."""
+        data = {"id": self.id, "nachname": self.nachname, "vorname": self.vorname,
+                "klasse": self.klasse, "jahrgang": self.jahrgang, "kurse": list(self.kurse)}
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def __eq__(self, other):
+        if not isinstance(other, Schueler):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in FIELDS) and self.extra == other.extra
+
+    def __repr__(self):
+        return f"Schueler({self.id!r}, {self.nachname!r}, {self.vorname!r}, {self.klasse!r})"
+
+
+class SchuelerRegistry:
+    """
+    Schülerbestand mit Primärschlüssel und Sekundärindizes.
+
+    Die Sekundärindizes bilden Wert -> {id: Schueler} ab (ein Dict als
+    geordnete Menge: Einfügen und Entfernen in O(1), Reihenfolge stabil).
+
+    Attribute:
+        path (Path|None): Datei, aus der geladen wurde (Standard für save()).
+        modified (bool): Ungespeicherte Änderungen vorhanden.
+    """
+
+    def __init__(self, records: Iterable[Union[Schueler, dict]] = (), path: Optional[Path] = None):
+        self.path = Path(path) if path is not None else None
+        self._by_id: Dict[Any, Schueler] = {}
+        self._indexes: Dict[str, Dict[Any, Dict[Any, Schueler]]] = {name: {} for name in INDEXED}
+        # Beim Aufbau entstehen nur neue, langlebige Objekte – die zyklische
+        # Speicherbereinigung fände nichts, kostet bei 100.000 Schülern aber spürbar
+        paused = gc.isenabled()
+        gc.disable()
+        try:
+            for record in records:
+                self.add(record)
+        finally:
+            if paused:
+                gc.enable()
+        self.modified = False
+
+    # ------------------------------------------------------------------
+    # Laden / Speichern
+    # ------------------------------------------------------------------
+    @classmethod
+    def load(cls, path: Union[str, Path, None] = None) -> "SchuelerRegistry":
+        """
+        Lädt die Master-Liste (fehlende Datei = leerer Bestand).
+
+        Raises:
+            ValueError: Unlesbare Datei, unbekanntes Format oder doppelte id.
+        """
+        path = Path(path) if path is not None else FilePaths.SCHUELER_MASTER
+        if not path.exists():
+            return cls(path=path)
+        data = load_json(path)
+        if data is None:
+            raise ValueError(f"Schülerliste nicht lesbar: {path}")
+        return cls(_records_from(data), path=path)
+
+    def save(self, path: Union[str, Path, None] = None, compact: bool = False) -> bool:
+        """Speichert alle Datensätze über json_helper (atomar). True bei Erfolg."""
+        path = Path(path) if path is not None else (self.path or FilePaths.SCHUELER_MASTER)
+        ok = save_json(path, [record.to_dict() for record in self._by_id.values()], compact=compact)
+        if ok and (self.path is None or path == self.path):
+            self.path = path
+            self.modified = False
+        return ok
+
+    # ------------------------------------------------------------------
+    # Änderungen (Indizes werden schrittweise nachgeführt)
+    # ------------------------------------------------------------------
+    def add(self, record: Union[Schueler, dict]) -> Schueler:
+        """
+        Nimmt einen Schüler auf.
+
+        Raises:
+            ValueError: Wenn die id schon vergeben ist.
+        """
+        if isinstance(record, dict):
+            record = Schueler.from_dict(record)
+        if record.id in self._by_id:
+            raise ValueError(f"doppelte Schüler-id {record.id!r}")
+        self._by_id[record.id] = record
+        self._index(record)
+        self.modified = True
+        return record
+
+    def update(self, schueler_id, **changes) -> Schueler:
+        """
+        Ändert Felder eines Schülers; nur geänderte Indizes werden angepasst.
+
+        Unbekannte Feldnamen landen in extra. Eine neue klasse ohne jahrgang
+        setzt den Jahrgang neu aus der Klasse.
+
+        Raises:
+            KeyError: Unbekannte id.
+            ValueError: Neue id schon vergeben.
+        """
+        record = self._by_id[schueler_id]
+        if "klasse" in changes and "jahrgang" not in changes:
+            changes["jahrgang"] = jahrgang_aus_klasse(changes["klasse"])
+        if "kurse" in changes:
+            changes["kurse"] = parse_kurse(changes["kurse"])
+        new_id = changes.pop("id", schueler_id)
+        if new_id != schueler_id and new_id in self._by_id:
+            raise ValueError(f"doppelte Schüler-id {new_id!r}")
+
+        touched = [name for name in INDEXED if name in changes and changes[name] != getattr(record, name)]
+        if touched or new_id != schueler_id:
+            self._unindex(record, INDEXED if new_id != schueler_id else touched)
+        for name, value in changes.items():
+            if name in FIELDS:
+                setattr(record, name, _intern(value))
+            else:
+                record.extra = dict(record.extra or {}, **{name: value})
+        if new_id != schueler_id:
+            del self._by_id[schueler_id]
+            record.id = new_id
+            self._by_id[new_id] = record
+            self._index(record, INDEXED)
+        elif touched:
+            self._index(record, touched)
+        self.modified = True
+        return record
+
+    def remove(self, schueler_id) -> Schueler:
+        """Entfernt einen Schüler (KeyError bei unbekannter id)."""
+        record = self._by_id.pop(schueler_id)
+        self._unindex(record)
+        self.modified = True
+        return record
+
+    def _keys(self, record: Schueler, name: str) -> Iterable:
+        value = getattr(record, name)
+        if name == "kurse":
+            return dict.fromkeys(value)  # doppelte Wahl nur einmal
+        return () if value is None else (value,)
+
+    def _index(self, record: Schueler, names: Iterable[str] = INDEXED):
+        for name in names:
+            index = self._indexes[name]
+            for key in self._keys(record, name):
+                group = index.get(key)
+                if group is None:
+                    group = index[key] = {}
+                group[record.id] = record
+
+    def _unindex(self, record: Schueler, names: Iterable[str] = INDEXED):
+        for name in names:
+            index = self._indexes[name]
+            for key in self._keys(record, name):
+                group = index.get(key)
+                if group is not None:
+                    group.pop(record.id, None)
+                    if not group:
+                        del index[key]
+
+    # ------------------------------------------------------------------
+    # Abfragen
+    # ------------------------------------------------------------------
+    def __len__(self):
+        return len(self._by_id)
+
+    def __iter__(self) -> Iterator[Schueler]:
+        return iter(self._by_id.values())
+
+    def __contains__(self, schueler_id) -> bool:
+        return schueler_id in self._by_id
+
+    def get(self, schueler_id, default=None) -> Optional[Schueler]:
+        """Schüler per id (O(1))."""
+        return self._by_id.get(schueler_id, default)
+
+    def by_klasse(self, klasse: str) -> List[Schueler]:
+        return list(self._indexes["klasse"].get(klasse, {}).values())
+
+    def by_jahrgang(self, jahrgang: int) -> List[Schueler]:
+        return list(self._indexes["jahrgang"].get(jahrgang, {}).values())
+
+    def by_kurs(self, kurs: str) -> List[Schueler]:
+        """Alle Schüler, die den Kurs gewählt haben (egal mit welcher Priorität)."""
+        return list(self._indexes["kurse"].get(kurs, {}).values())
+
+    def find(self, klasse: Optional[str] = None, jahrgang: Optional[int] = None,
+             kurs: Optional[str] = None) -> List[Schueler]:
+        """
+        Schüler, die alle angegebenen Bedingungen erfüllen.
+
+        Geht die kleinste passende Gruppe durch und prüft die übrigen
+        Bedingungen per Index (O(Größe der kleinsten Gruppe)).
+        """
+        groups = []
+        for name, key in (("klasse", klasse), ("jahrgang", jahrgang), ("kurse", kurs)):
+            if key is not None:
+                groups.append(self._indexes[name].get(key, {}))
+        if not groups:
+            return list(self._by_id.values())
+        groups.sort(key=len)
+        smallest = groups[0]
+        ids = iter(smallest)
+        for group in groups[1:]:
+            ids = filter(group.__contains__, ids)  # Schleifen bleiben in C
+        return list(map(smallest.__getitem__, ids))
+
+    def klassen(self) -> List[str]:
+        return sorted(self._indexes["klasse"], key=str)
+
+    def jahrgaenge(self) -> List[int]:
+        return sorted(self._indexes["jahrgang"])
+
+    def kurse(self) -> List[str]:
+        return sorted(self._indexes["kurse"], key=str)
+
+    def count_by(self, field: str) -> Dict[Any, int]:
+        """Gruppengrößen eines indizierten Felds ("klasse", "jahrgang" oder "kurse")."""
+        return {key: len(group) for key, group in self._indexes[field].items()}
+
+
+def _records_from(data) -> Iterator[dict]:
+    """Datensätze aus den unterstützten JSON-Formen."""
+    if isinstance(data, dict):
+        if data.get("format") == "columnar":
+            return iter_columnar_records(data)
+        data = data.get("schueler")
+    if not isinstance(data, list):
+        raise ValueError("Schülerliste: erwartet wird eine Liste von Datensätzen")
+    return iter(data)
+
+
+if __name__ == "__main__":
+    registry = SchuelerRegistry.load()
+    print(f"{len(registry)} Schüler aus {registry.path}")
+    for klasse, count in sorted(registry.count_by("klasse").items(), key=lambda item: str(item[0])):
+        print(f"  {klasse}: {count}")
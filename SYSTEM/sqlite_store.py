@@ -0,0 +1,436 @@
+# SYSTEM/sqlite_store.py
+"""Optionaler Datenspeicher auf SQLite (stdlib sqlite3) neben den JSON-Dateien.
+
+Für große Datenmengen (Hunderttausende Schüler/Wahlen) ist "ganze Datei
+parsen, ganze Datei schreiben" zu teuer. Der Speicher legt je Tabelle ab:
+    - optional eine Schlüsselspalte (PRIMARY KEY)   -> get/upsert/delete in O(log n)
+    - Indexspalten (konfigurierbar)                 -> gefilterte Abfragen über den Index
+    - den vollständigen Datensatz als JSON-Text     -> beliebige Felder bleiben erhalten
+Filter auf Felder ohne Index funktionieren ebenfalls (json_extract), lesen
+aber die ganze Tabelle.
+
+Massenimporte laufen in einer Transaktion; Indizes werden erst danach
+angelegt (schneller als Index pflegen je Zeile). Export und Import der
+bisherigen JSON-Dateien (Array, NDJSON, Spaltenform) halten die übrigen
+Werkzeuge lauffähig.
+
+Journal-Modus: Standard ist DELETE (funktioniert auch auf Netzlaufwerken).
+WAL ist schneller bei vielen kleinen Schreibvorgängen und parallelen Lesern,
+braucht aber ein lokales Dateisystem – per journal_mode="WAL" bzw. über den
+Config-Schlüssel "sqlite_journal_mode" (CLI, csv_importer) einschalten.
+
+Verwendung:
+    with SqliteStore() as store:                      # DATEN/toolbox.sqlite3
+        store.import_json("schueler", FilePaths.SCHUELER_MASTER, key="id",
+                          indexes=["klasse", "jahrgang"])
+        store.get("schueler", "4711")
+        store.query("schueler", klasse="10b", jahrgang=[10, 11])
+        store.upsert("schueler", {"id": "4711", "klasse": "10c", ...})
+        store.export_json("schueler", "schueler.json")
+
+CLI:
+    python sqlite_store.py import TABELLE DATEI [--key id] [--index klasse ...]
+    python sqlite_store.py export TABELLE DATEI [--ndjson]
+    python sqlite_store.py tables
+"""
+
+import json
+import sqlite3
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from file_manager import FilePaths
+from json_helper import save_json_stream
+from logger import Logger
+
+log = Logger()
+
+# Verwaltungstabelle: Schlüssel- und Indexspalten je Tabelle
+META_TABLE = "_toolbox_tables"
+DATA_COLUMN = "_data"
+
+JOURNAL_MODES = ("DELETE", "TRUNCATE", "WAL")
+DEFAULT_JOURNAL_MODE = "DELETE"
+
+_dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=str).encode
+
+
+def _quote(name: str) -> str:
+    """Name als SQL-Bezeichner (Tabellen- und Spaltennamen aus den Daten)."""
+    if not isinstance(name, str) or not name or '"' in name or "\x00" in name:
+        raise ValueError(f"Ungültiger Name: {name!r}")
+    return f'"{name}"'
+
+
+def _column_value(value: Any) -> Any:
+    """Wert für eine Schlüssel-/Indexspalte (Listen und Dicts als JSON-Text)."""
+    if isinstance(value, (list, tuple, dict)):
+        return _dumps(value)
+    return value
+
+
+class SqliteStore:
+    """
+    Tabellen mit JSON-Datensätzen in einer SQLite-Datei.
+
+    Args:
+        path: Datenbankdatei (Standard DATEN/toolbox.sqlite3, ":memory:" möglich)
+        journal_mode: DELETE (Standard), TRUNCATE oder WAL (nur lokale Dateisysteme)
+
+    Raises:
+        ValueError: Datei ist keine SQLite-Datenbank oder unbekannter Journal-Modus.
+    """
+
+    def __init__(self, path: Union[str, Path, None] = None, journal_mode: Optional[str] = None):
+        journal_mode = (journal_mode or DEFAULT_JOURNAL_MODE).upper()
+        if journal_mode not in JOURNAL_MODES:
+            raise ValueError(f"Unbekannter Journal-Modus: {journal_mode} (erlaubt: {', '.join(JOURNAL_MODES)})")
+        if path is None:
+            path = FilePaths.DATABASE
+        self.path = path if str(path) == ":memory:" else Path(path)
+        if isinstance(self.path, Path):
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        # isolation_level=None: Transaktionen steuern wir selbst (transaction())
+        self.conn = sqlite3.connect(str(self.path), isolation_level=None)
+        self._depth = 0
+        self._tables: Dict[str, Tuple[Optional[str], Tuple[str, ...]]] = {}
+        try:
+            self.conn.execute(f"PRAGMA journal_mode={journal_mode}")
+            if journal_mode == "WAL":
+                # Im WAL-Modus genügt NORMAL für konsistente Daten (nur beim Commit kein fsync)
+                self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.execute(f"CREATE TABLE IF NOT EXISTS {META_TABLE} "
+                              f"(name TEXT PRIMARY KEY, key TEXT, indexes TEXT NOT NULL)")
+            for name, key, indexes in self.conn.execute(f"SELECT name, key, indexes FROM {META_TABLE}"):
+                self._tables[name] = (key, tuple(json.loads(indexes)))
+        except sqlite3.DatabaseError as e:
+            self.conn.close()
+            raise ValueError(f"Keine gültige SQLite-Datenbank: {self.path} ({e})") from None
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    @contextmanager
+    def transaction(self):
+        """Fasst alle Änderungen im Block zu einer Transaktion zusammen (verschachtelbar)."""
+        if self._depth:
+            self._depth += 1
+            try:
+                yield self
+            finally:
+                self._depth -= 1
+            return
+        self.conn.execute("BEGIN")
+        self._depth = 1
+        try:
+            yield self
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        else:
+            self.conn.execute("COMMIT")
+        finally:
+            self._depth = 0
+
+    # ------------------------------------------------------------------
+    # Tabellen
+    # ------------------------------------------------------------------
+    def tables(self) -> Dict[str, dict]:
+        """Tabellenname -> {"key": ..., "indexes": [...]}."""
+        return {name: {"key": key, "indexes": list(indexes)} for name, (key, indexes) in sorted(self._tables.items())}
+
+    def _spec(self, table: str) -> Tuple[Optional[str], Tuple[str, ...]]:
+        try:
+            return self._tables[table]
+        except KeyError:
+            raise KeyError(f"Unbekannte Tabelle: {table}") from None
+
+    def create_table(self, table: str, key: Optional[str] = None, indexes: Sequence[str] = ()):
+        """
+        Legt eine Tabelle an (oder ergänzt bei einer vorhandenen die Indizes).
+
+        Raises:
+            ValueError: Ungültiger Name oder vorhandene Tabelle mit anderem Schlüssel.
+        """
+        indexes = tuple(dict.fromkeys(name for name in indexes if name != key))
+        if table in self._tables:
+            if self._tables[table][0] != key:
+                raise ValueError(f"Tabelle {table} hat den Schlüssel {self._tables[table][0]!r}, nicht {key!r}")
+            for column in indexes:
+                self.add_index(table, column)
+            return
+        columns = [f"{_quote(key)} PRIMARY KEY NOT NULL"] if key else []
+        columns += [_quote(column) for column in indexes]
+        columns.append(f"{DATA_COLUMN} TEXT NOT NULL")
+        with self.transaction():
+            self.conn.execute(f"CREATE TABLE {_quote(table)} ({', '.join(columns)})")
+            for column in indexes:
+                self._create_index(table, column)
+            self._register(table, key, indexes)
+
+    def drop_table(self, table: str):
+        with self.transaction():
+            self.conn.execute(f"DROP TABLE IF EXISTS {_quote(table)}")
+            self.conn.execute(f"DELETE FROM {META_TABLE} WHERE name = ?", (table,))
+        self._tables.pop(table, None)
+
+    def add_index(self, table: str, column: str):
+        """Neue Indexspalte für eine vorhandene Tabelle (Werte aus den gespeicherten Datensätzen)."""
+        key, indexes = self._spec(table)
+        if column == key or column in indexes:
+            return
+        with self.transaction():
+            self.conn.execute(f"ALTER TABLE {_quote(table)} ADD COLUMN {_quote(column)}")
+            self.conn.execute(f"UPDATE {_quote(table)} SET {_quote(column)} = {self._json_path(column)}")
+            self._create_index(table, column)
+            self._register(table, key, indexes + (column,))
+
+    def _create_index(self, table: str, column: str):
+        self.conn.execute(f"CREATE INDEX IF NOT EXISTS {_quote(f'ix_{table}_{column}')} "
+                          f"ON {_quote(table)} ({_quote(column)})")
+
+    def _register(self, table: str, key: Optional[str], indexes: Tuple[str, ...]):
+        self.conn.execute(f"INSERT OR REPLACE INTO {META_TABLE} (name, key, indexes) VALUES (?, ?, ?)",
+                          (table, key, json.dumps(list(indexes))))
+        self._tables[table] = (key, indexes)
+
+    @staticmethod
+    def _json_path(column: str) -> str:
+        _quote(column)  # prüft den Namen
+        return f"json_extract({DATA_COLUMN}, '$.\"{column.replace(chr(39), chr(39) * 2)}\"')"
+
+    # ------------------------------------------------------------------
+    # Schreiben
+    # ------------------------------------------------------------------
+    def _rows(self, table: str, records: Iterable[dict]) -> Iterator[tuple]:
+        key, indexes = self._spec(table)
+        for record in records:
+            if key is not None:
+                value = record.get(key)
+                if value is None or value == "":
+                    raise ValueError(f"Datensatz ohne Schlüssel {key!r}: {record!r}")
+                yield (_column_value(value), *(_column_value(record.get(c)) for c in indexes), _dumps(record))
+            else:
+                yield (*(_column_value(record.get(c)) for c in indexes), _dumps(record))
+
+    def _insert_sql(self, table: str, conflict: str = "") -> str:
+        key, indexes = self._spec(table)
+        columns = ([key] if key else []) + list(indexes) + [DATA_COLUMN]
+        sql = (f"INSERT INTO {_quote(table)} ({', '.join(map(_quote, columns))}) "
+               f"VALUES ({', '.join('?' * len(columns))})")
+        if conflict and key:
+            updates = ", ".join(f"{_quote(c)} = excluded.{_quote(c)}" for c in columns[1:])
+            sql += f" ON CONFLICT ({_quote(key)}) DO UPDATE SET {updates}"
+        return sql
+
+    def insert_many(self, table: str, records: Iterable[dict]) -> int:
+        """
+        Fügt Datensätze in einer Transaktion ein (records darf ein Generator sein).
+
+        Raises:
+            ValueError: Datensatz ohne Schlüssel.
+            sqlite3.IntegrityError: Schlüssel schon vorhanden.
+        """
+        with self.transaction():
+            before = self.conn.total_changes
+            self.conn.executemany(self._insert_sql(table), self._rows(table, records))
+            return self.conn.total_changes - before
+
+    def upsert_many(self, table: str, records: Iterable[dict]) -> int:
+        """Fügt ein oder ersetzt (gleicher Schlüssel) – in einer Transaktion."""
+        if self._spec(table)[0] is None:
+            raise ValueError(f"Tabelle {table} hat keinen Schlüssel – upsert nicht möglich")
+        with self.transaction():
+            before = self.conn.total_changes
+            self.conn.executemany(self._insert_sql(table, "upsert"), self._rows(table, records))
+            return self.conn.total_changes - before
+
+    def upsert(self, table: str, record: dict):
+        """Fügt einen Datensatz ein oder ersetzt den mit gleichem Schlüssel."""
+        self.upsert_many(table, (record,))
+
+    def update(self, table: str, key_value: Any, **changes) -> bool:
+        """Ändert einzelne Felder eines Datensatzes. False, wenn der Schlüssel fehlt."""
+        with self.transaction():
+            record = self.get(table, key_value)
+            if record is None:
+                return False
+            record.update(changes)
+            self.upsert(table, record)
+        return True
+
+    def delete(self, table: str, key_value: Any) -> bool:
+        """Löscht einen Datensatz. False, wenn der Schlüssel fehlt."""
+        key = self._key(table)
+        cursor = self.conn.execute(f"DELETE FROM {_quote(table)} WHERE {_quote(key)} = ?",
+                                   (_column_value(key_value),))
+        return cursor.rowcount > 0
+
+    def bulk_load(self, table: str, records: Iterable[dict], key: Optional[str] = None,
+                  indexes: Sequence[str] = ()) -> int:
+        """
+        Ersetzt eine Tabelle durch records (Massenimport).
+
+        Alles läuft in einer Transaktion – bei einem Fehler bleibt die alte
+        Tabelle erhalten. Indizes werden nach dem Einfügen angelegt.
+
+        Returns:
+            Anzahl eingefügter Datensätze.
+        """
+        indexes = tuple(dict.fromkeys(name for name in indexes if name != key))
+        previous = self._tables.get(table)
+        try:
+            with self.transaction():
+                self.drop_table(table)
+                self.create_table(table, key)
+                # Indexspalten schon anlegen, Indizes selbst erst nach dem Einfügen
+                for column in indexes:
+                    self.conn.execute(f"ALTER TABLE {_quote(table)} ADD COLUMN {_quote(column)}")
+                self._register(table, key, indexes)
+                count = self.insert_many(table, records)
+                for column in indexes:
+                    self._create_index(table, column)
+        except BaseException:
+            if previous is None:
+                self._tables.pop(table, None)
+            else:
+                self._tables[table] = previous
+            raise
+        self.conn.execute("PRAGMA optimize")
+        return count
+
+    # ------------------------------------------------------------------
+    # Lesen
+    # ------------------------------------------------------------------
+    def _key(self, table: str) -> str:
+        key = self._spec(table)[0]
+        if key is None:
+            raise ValueError(f"Tabelle {table} hat keinen Schlüssel")
+        return key
+
+    def get(self, table: str, key_value: Any, default=None) -> Optional[dict]:
+        """Datensatz zum Schlüssel (Punktabfrage über den PRIMARY KEY)."""
+        key = self._key(table)
+        row = self.conn.execute(f"SELECT {DATA_COLUMN} FROM {_quote(table)} WHERE {_quote(key)} = ?",
+                                (_column_value(key_value),)).fetchone()
+        return default if row is None else json.loads(row[0])
+
+    def _where(self, table: str, filters: Dict[str, Any]) -> Tuple[str, list]:
+        key, indexes = self._spec(table)
+        clauses, params = [], []
+        for name, value in filters.items():
+            column = _quote(name) if name == key or name in indexes else self._json_path(name)
+            if value is None:
+                clauses.append(f"{column} IS NULL")
+            elif isinstance(value, (list, tuple, set, frozenset)):
+                values = [_column_value(v) for v in value]
+                clauses.append(f"{column} IN ({', '.join('?' * len(values))})" if values else "0")
+                params.extend(values)
+            else:
+                clauses.append(f"{column} = ?")
+                params.append(_column_value(value))
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def iter_query(self, table: str, order_by: Optional[str] = None, limit: Optional[int] = None,
+                   **filters) -> Iterator[dict]:
+        """
+        Datensätze, deren Felder den Filtern entsprechen (Liste = einer der Werte,
+        None = fehlt). Ohne order_by in Einfügereihenfolge.
+        """
+        key, indexes = self._spec(table)
+        where, params = self._where(table, filters)
+        if order_by is None:
+            order = "rowid"
+        else:
+            order = _quote(order_by) if order_by == key or order_by in indexes else self._json_path(order_by)
+        sql = f"SELECT {DATA_COLUMN} FROM {_quote(table)}{where} ORDER BY {order}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        loads = json.loads
+        for (data,) in self.conn.execute(sql, params):
+            yield loads(data)
+
+    def query(self, table: str, order_by: Optional[str] = None, limit: Optional[int] = None,
+              **filters) -> List[dict]:
+        return list(self.iter_query(table, order_by, limit, **filters))
+
+    def count(self, table: str, **filters) -> int:
+        where, params = self._where(table, filters)
+        return self.conn.execute(f"SELECT COUNT(*) FROM {_quote(table)}{where}", params).fetchone()[0]
+
+    def explain(self, table: str, **filters) -> str:
+        """Abfrageplan von SQLite (zeigt, ob ein Index benutzt wird)."""
+        where, params = self._where(table, filters)
+        rows = self.conn.execute(f"EXPLAIN QUERY PLAN SELECT {DATA_COLUMN} FROM {_quote(table)}{where}", params)
+        return "\n".join(row[-1] for row in rows)
+
+    # ------------------------------------------------------------------
+    # JSON-Dateien
+    # ------------------------------------------------------------------
+    def export_json(self, table: str, path: Union[str, Path], ndjson: bool = False,
+                    compact: bool = False) -> bool:
+        """Schreibt eine Tabelle als JSON-Array bzw. NDJSON (blockweise). True bei Erfolg."""
+        return save_json_stream(path, self.iter_query(table), ndjson=ndjson, compact=compact)
+
+    def import_json(self, table: str, path: Union[str, Path], key: Optional[str] = None,
+                    indexes: Sequence[str] = ()) -> int:
+        """
+        Ersetzt eine Tabelle durch den Inhalt einer JSON-Datei (Array, NDJSON oder Spaltenform).
+
+        Raises:
+            OSError, ValueError: Datei nicht lesbar, ungültig oder Datensatz ohne Schlüssel.
+        """
+        # import_delta erkennt alle drei Formate; erst hier laden (nur für Importe nötig)
+        from import_delta import iter_output
+        return self.bulk_load(table, (r for r in iter_output(path) if isinstance(r, dict)), key, indexes)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="SQLite-Speicher der Toolbox")
+    parser.add_argument("--db", help="Datenbank (Standard DATEN/toolbox.sqlite3)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    load = commands.add_parser("import", help="JSON-Datei als Tabelle laden (ersetzt die Tabelle)")
+    load.add_argument("table")
+    load.add_argument("file")
+    load.add_argument("--key", help="Schlüsselspalte (z.B. id)")
+    load.add_argument("--index", nargs="*", default=[], help="Indexspalten")
+    dump = commands.add_parser("export", help="Tabelle als JSON-Datei speichern")
+    dump.add_argument("table")
+    dump.add_argument("file")
+    dump.add_argument("--ndjson", action="store_true")
+    commands.add_parser("tables", help="Tabellen auflisten")
+    args = parser.parse_args()
+
+    from config_helper import Config
+    journal_mode = Config.shared().get("sqlite_journal_mode", DEFAULT_JOURNAL_MODE)
+    try:
+        with SqliteStore(args.db, journal_mode) as store:
+            if args.command == "import":
+                count = store.import_json(args.table, args.file, args.key, args.index)
+                log.info(f"{count} Datensätze in Tabelle {args.table} geladen ({store.path})")
+            elif args.command == "export":
+                if not store.export_json(args.table, args.file, ndjson=args.ndjson):
+                    sys.exit(1)
+                log.info(f"Tabelle {args.table} gespeichert: {args.file}")
+            else:
+                for name, spec in store.tables().items():
+                    print(f"{name:<24} {store.count(name):>9}  Schlüssel={spec['key']}  "
+                          f"Indizes={','.join(spec['indexes']) or '-'}")
+    except (OSError, ValueError, KeyError, sqlite3.Error) as e:
+        log.error(str(e))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
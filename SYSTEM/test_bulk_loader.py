@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+test_bulk_loader.py – Testet das gleichzeitige Laden vieler Dateien.
+
+Führe es einfach mit `python test_bulk_loader.py` aus.
+"""
+
+import gzip
+import json
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from bulk_loader import input_files, iter_load, load_many, read_file
+from json_helper import load_json, save_json
+
+
+def _files(tmp: Path, count: int = 12):
+    paths = []
+    for i in range(count):
+        path = tmp / f"schule_{i:02d}.json"
+        save_json(path, [{"id": i, "schule": f"S{i}"}])
+        paths.append(path)
+    return paths
+
+
+def test_formats_and_errors():
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        save_json(tmp / "a.json", {"x": 1})
+        (tmp / "b.ndjson").write_text('{"id": 1}\n\n{"id": 2}\n', encoding="utf-8")
+        (tmp / "c.csv").write_text("id;name\n1;Anna\n", encoding="utf-8")
+        (tmp / "d.json.gz").write_bytes(gzip.compress(b'[1, 2, 3]'))
+        (tmp / "kaputt.json").write_text("{nicht json", encoding="utf-8")
+        paths = [tmp / n for n in ("a.json", "b.ndjson", "c.csv", "d.json.gz", "kaputt.json", "fehlt.json")]
+
+        results = list(iter_load(paths, default="leer"))
+        assert [r.path for r in results] == paths
+        assert [r.data for r in results[:4]] == [{"x": 1}, [{"id": 1}, {"id": 2}], [{"id": "1", "name": "Anna"}],
+                                                 [1, 2, 3]]
+        assert all(r.ok for r in results[:4])
+        assert not results[4].ok and results[4].data == "leer"
+        assert results[5].error == "Datei nicht gefunden" and results[5].data == "leer"
+
+        # Wie load_json: fehlerhafte Dateien liefern default, der Rest wird geladen
+        data = load_many(paths, default=[])
+        assert data[tmp / "a.json"] == load_json(tmp / "a.json") and data[tmp / "kaputt.json"] == []
+        assert load_many(paths, default=[], cached=True) == data
+
+        assert input_files("*.json", tmp) == [tmp / "a.json", tmp / "kaputt.json"]
+
+
+def test_in_flight_limit_and_order():
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = _files(Path(tmp))
+        lock = threading.Lock()
+        active = peak = 0
+
+        def slow_reader(path):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            # spätere Dateien sind schneller fertig
+            time.sleep(0.002 * (len(paths) - paths.index(path)))
+            with lock:
+                active -= 1
+            return read_file(path)
+
+        ordered = list(iter_load(paths, threads=8, max_in_flight=3, reader=slow_reader))
+        assert [r.path for r in ordered] == paths and peak <= 3
+        assert [r.data[0]["id"] for r in ordered] == list(range(len(paths)))
+
+        peak = 0
+        unordered = list(iter_load(paths, threads=6, ordered=False, reader=slow_reader))
+        assert sorted(r.path for r in unordered) == paths and 1 < peak <= 6
+        assert [r.path for r in unordered] != paths
+
+
+def test_process_pool():
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = _files(Path(tmp), 4)
+        results = list(iter_load(paths, threads=2, processes=2))
+        assert [r.data for r in results] == [load_json(p) for p in paths]
+
+
+def main():
+    print("=" * 50)
+    print("TEST: bulk_loader.py")
+    print("=" * 50)
+    test_formats_and_errors()
+    print("   Formate, Fehler je Datei, load_json-Verhalten: OK")
+    test_in_flight_limit_and_order()
+    print("   Begrenzung und Reihenfolge: OK")
+    test_process_pool()
+    print("   Parsen im Prozess-Pool: OK")
+    print("\n✅ Alle Tests erfolgreich.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+test_clash_matrix.py – Testet die Kollisionsmatrix der Kurse.
+
+Führe es einfach mit `python test_clash_matrix.py` aus.
+"""
+
+import csv
+import json
+import random
+import tempfile
+from pathlib import Path
+
+from clash_matrix import ClashMatrix, _numpy, bit_indices
+from schueler_registry import SchuelerRegistry
+
+
+def _choices(n: int, seed: int = 3):
+    rng = random.Random(seed)
+    kurse = [f"K{i}" for i in range(12)]
+    return [(1000 + i, rng.sample(kurse, rng.randint(0, 5))) for i in range(n)]
+
+
+def _naive(choices, kurse):
+    """Überschneidungen mit verschachtelten Schleifen (Referenz)."""
+    return [[sum(1 for _, w in choices if a in w and b in w) for b in kurse] for a in kurse]
+
+
+def test_bitset_matches_naive():
+    choices = _choices(300)
+    matrix = ClashMatrix(choices, backend="bitset")
+    assert matrix.backend == "bitset"
+    assert matrix.matrix() == _naive(choices, matrix.kurse)
+    expected = [sid for sid, w in choices if "K1" in w and "K2" in w]
+    assert matrix.clashing_students("K1", "K2") == expected
+    assert matrix.overlap("K1", "K2") == len(expected) and matrix.size("K3") == sum("K3" in w for _, w in choices)
+    assert sum(matrix.conflicts("K1").values()) == sum(len(set(w)) - 1 for _, w in choices if "K1" in w)
+
+
+def test_numpy_backend():
+    if _numpy() is None:
+        try:
+            ClashMatrix([], backend="numpy")
+            raise AssertionError("ValueError erwartet")
+        except ValueError:
+            return
+    choices = _choices(500)
+    assert ClashMatrix(choices, backend="numpy").matrix() == ClashMatrix(choices, backend="bitset").matrix()
+
+
+def test_slots_and_fixed_courses():
+    choices = [(1, ["Ma", "Ph"]), (2, ["Ma", "Ku", "Ph"]), (3, ["Ku", "Xy"]), (4, [])]
+    matrix = ClashMatrix(choices, kurse=["Ma", "Ph", "Ku", "Bio"])
+    assert matrix.unknown == 1 and matrix.size("Bio") == 0
+    assert matrix.slot_clashes(["Ma", "Ph", "Ku"]) == {("Ma", "Ph"): 2, ("Ma", "Ku"): 1, ("Ph", "Ku"): 1}
+    assert matrix.students_with_clash(["Ma", "Ku"]) == [2]
+    assert matrix.students_with_clash(["Ph", "Bio"]) == []
+    assert bit_indices(0b1010_0000_0001 << 70) == [70, 79, 81]
+    try:
+        matrix.overlap("Ma", "Xy")
+        raise AssertionError("KeyError erwartet")
+    except KeyError:
+        pass
+
+
+def test_registry_and_export():
+    registry = SchuelerRegistry([{"id": 1, "kurse": "Ma,Ph"}, {"id": 2, "kurse": "Ph,Ku"}])
+    matrix = ClashMatrix.from_registry(registry)
+    assert matrix.kurse == ["Ku", "Ma", "Ph"] and matrix.clashing_students("Ph", "Ku") == [2]
+    with tempfile.TemporaryDirectory() as tmp:
+        assert matrix.save(Path(tmp) / "k.json") and matrix.export_csv(Path(tmp) / "k.csv")
+        data = json.loads((Path(tmp) / "k.json").read_text(encoding="utf-8"))
+        assert data["matrix"] == [[1, 0, 1], [0, 1, 1], [1, 1, 2]] and data["schueler"] == 2
+        with open(Path(tmp) / "k.csv", encoding="utf-8", newline="") as f:
+            rows = list(csv.reader(f, delimiter=";"))
+        assert rows[0] == ["", "Ku", "Ma", "Ph"] and rows[3] == ["Ph", "1", "1", "2"]
+
+
+def main():
+    print("=" * 50)
+    print("TEST: clash_matrix.py")
+    print("=" * 50)
+    test_bitset_matches_naive()
+    print("   Bitsets = verschachtelte Schleifen: OK")
+    test_numpy_backend()
+    print(f"   NumPy-Backend: OK ({'vorhanden' if _numpy() else 'nicht installiert'})")
+    test_slots_and_fixed_courses()
+    print("   Blöcke und feste Kursliste: OK")
+    test_registry_and_export()
+    print("   Registry, JSON- und CSV-Export: OK")
+    print("\n✅ Alle Tests erfolgreich.")
+
+
+if __name__ == "__main__":
+    main()
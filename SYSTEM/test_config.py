@@ -6,9 +6,160 @@ test_config.py – Testet das config_helper-Modul.
 Führe es einfach mit `python test_config.py` aus.
 """
 
+import json
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from unittest import mock
+
+import config_helper
 from config_helper import Config
 from file_manager import FilePaths
 
+
+def _count_saves():
+    """Zählt die Schreibvorgänge (save_json-Aufrufe) im config_helper."""
+    return mock.patch.object(config_helper, "save_json", wraps=config_helper.save_json)
+
+def test_batch_saves_once():
+    """Viele Änderungen in batch() -> genau ein Schreibvorgang; Exception -> nichts geändert."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "settings.json"
+        cfg = Config(path)                      # legt die Datei mit Standardwerten an
+        with _count_saves() as save:
+            with cfg.batch():
+                for i in range(10):
+                    cfg.set(f"wert_{i}", i)
+                with cfg.batch():               # verschachtelt: speichert noch nicht
+                    cfg.set("innen", True)
+                assert save.call_count == 0
+            assert save.call_count == 1
+            cfg.update({"a": 1, "b": 2})
+            assert save.call_count == 2
+
+            try:
+                with cfg.batch():
+                    cfg.set("a", 99)
+                    raise RuntimeError("Abbruch")
+            except RuntimeError:
+                pass
+            assert cfg.get("a") == 1 and save.call_count == 2
+        assert Config(path).get("wert_9") == 9 and Config(path).get("innen") is True
+
+def test_no_write_on_load():
+    """Eine vorhandene Datei wird beim Laden nicht neu geschrieben."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "settings.json"
+        path.write_text('{"project_name": "Alt"}', encoding="utf-8")
+        with _count_saves() as save:
+            cfg = Config(path)
+            assert save.call_count == 0
+            assert cfg.get("debug") is False    # Standardwert im Speicher ergänzt
+            cfg.set("debug", True)              # ... und mit der nächsten Änderung gespeichert
+        assert Config(path).get("version") == "0.1.0"
+
+def test_corrupt_file_untouched():
+    """Eine vorhandene, aber unlesbare Datei wird nie durch die Standardwerte ersetzt."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "settings.json"
+        kaputt = '{"project_name": "Meins", "debug": true,'
+        path.write_text(kaputt, encoding="utf-8")
+        with _count_saves() as save:
+            cfg = Config(path)
+            assert cfg.get("project_name") == config_helper.DEFAULT_CONFIG["project_name"]
+            cfg.flush()
+            assert save.call_count == 0
+        assert path.read_text(encoding="utf-8") == kaputt
+
+def test_autosave_debounced():
+    """Mit autosave_delay wird erst nach der letzten Änderung einmal gespeichert."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "settings.json"
+        cfg = Config(path, autosave_delay=0.2)
+        with _count_saves() as save:
+            for i in range(20):
+                cfg.set("zaehler", i)
+            assert save.call_count == 0
+            time.sleep(0.6)
+            assert save.call_count == 1
+            cfg.set("zaehler", 100)
+            cfg.flush()
+            assert save.call_count == 2
+        assert Config(path).get("zaehler") == 100
+
+def test_flush_at_exit():
+    """Ein atexit-Hook für alle Instanzen; geschrieben werden nur eigene, ausstehende Änderungen."""
+    with tempfile.TemporaryDirectory() as tmp:
+        verzoegert, fremd = Path(tmp) / "verzoegert.json", Path(tmp) / "fremd.json"
+        fremd.write_text('{"project_name": "Alt"}', encoding="utf-8")
+        code = f"""
+import atexit, json
+from pathlib import Path
+from config_helper import Config
+n = atexit._ncallbacks()
+configs = [Config({str(fremd)!r}) for _ in range(50)]   # Standardwerte ergänzt, nichts gesetzt
+assert atexit._ncallbacks() == n
+Config({str(verzoegert)!r}, autosave_delay=60).set("wert", 1)
+Path({str(fremd)!r}).write_text(json.dumps({{"project_name": "Extern"}}), encoding="utf-8")
+"""
+        subprocess.run([sys.executable, "-c", code], cwd=Path(__file__).parent, check=True)
+        assert Config(verzoegert).get("wert") == 1
+        assert json.loads(fremd.read_text(encoding="utf-8")) == {"project_name": "Extern"}
+
+def test_shared_instance():
+    """Config.shared liefert pro Datei dieselbe Instanz."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "settings.json"
+        a = Config.shared(path)
+        assert Config.shared(str(path)) is a
+        assert Config.shared(Path(tmp) / "andere.json") is not a
+
+def test_reload_changed_keys():
+    """reload() erkennt fremde Änderungen und meldet nur die geänderten Schlüssel."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "settings.json"
+        cfg = Config(path)
+        gemeldet = []
+        cfg.on_change(gemeldet.append)
+
+        cfg.set("eigener", 1)                   # eigene Änderung -> nichts zu laden
+        assert cfg.reload() == set() and gemeldet == []
+
+        daten = json.loads(path.read_text(encoding="utf-8"))
+        daten.update(debug=True, neu="x")
+        del daten["eigener"]
+        path.write_text(json.dumps(daten), encoding="utf-8")
+        assert cfg.reload() == {"debug", "neu", "eigener"}
+        assert cfg.get("debug") is True and gemeldet == [{"debug", "neu", "eigener"}]
+        assert cfg.reload() == set()            # unverändert -> nicht erneut gelesen
+
+        # Lokal gesetzte, noch nicht gespeicherte Werte bleiben erhalten
+        with cfg.batch():
+            cfg.set("neu", "lokal")
+            path.write_text(json.dumps(dict(daten, neu="fremd", debug=False)), encoding="utf-8")
+            cfg.reload()
+            assert cfg.get("neu") == "lokal" and cfg.get("debug") is False
+
+def test_watch_background():
+    """watch() lädt im Hintergrund nach und ruft die Rückrufe auf."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "settings.json"
+        cfg = Config(path)
+        ereignis = threading.Event()
+        gemeldet = []
+        cfg.on_change(lambda keys: (gemeldet.append(keys), ereignis.set()))
+        cfg.watch(interval=0.05)
+        try:
+            daten = json.loads(path.read_text(encoding="utf-8"))
+            path.write_text(json.dumps(dict(daten, project_name="Extern")), encoding="utf-8")
+            assert ereignis.wait(5)
+            assert gemeldet == [{"project_name"}] and cfg.get("project_name") == "Extern"
+        finally:
+            cfg.unwatch()
+
 def main():
     print("=" * 50)
     print("TEST: config_helper.py")
@@ -37,6 +188,20 @@ def main():
     print("\n4. Konfigurationsdatei liegt unter:")
     print(f"   {cfg.path}")
 
+    # 5. Sammeln, verzögertes Speichern, gemeinsame Instanz
+    test_batch_saves_once()
+    test_no_write_on_load()
+    test_corrupt_file_untouched()
+    test_autosave_debounced()
+    test_flush_at_exit()
+    test_shared_instance()
+    print("\n5. batch/autosave/shared: OK")
+
+    # 6. Änderungen von außen
+    test_reload_changed_keys()
+    test_watch_background()
+    print("\n6. reload/watch: OK")
+
     print("\n✅ Alle Tests erfolgreich.")
 
 if __name__ == "__main__":
@@ -4,16 +4,106 @@
 test_csv_importer.py – Testet den CSV-Importer.
 
 Erwartet eine Datei 'testdaten.csv' im INPUT-Ordner.
+Die Streaming-Modi werden zusätzlich mit einer temporären CSV geprüft.
 """
 
+import json
 import sys
+import tempfile
+import tracemalloc
 from pathlib import Path
 
 # Damit wir die Module im SYSTEM-Ordner finden
 sys.path.insert(0, str(Path(__file__).parent))
-from csv_importer import csv_to_json
+from csv_importer import csv_to_json, import_batch, print_summary
 from file_manager import FilePaths
 
+def _write_test_csv(path: Path, rows: int):
+    """Legt eine CSV mit `rows` Zeilen an."""
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        f.write("id;name;klasse\n")
+        for i in range(rows):
+            f.write(f"{i};Schüler {i};{5 + i % 8}a\n")
+
+def _peak_memory(func) -> int:
+    """Misst den Spitzenverbrauch (Bytes) eines Aufrufs mit tracemalloc."""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def test_stream_modes():
+    """stream und ndjson liefern dieselben Daten wie full – bei weniger Speicher."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        csv_path = tmp / "gross.csv"
+        _write_test_csv(csv_path, 10000)
+
+        peaks = {}
+        for mode in ("full", "stream", "ndjson"):
+            out = tmp / f"out_{mode}.json"
+            peaks[mode] = _peak_memory(
+                lambda: csv_to_json(csv_path, out, mode=mode, chunk_size=500))
+
+        full_text = (tmp / "out_full.json").read_text(encoding='utf-8')
+        assert (tmp / "out_stream.json").read_text(encoding='utf-8') == full_text
+
+        with open(tmp / "out_ndjson.json", encoding='utf-8') as f:
+            ndjson_rows = [json.loads(line) for line in f]
+        assert ndjson_rows == json.loads(full_text)
+
+        assert peaks["stream"] < peaks["full"] / 4
+        assert peaks["ndjson"] < peaks["full"] / 4
+        print(f"   Spitzenspeicher: " + ", ".join(f"{m}={p // 1024} KiB" for m, p in peaks.items()))
+
+def test_batch_import():
+    """Batch-Modus konvertiert alle passenden Dateien und meldet Fehler je Datei."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        in_dir, out_dir = tmp / "in", tmp / "out"
+        in_dir.mkdir()
+        for i in range(3):
+            _write_test_csv(in_dir / f"schule_{i}.csv", 100 * (i + 1))
+        # Ungültiges UTF-8 -> Fehler nur für diese Datei
+        (in_dir / "schule_kaputt.csv").write_bytes(b"id;name\n1;\xff\xfe\n")
+
+        results = import_batch("schule_*.csv", workers=2, mode="ndjson",
+                               input_dir=in_dir, output_dir=out_dir)
+        print_summary(results)
+
+        by_name = {Path(r["input"]).name: r for r in results}
+        assert len(results) == 4
+        assert by_name["schule_kaputt.csv"]["error"] is not None
+        for i in range(3):
+            r = by_name[f"schule_{i}.csv"]
+            assert r["error"] is None and r["rows"] == 100 * (i + 1)
+            assert (out_dir / f"schule_{i}.ndjson").exists()
+
+def test_incremental_batch():
+    """Zweiter Lauf überspringt unveränderte Dateien, --force und Änderungen nicht."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        in_dir, out_dir = tmp / "in", tmp / "out"
+        in_dir.mkdir()
+        for i in range(3):
+            _write_test_csv(in_dir / f"schule_{i}.csv", 50)
+
+        def run(**kwargs):
+            results = import_batch("*.csv", workers=1, input_dir=in_dir, output_dir=out_dir, **kwargs)
+            return sorted(Path(r["input"]).name for r in results if not r["skipped"])
+
+        assert run() == ["schule_0.csv", "schule_1.csv", "schule_2.csv"]
+        assert run() == []
+        assert (out_dir / "import_manifest.json").exists()
+
+        # Inhalt ändern -> nur diese Datei; andere Optionen -> alle
+        _write_test_csv(in_dir / "schule_1.csv", 60)
+        assert run() == ["schule_1.csv"]
+        assert run(force=True) == ["schule_0.csv", "schule_1.csv", "schule_2.csv"]
+        assert len(run(mode="ndjson")) == 3
+
 def main():
     print("=" * 50)
     print("TEST: CSV-Importer")
@@ -22,6 +112,13 @@ def main():
     csv_path = FilePaths.INPUT_DIR / "testdaten.csv"
     json_path = FilePaths.OUTPUT_DIR / "testdaten.json"
 
+    print("🔄 Prüfe Streaming-Modi ...")
+    test_stream_modes()
+    print("🔄 Prüfe Batch-Modus ...")
+    test_batch_import()
+    print("🔄 Prüfe inkrementellen Import ...")
+    test_incremental_batch()
+
     if not csv_path.exists():
         print(f"❌ Bitte lege zuerst eine Test-CSV an: {csv_path}")
         return
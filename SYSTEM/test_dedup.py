@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+test_dedup.py – Testet die Duplikatsuche über Schülerimporte.
+
+Führe es einfach mit `python test_dedup.py` aus.
+"""
+
+import json
+import tempfile
+from pathlib import Path
+
+from dedup import (DuplicateFinder, date_similarity, find_duplicates, koelner_phonetik,
+                   normalize_name, parse_date)
+from json_helper import iter_ndjson, iter_records, save_json
+
+
+def test_phonetics_and_normalization():
+    assert koelner_phonetik("Müller-Lüdenscheidt") == "65752682"
+    assert koelner_phonetik("Wikipedia") == "3412"
+    assert koelner_phonetik("Meier") == koelner_phonetik("Mayer") == koelner_phonetik("Maier") == "67"
+    assert koelner_phonetik("") == ""
+    assert normalize_name("  Müller-Lüdenscheidt ") == "mueller luedenscheidt"
+    assert normalize_name("José  GROß") == "jose gross"
+    assert parse_date("01.03.2008") == parse_date("2008-03-01") == "2008-03-01"
+    assert parse_date("irgendwann") is None
+    assert date_similarity("2008-03-01", "2008-01-03") == 0.6      # Tag/Monat vertauscht
+    assert date_similarity("2008-03-01", None) == 0.5
+    assert date_similarity("2008-03-01", "2009-04-02") == 0.0
+
+
+def test_matches_across_files():
+    with tempfile.TemporaryDirectory() as tmp:
+        a, b = Path(tmp) / "a.json", Path(tmp) / "b.ndjson"
+        save_json(a, [{"id": 1, "vorname": "Jan", "nachname": "Meier", "geburtsdatum": "2008-03-01"},
+                      {"id": 2, "vorname": "Lena", "nachname": "Schmidt", "geburtsdatum": "2009-05-17"},
+                      {"id": 3, "vorname": "Tom", "nachname": "Becker"}])
+        b.write_text("\n".join(json.dumps(r) for r in [
+            {"id": 10, "name": "Jan Mayer", "geburtsdatum": "01.03.2008"},        # Phonetik
+            {"id": 11, "vorname": "Lena", "nachname": "Schmitt", "geburtsdatum": "17.05.2009"},
+            {},                                                                   # ohne Namen
+            {"id": 12, "name": "Meyer, Jan", "geburtsdatum": "2008-03-01"},
+            {"id": 13, "vorname": "Tim", "nachname": "Bäcker", "geburtsdatum": "2001-01-01"},
+        ]) + "\n\n", encoding="utf-8")
+        assert [r.get("id") for r in iter_records(b)] == [10, 11, None, 12, 13]
+
+        output = Path(tmp) / "out" / "duplikate.json"
+        report = find_duplicates([a, b], output)
+        assert json.loads(output.read_text(encoding="utf-8")) == report
+
+    pairs = {frozenset((m["a"]["id"], m["b"]["id"])) for m in report["paare"]}
+    assert pairs == {frozenset((1, 10)), frozenset((1, 12)), frozenset((10, 12)), frozenset((2, 11))}
+    assert sorted(sorted(r["id"] for r in group) for group in report["gruppen"]) == [[1, 10, 12], [2, 11]]
+    first = next(m for m in report["paare"] if {m["a"]["id"], m["b"]["id"]} == {1, 10})
+    assert first["a"]["quelle"] == "a.json" and first["b"] == {
+        "quelle": "b.ndjson", "zeile": 1, "id": 10, "name": "mayer, jan", "geburtsdatum": "2008-03-01"}
+    assert first["details"]["geburtsdatum"] == 1.0
+    stats = report["statistik"]
+    assert stats["datensaetze"] == 8 and stats["ohne_namen"] == 1 and stats["gruppen"] == 2
+
+
+def test_oversized_blocks_are_skipped():
+    finder = DuplicateFinder(max_block=5)
+    for i in range(20):
+        finder.add({"id": i, "vorname": "Anna", "nachname": "Müller"})
+    report = finder.report()
+    assert report["paare"] == [] and report["statistik"]["vergleiche"] == 0
+    assert report["statistik"]["zu_grosse_bloecke"] == 1 and report["statistik"]["uebersprungen"] == 20
+
+    # Dieselben Paare aus mehreren Blöcken werden nur einmal verglichen
+    finder = DuplicateFinder()
+    finder.add({"vorname": "Anna", "nachname": "Müller", "geburtsdatum": "2008-01-01"})
+    finder.add({"vorname": "Anna", "nachname": "Müller", "geburtsdatum": "2008-01-01"})
+    assert len(finder.report()["paare"]) == 1 and finder.stats["vergleiche"] == 1
+
+
+def test_ndjson_error_line():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "kaputt.ndjson"
+        path.write_text('{"id": 1}\n{"id": \n', encoding="utf-8")
+        try:
+            list(iter_ndjson(path))
+        except ValueError as e:
+            assert "Zeile 2" in str(e)
+        else:
+            raise AssertionError("ValueError erwartet")
+
+
+def main():
+    print("=" * 50)
+    print("TEST: dedup.py")
+    print("=" * 50)
+    test_phonetics_and_normalization()
+    print("   Kölner Phonetik und Normalisierung: OK")
+    test_matches_across_files()
+    print("   Treffer über JSON- und NDJSON-Dateien: OK")
+    test_oversized_blocks_are_skipped()
+    print("   Zu große Blöcke, Paare nur einmal: OK")
+    test_ndjson_error_line()
+    print("   NDJSON-Fehler mit Zeilennummer: OK")
+    print("\n✅ Alle Tests erfolgreich.")
+
+
+if __name__ == "__main__":
+    main()
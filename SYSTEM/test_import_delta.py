@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+test_import_delta.py – Testet den Delta-Import (Änderungssätze je Schlüsselspalte).
+
+Führe es einfach mit `python test_import_delta.py` aus.
+"""
+
+import json
+import tempfile
+from pathlib import Path
+
+from csv_importer import csv_to_json, import_batch
+from import_delta import (apply_delta, apply_delta_file, delta_path, diff_records, index_records,
+                          load_delta, row_digest)
+from json_helper import load_json, save_json
+
+
+def _write_csv(path: Path, rows):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write("id;name;klasse\n")
+        for row in rows:
+            f.write(";".join(row) + "\n")
+
+
+def test_diff_and_apply():
+    old = [{"id": "1", "name": "Anna", "klasse": "5a"}, {"id": "2", "name": "Ben", "klasse": "5a"},
+           {"id": "3", "name": "Cem", "klasse": "6b"}, {"id": "", "name": "ohne id"}]
+    new = [{"klasse": "5a", "name": "Anna", "id": "1"},                    # andere Feldreihenfolge
+           {"id": "2", "name": "Ben", "klasse": "5b"},
+           {"id": "4", "name": "Dora", "klasse": "7c"}]
+    assert row_digest(old[0]) == row_digest(new[0]) != row_digest(old[1])
+
+    index, missing = index_records(old, "id")
+    assert missing == 1
+    delta = diff_records(index, new, "id")
+    assert index == {}
+    assert delta["hinzugefuegt"] == [new[2]] and delta["entfernt"] == ["3"]
+    assert delta["geaendert"] == [{"schluessel": "2", "felder": {"klasse": ["5a", "5b"]}}]
+    assert delta["statistik"]["unveraendert"] == 1 and delta["statistik"]["alt"] == 3
+
+    records = [dict(r) for r in old]
+    apply_delta(records, delta)
+    assert records == [dict(old[0]), new[1], old[3], new[2]]
+    assert apply_delta([dict(r) for r in records], delta) == records       # erneut: keine Änderung
+
+    try:
+        diff_records({}, [{"id": "1"}, {"id": "1"}], "id")
+    except ValueError as e:
+        assert "mehrfach" in str(e)
+    else:
+        raise AssertionError("ValueError erwartet")
+
+
+def test_importer_writes_delta():
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        csv_path, json_path = tmp / "schule.csv", tmp / "schule.json"
+        _write_csv(csv_path, [(str(i), f"Schüler {i}", "5a") for i in range(100)])
+        assert csv_to_json(csv_path, json_path, delta_key="id")
+        first = load_delta(delta_path(json_path))
+        assert delta_path(json_path).name == "schule.delta.json"
+        assert first["statistik"]["hinzugefuegt"] == 100 and first["statistik"]["alt"] == 0
+
+        rows = [(str(i), f"Schüler {i}", "6a" if i == 7 else "5a") for i in range(100) if i != 3]
+        _write_csv(csv_path, rows + [("100", "Neu", "5c")])
+        # ndjson schreibt NDJSON unter .json – wird beim nächsten Vergleich erkannt
+        assert csv_to_json(csv_path, json_path, mode="ndjson", delta_key="id")
+        delta = load_delta(delta_path(json_path))
+        assert delta["entfernt"] == ["3"] and [r["id"] for r in delta["hinzugefuegt"]] == ["100"]
+        assert delta["geaendert"] == [{"schluessel": "7", "felder": {"klasse": ["5a", "6a"]}}]
+        # Kompakt gespeichert
+        assert "\n" not in delta_path(json_path).read_text(encoding="utf-8").strip()
+        assert csv_to_json(csv_path, json_path, delta_key="id")
+        assert load_delta(delta_path(json_path))["statistik"]["unveraendert"] == 100
+
+        master = tmp / "master.json"
+        save_json(master, [{"id": str(i), "name": f"Schüler {i}", "klasse": "5a"} for i in range(100)])
+        assert apply_delta_file(master, delta)["geaendert"] == 1
+        assert load_json(master) == load_json(json_path)
+
+
+def test_compressed_output():
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        csv_path = tmp / "schule.csv"
+        assert delta_path(tmp / "schule.json.gz") == delta_path(tmp / "schule.json") == tmp / "schule.delta.json"
+        for mode, name in (("stream", "schule.json.gz"), ("ndjson", "schule.ndjson.xz")):
+            json_path = tmp / name
+            _write_csv(csv_path, [("1", "Anna", "5a"), ("2", "Ben", "5a")])
+            assert csv_to_json(csv_path, json_path, mode=mode, delta_key="id")
+            _write_csv(csv_path, [("1", "Anna", "5b"), ("3", "Cem", "6a")])
+            assert csv_to_json(csv_path, json_path, mode=mode, delta_key="id")
+            delta = load_delta(delta_path(json_path))
+            assert delta["entfernt"] == ["2"] and [r["id"] for r in delta["hinzugefuegt"]] == ["3"]
+            assert delta["geaendert"] == [{"schluessel": "1", "felder": {"klasse": ["5a", "5b"]}}]
+
+
+def test_failed_delta_keeps_output():
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        csv_path, json_path = tmp / "schule.csv", tmp / "schule.json"
+        _write_csv(csv_path, [("1", "Anna", "5a"), ("2", "Ben", "5a")])
+        assert csv_to_json(csv_path, json_path, delta_key="id")
+        before = json_path.read_bytes(), delta_path(json_path).read_bytes()
+        # Doppelter Schlüssel: der Vergleich scheitert, alte Ausgabe und Änderungssatz bleiben
+        _write_csv(csv_path, [("1", "Anna", "5b"), ("1", "Ben", "5a")])
+        assert not csv_to_json(csv_path, json_path, delta_key="id")
+        assert (json_path.read_bytes(), delta_path(json_path).read_bytes()) == before
+        assert sorted(p.name for p in tmp.iterdir()) == ["schule.csv", "schule.delta.json", "schule.json"]
+
+
+def test_batch_delta():
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        (tmp / "in").mkdir()
+        _write_csv(tmp / "in" / "a.csv", [("1", "Anna", "5a")])
+        results = import_batch("*.csv", workers=1, input_dir=tmp / "in", output_dir=tmp / "out")
+        assert results[0]["error"] is None and not (tmp / "out" / "a.delta.json").exists()
+        # Gleiche Eingabe, aber jetzt mit delta_key: nicht überspringen, Änderungssatz schreiben
+        results = import_batch("*.csv", workers=1, input_dir=tmp / "in", output_dir=tmp / "out",
+                               delta_key="id")
+        assert not results[0]["skipped"] and (tmp / "out" / "a.delta.json").exists()
+        results = import_batch("*.csv", workers=1, input_dir=tmp / "in", output_dir=tmp / "out",
+                               delta_key="id")
+        assert results[0]["skipped"]
+        _write_csv(tmp / "in" / "a.csv", [("1", "Anna", "5b")])
+        import_batch("*.csv", workers=1, input_dir=tmp / "in", output_dir=tmp / "out", delta_key="id")
+        delta = json.loads((tmp / "out" / "a.delta.json").read_text(encoding="utf-8"))
+        assert delta["geaendert"] == [{"schluessel": "1", "felder": {"klasse": ["5a", "5b"]}}]
+
+
+def main():
+    print("=" * 50)
+    print("TEST: import_delta.py")
+    print("=" * 50)
+    test_diff_and_apply()
+    print("   Vergleich über Zeilen-Hashes, Anwenden: OK")
+    test_importer_writes_delta()
+    print("   csv_to_json mit delta_key, Master-Liste aktualisieren: OK")
+    test_compressed_output()
+    print("   Komprimierte Ausgabe (.gz/.xz): OK")
+    test_failed_delta_keeps_output()
+    print("   Fehlgeschlagener Vergleich behält die alte Ausgabe: OK")
+    test_batch_delta()
+    print("   Batch-Import mit delta_key: OK")
+    print("\n✅ Alle Tests erfolgreich.")
+
+
+if __name__ == "__main__":
+    main()
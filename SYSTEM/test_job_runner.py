@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+test_job_runner.py – Testet die Job-Warteschlange (Parallelität, Abbruch, Zeitlimit, Speicher).
+
+Führe es einfach mit `python test_job_runner.py` aus.
+"""
+
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from job_runner import (CANCELLED, DONE, FAILED, RUNNING, TIMEOUT, Job, JobRunner, script_command)
+
+
+def _python(code: str) -> list:
+    return [sys.executable, "-c", code]
+
+
+def test_concurrency_limit():
+    """Von vier Jobs laufen höchstens zwei gleichzeitig."""
+    running = set()
+    peak = [0]
+    lock = threading.Lock()
+
+    def on_update(job):
+        with lock:
+            if job.status == RUNNING:
+                running.add(job.id)
+            else:
+                running.discard(job.id)
+            peak[0] = max(peak[0], len(running))
+
+    runner = JobRunner(max_workers=2, on_update=on_update)
+    start = time.perf_counter()
+    jobs = [runner.submit_command(_python("import time; time.sleep(0.4)")) for _ in range(4)]
+    assert runner.wait(30)
+    assert all(job.status == DONE and job.exit_code == 0 for job in jobs)
+    assert peak[0] == 2
+    assert time.perf_counter() - start >= 0.8
+    runner.shutdown()
+
+
+def test_output_and_exit_code():
+    lines = []
+    runner = JobRunner(on_output=lambda job, line: lines.append((job.id, line)))
+    ok = runner.submit_command(_python("print('hallo'); print('welt')"))
+    bad = runner.submit_command(_python("import sys; print('kaputt'); sys.exit(3)"))
+    assert runner.wait(30)
+    assert [l for i, l in lines if i == ok.id] == ["hallo", "welt"]
+    assert bad.status == FAILED and bad.exit_code == 3
+    assert ok.wall_time is not None and ok.wall_time > 0
+    runner.shutdown()
+
+
+def test_cancel_and_timeout():
+    runner = JobRunner(max_workers=1)
+    long_job = runner.submit_command(_python("import time; time.sleep(30)"))
+    waiting = runner.submit_command(_python("print('nie')"))
+    limited = runner.submit_command(_python("import time; time.sleep(30)"), timeout=0.5)
+
+    assert runner.cancel(waiting.id)
+    assert waiting.status == CANCELLED
+    while long_job.status != RUNNING:
+        time.sleep(0.01)
+    assert runner.cancel(long_job.id)
+    assert runner.wait(30)
+    assert long_job.status == CANCELLED and long_job.exit_code != 0
+    assert limited.status == TIMEOUT
+    assert long_job.wall_time < 10 and limited.wall_time < 10
+    assert not runner.cancel(long_job.id)   # schon beendet
+    runner.shutdown()
+
+
+def test_peak_memory():
+    if not hasattr(os, "wait4"):
+        return  # nur mit psutil messbar
+    runner = JobRunner()
+    job = runner.submit_command(_python("x = bytearray(80 * 1024 * 1024); x[::4096] = b'1' * len(x[::4096])"))
+    assert job.wait(30)
+    assert job.status == DONE and job.peak_rss >= 80 * 1024 * 1024
+    runner.shutdown()
+
+
+def test_reap_after_poll():
+    """Hat Popen den Prozess schon abgeholt (z.B. terminate() beim Abbruch), gilt dessen Exitcode."""
+    process = subprocess.Popen(_python("import sys; sys.exit(4)"))
+    process.wait()
+    job = Job(1, "test", process.args)
+    assert JobRunner()._reap(job, process) == 4 and job.peak_rss is None
+
+
+def test_script_command():
+    argv = script_command("job_runner.py", ["--x", 1])
+    assert argv[0] == sys.executable and argv[-2:] == ["--x", "1"]
+    for bad in ("../dashboard.py", "gibtsnicht.py", "/etc/passwd"):
+        try:
+            script_command(bad)
+            raise AssertionError(f"ValueError erwartet: {bad}")
+        except ValueError:
+            pass
+
+
+def main():
+    print("=" * 50)
+    print("TEST: job_runner.py")
+    print("=" * 50)
+    test_concurrency_limit()
+    print("   Höchstens max_workers gleichzeitig: OK")
+    test_output_and_exit_code()
+    print("   Ausgabe und Exitcode: OK")
+    test_cancel_and_timeout()
+    print("   Abbruch und Zeitlimit: OK")
+    test_peak_memory()
+    print("   Peak-Speicher: OK")
+    test_reap_after_poll()
+    print("   Bereits abgeholter Prozess: OK")
+    test_script_command()
+    print("   Nur Skripte im SYSTEM-Ordner: OK")
+    print("\n✅ Alle Tests erfolgreich.")
+
+
+if __name__ == "__main__":
+    main()
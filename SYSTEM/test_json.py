@@ -1,5 +1,11 @@
 # SYSTEM/test_json.py
-from json_helper import load_json, save_json
+import tempfile
+from pathlib import Path
+
+import json
+
+from json_helper import load_json, save_json, cache_stats, clear_cache, set_cache_limit, DEFAULT_CACHE_BYTES
+from json_helper import count_json_array, iter_json_array
 from file_manager import FilePaths
 
 # 1. Testdaten speichern
@@ -18,4 +24,122 @@ print("Fallback bei nicht vorhandener Datei:", nicht_da)
 
 # 4. Test mit ungültiger JSON (z.B. Ordnerpfad)
 ungueltig = load_json(FilePaths.OUTPUT_DIR, default="Fehler")
-print("Fallback bei ungültigem Pfad:", ungueltig)
\ No newline at end of file
+print("Fallback bei ungültigem Pfad:", ungueltig)
+
+
+# 5. Cache: Treffer, Kopie vs. Ansicht, Invalidierung durch save_json, LRU
+def test_cache():
+    with tempfile.TemporaryDirectory() as tmp:
+        a, b = Path(tmp) / "a.json", Path(tmp) / "b.json"
+        save_json(a, {"liste": [1, 2, 3]})
+        save_json(b, {"x": "y" * 1000})
+        clear_cache()
+        start = cache_stats()
+
+        kopie = load_json(a, cached=True)
+        kopie["liste"].append(4)                       # eigene Kopie
+        assert load_json(a, cached=True) == {"liste": [1, 2, 3]}
+
+        ansicht = load_json(a, cached=True, readonly=True)
+        assert ansicht["liste"] == (1, 2, 3)
+        try:
+            ansicht["neu"] = 1
+            raise AssertionError("Ansicht darf nicht veränderbar sein")
+        except TypeError:
+            pass
+
+        save_json(a, {"liste": []})                    # invalidiert sofort
+        assert load_json(a, cached=True) == {"liste": []}
+
+        stats = cache_stats()
+        assert stats["hits"] - start["hits"] == 2
+        assert stats["misses"] - start["misses"] == 2
+
+        # Grenze kleiner als beide Dateien zusammen -> älterer Eintrag fällt heraus
+        set_cache_limit(b.stat().st_size + 5)
+        load_json(b, cached=True)
+        assert cache_stats()["entries"] == 1
+        assert cache_stats()["evictions"] > start["evictions"]
+        set_cache_limit(DEFAULT_CACHE_BYTES)
+
+
+# 6. Elementweises Lesen und Zählen großer Arrays
+def test_iter_json_array():
+    daten = [{"id": i, "name": f"Schüler {i}", "noten": [1.5, 2.0], "notiz": "a\n    b"} for i in range(2000)]
+    daten += [2.5, "x", None, [], {}]
+    with tempfile.TemporaryDirectory() as tmp:
+        pretty, compact = Path(tmp) / "pretty.json", Path(tmp) / "compact.json"
+        save_json(pretty, daten)
+        compact.write_text(json.dumps(daten, separators=(",", ":")), encoding="utf-8")
+        for path in (pretty, compact):
+            for use_mmap in (False, True):
+                assert list(iter_json_array(path, use_mmap=use_mmap, chunk_size=100)) == daten
+            assert count_json_array(path) == len(daten)
+
+        # Früher Abbruch
+        for element in iter_json_array(pretty):
+            if element["id"] == 3:
+                break
+        assert element["id"] == 3
+
+        leer = Path(tmp) / "leer.json"
+        save_json(leer, [])
+        assert list(iter_json_array(leer)) == [] and count_json_array(leer) == 0
+
+        kein_array = Path(tmp) / "dict.json"
+        save_json(kein_array, {"a": 1})
+        try:
+            list(iter_json_array(kein_array))
+            raise AssertionError("ValueError erwartet")
+        except ValueError:
+            pass
+
+# Zählen: Schnellweg nur für genau das Format von save_json
+def test_count_json_array_layouts():
+    faelle = {
+        "[\n    1, 2,\n    3\n]": 3,                                   # mehrere Werte je Zeile
+        "[\n    1,\n  2\n]": 2,                                         # andere Einrückung
+        '[\n    {"a": 1}, {"b": 2}\n]': 2,
+        '[\n    {\n        "a": 1\n    }, {\n        "b": 2\n    }\n]': 2,
+        '[\r\n    1,\r\n    "x, y",\r\n    [],\r\n    {}\r\n]': 4,       # Windows-Zeilenenden
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "liste.json"
+        for text, anzahl in faelle.items():
+            path.write_bytes(text.encode("utf-8"))
+            assert count_json_array(path) == anzahl == len(json.loads(text)), text
+
+
+# 7. Kompakt, komprimiert, atomar
+def test_save_modes():
+    daten = [{"id": i, "name": f"Schüler {i}", "kurse": ["Ma", "De"]} for i in range(500)]
+    with tempfile.TemporaryDirectory() as tmp:
+        normal, kompakt = Path(tmp) / "normal.json", Path(tmp) / "kompakt.json"
+        assert save_json(normal, daten) and save_json(kompakt, daten, compact=True)
+        assert normal.read_text(encoding="utf-8") == json.dumps(daten, indent=4, ensure_ascii=False)
+        assert kompakt.read_text(encoding="utf-8") == json.dumps(daten, separators=(",", ":"), ensure_ascii=False)
+        assert kompakt.stat().st_size < normal.stat().st_size
+
+        for name in ("daten.json.gz", "daten.json.xz"):
+            path = Path(tmp) / name
+            assert save_json(path, daten, compact=True, fsync="file")
+            assert load_json(path) == daten
+            assert list(iter_json_array(path)) == daten and count_json_array(path) == len(daten)
+            assert path.stat().st_size < kompakt.stat().st_size
+
+        # Fehler beim Schreiben: alte Datei bleibt vollständig, keine Reste
+        assert not save_json(normal, [1, object()], fsync="full")
+        assert load_json(normal) == daten
+        assert sorted(p.name for p in Path(tmp).iterdir()) == ["daten.json.gz", "daten.json.xz",
+                                                                "kompakt.json", "normal.json"]
+        assert not save_json(normal, daten, fsync="immer")
+
+
+if __name__ == "__main__":
+    test_cache()
+    print("Cache-Test erfolgreich:", cache_stats())
+    test_iter_json_array()
+    test_count_json_array_layouts()
+    print("Array-Iterator-Test erfolgreich.")
+    test_save_modes()
+    print("Speichermodi-Test erfolgreich.")
@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+test_kursplanung.py – Testet die Kurszuteilung (Optimalität, Kapazitäten, Änderungen).
+
+Führe es einfach mit `python test_kursplanung.py` aus.
+"""
+
+import itertools
+import json
+import random
+import tempfile
+from pathlib import Path
+
+from kursplanung import DEFAULT_UNASSIGNED_COST, Kursplanung, default_rank_cost, load_kurse, save_assignment
+from schueler_registry import SchuelerRegistry
+
+
+def _random_instance(rng, students: int, courses: int, max_capacity: int = 3):
+    kurse = [f"K{i}" for i in range(courses)]
+    capacities = {k: rng.randint(0, max_capacity) for k in kurse}
+    wahlen = [(i, rng.sample(kurse, rng.randint(0, min(3, courses)))) for i in range(students)]
+    return capacities, wahlen
+
+
+def _brute_force(capacities, wahlen) -> int:
+    """Minimale Kosten durch Ausprobieren aller Zuteilungen (nur für kleine Fälle)."""
+    best = None
+    choices = [list(w) + [None] for _, w in wahlen]
+    for combo in itertools.product(*choices):
+        used = {}
+        for kurs in combo:
+            if kurs is not None:
+                used[kurs] = used.get(kurs, 0) + 1
+        if any(n > capacities[k] for k, n in used.items()):
+            continue
+        cost = sum(DEFAULT_UNASSIGNED_COST if kurs is None else default_rank_cost(w.index(kurs))
+                   for kurs, (_, w) in zip(combo, wahlen))
+        best = cost if best is None else min(best, cost)
+    return best
+
+
+def _check_plan(plan, capacities, wahlen):
+    loads = plan.loads()
+    assert all(loads[k] <= capacities[k] for k in capacities)
+    assignment = plan.assignment()
+    for sid, w in wahlen:
+        assert assignment[sid] is None or assignment[sid] in w
+
+
+def test_optimal_against_brute_force():
+    rng = random.Random(7)
+    for _ in range(150):
+        capacities, wahlen = _random_instance(rng, rng.randint(1, 6), rng.randint(1, 4))
+        plan = Kursplanung(capacities).add_students(wahlen)
+        _check_plan(plan, capacities, wahlen)
+        assert plan.total_cost() == _brute_force(capacities, wahlen), (capacities, wahlen)
+
+
+def test_fast_path_and_unassigned():
+    plan = Kursplanung({"Ma": 1, "Ph": 1})
+    assert plan.add_student(1, ["Ma", "Ph"]) == "Ma" and plan.fast_path == 1
+    assert plan.add_student(2, ["Ma", "Ph"]) == "Ph"
+    assert plan.add_student(3, ["Ma", "Xy"]) is None and plan.unknown == 1
+    assert plan.stats()["by_rank"] == {0: 1, 1: 1, None: 1}
+    # Wer Ma nur als Erstwunsch hat, bekommt Platz, wenn 1 nach Ph ausweicht
+    plan = Kursplanung({"Ma": 1, "Ph": 1})
+    plan.add_student(1, ["Ma", "Ph"])
+    plan.add_student(2, ["Ma"])
+    assert plan.assignment() == {1: "Ph", 2: "Ma"} and plan.moves == 1
+
+
+def test_incremental_matches_fresh_solve():
+    """Nach Änderungen, Abmeldungen und Kapazitätsänderungen ist der Plan so gut wie neu gelöst."""
+    rng = random.Random(11)
+    for _ in range(40):
+        capacities, wahlen = _random_instance(rng, 40, 6, max_capacity=9)
+        plan = Kursplanung(capacities).add_students(wahlen)
+        current = dict(wahlen)
+        kurse = list(capacities)
+        for step in range(25):
+            action = rng.random()
+            sid = rng.choice(list(current))
+            if action < 0.5:
+                current[sid] = rng.sample(kurse, rng.randint(0, 3))
+                plan.change_student(sid, current[sid])
+            elif action < 0.7 and len(current) > 1:
+                del current[sid]
+                plan.remove_student(sid)
+            else:
+                kurs = rng.choice(kurse)
+                capacities[kurs] = rng.randint(0, 10)
+                plan.set_capacity(kurs, capacities[kurs])
+            fresh = Kursplanung(capacities).add_students(current.items())
+            _check_plan(plan, capacities, list(current.items()))
+            assert plan.total_cost() == fresh.total_cost(), step
+
+
+def test_files_and_registry():
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        (tmp / "kurse.json").write_text(json.dumps([{"id": "Ma", "kapazitaet": 1}, {"kurs": "Ku", "max": 2}]),
+                                        encoding="utf-8")
+        capacities = load_kurse(tmp / "kurse.json")
+        assert capacities == {"Ma": 1, "Ku": 2}
+        registry = SchuelerRegistry([{"id": 1, "wahl1": "Ma"}, {"id": 2, "wahl1": "Ma", "wahl2": "Ku"}])
+        plan = Kursplanung(capacities).add_students((r.id, r.kurse) for r in registry)
+        assert plan.assignment() == {1: "Ma", 2: "Ku"}
+        assert save_assignment(plan, tmp / "zuteilung.json")
+        data = json.loads((tmp / "zuteilung.json").read_text(encoding="utf-8"))
+        assert data["zuteilung"][1] == {"id": 2, "kurs": "Ku", "wunsch": 2}
+        assert data["statistik"]["by_rank"] == {"1": 1, "2": 1}
+        try:
+            load_kurse(tmp / "fehlt.json")
+            raise AssertionError("ValueError erwartet")
+        except ValueError:
+            pass
+
+
+def main():
+    print("=" * 50)
+    print("TEST: kursplanung.py")
+    print("=" * 50)
+    test_optimal_against_brute_force()
+    print("   Optimal (Vergleich mit vollständiger Suche): OK")
+    test_fast_path_and_unassigned()
+    print("   Schnellweg, Ausweichen, ohne Kurs: OK")
+    test_incremental_matches_fresh_solve()
+    print("   Schrittweise Änderungen = Neulösung: OK")
+    test_files_and_registry()
+    print("   kurse.json, Registry, Ausgabe: OK")
+    print("\n✅ Alle Tests erfolgreich.")
+
+
+if __name__ == "__main__":
+    main()
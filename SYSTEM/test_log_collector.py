@@ -0,0 +1,194 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+test_log_collector.py – Testet den Log-Collector mit mehreren Prozessen.
+
+Führe es einfach mit `python test_log_collector.py` aus.
+"""
+
+import contextlib
+import io
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from log_collector import LogCollector
+import logger
+from logger import Logger
+
+SYSTEM_DIR = Path(__file__).parent
+
+# Jeder Kindprozess schreibt viele lange Zeilen in dieselbe Datei
+CHILD = """
+import sys
+import logger
+from logger import Logger
+log = Logger(sys.argv[1], console=False, batch_size=50)
+for i in range(int(sys.argv[3])):
+    log.info(f"P{sys.argv[2]} Zeile {i} " + "x" * 200)
+"""
+
+def _run_children(log_file: Path, address: str, processes: int, lines: int):
+    env = dict(os.environ, TOOLBOX_LOG_COLLECTOR=address)
+    children = [subprocess.Popen([sys.executable, "-c", CHILD, str(log_file), str(n), str(lines)],
+                                 cwd=SYSTEM_DIR, env=env)
+                for n in range(processes)]
+    for child in children:
+        assert child.wait() == 0
+
+def _check(log_file: Path, processes: int, lines: int):
+    text = log_file.read_text(encoding="utf-8").splitlines()
+    assert len(text) == processes * lines, (len(text), processes * lines)
+    for line in text:
+        assert line.endswith("x" * 200) and " | INFO     | P" in line
+
+def test_collector_many_processes():
+    """Alle Zeilen kommen vollständig über den Collector an."""
+    with tempfile.TemporaryDirectory() as tmp:
+        log_file = Path(tmp) / "gesammelt.log"
+        collector = LogCollector(log_file, port=0)
+        collector.serve_in_background()
+        try:
+            host, port = collector.address
+            _run_children(log_file, f"{host}:{port}", processes=4, lines=2000)
+            # Die Kinder sind fertig, der Collector schreibt noch gepuffert
+            time.sleep(0.2)
+            collector.writer.flush()
+            _check(log_file, 4, 2000)
+        finally:
+            collector.shutdown()
+            collector.server_close()
+
+def test_fallback_without_collector():
+    """Ohne laufenden Collector schreiben die Logger direkt in die Datei."""
+    with tempfile.TemporaryDirectory() as tmp:
+        log_file = Path(tmp) / "direkt.log"
+        _run_children(log_file, "127.0.0.1:1", processes=2, lines=500)
+        _check(log_file, 2, 500)
+
+def test_collector_in_same_process():
+    """Collector und Logger im selben Prozess (z.B. Dashboard): die Zeilen landen in der Datei."""
+    with tempfile.TemporaryDirectory() as tmp:
+        log_file = Path(tmp) / "dashboard.log"
+        log = Logger(log_file, console=False)      # Schreiber existiert schon vor dem Collector
+        collector = LogCollector(log_file, port=0)
+        collector.serve_in_background()
+        old = os.environ.get("TOOLBOX_LOG_COLLECTOR")
+        os.environ["TOOLBOX_LOG_COLLECTOR"] = "%s:%d" % collector.address
+        try:
+            assert collector.writer is not log._writer and not collector.writer.use_collector
+            for i in range(100):
+                log.info("Zeile %d", i)
+            log.flush()
+            time.sleep(0.2)
+            collector.writer.flush()
+            lines = log_file.read_text(encoding="utf-8").splitlines()
+            assert len(lines) == 100 and lines[-1].endswith("Zeile 99")
+        finally:
+            if old is None:
+                os.environ.pop("TOOLBOX_LOG_COLLECTOR", None)
+            else:
+                os.environ["TOOLBOX_LOG_COLLECTOR"] = old
+            log._writer.close()
+            collector.shutdown()
+            collector.server_close()
+
+def test_stalled_collector():
+    """Ein Collector, der nichts mehr liest, blockiert den Logger nicht – er schreibt den Rest selbst."""
+    server = socket.socket()
+    server.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+    server.bind(("127.0.0.1", 0))
+    server.listen()
+    release = threading.Event()
+    received = []
+
+    def stalled():
+        conn, _ = server.accept()
+        conn.recv(4096)
+        conn.sendall(b"OK\n")
+        release.wait(30)            # liest bis dahin nichts
+        with conn.makefile("rb") as f:
+            data = f.read()         # was bis zum Timeout ankam
+        conn.close()
+        received.extend(line for line in data.decode("utf-8").split("\n")[:-1])
+
+    thread = threading.Thread(target=stalled, daemon=True)
+    thread.start()
+    old_env = os.environ.get("TOOLBOX_LOG_COLLECTOR")
+    old_timeout = logger._COLLECTOR_SEND_TIMEOUT
+    os.environ["TOOLBOX_LOG_COLLECTOR"] = "127.0.0.1:%d" % server.getsockname()[1]
+    logger._COLLECTOR_SEND_TIMEOUT = 0.2
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            log_file = Path(tmp) / "haengt.log"
+            log = Logger(log_file, console=False, batch_size=100000, flush_interval=60)
+            for i in range(20000):
+                log.info("Zeile %d %s", i, "x" * 200)
+            start = time.monotonic()
+            log._writer.close()
+            assert time.monotonic() - start < 10
+            release.set()
+            thread.join()
+            written = log_file.read_text(encoding="utf-8").splitlines()
+            # Jede Zeile genau einmal: beim Collector angekommen oder in der Datei
+            assert received and written
+            assert sorted(received + written) == sorted(set(received + written))
+            assert len(received) + len(written) == 20000 and written[-1].endswith("Zeile 19999 " + "x" * 200)
+    finally:
+        logger._COLLECTOR_SEND_TIMEOUT = old_timeout
+        if old_env is None:
+            os.environ.pop("TOOLBOX_LOG_COLLECTOR", None)
+        else:
+            os.environ["TOOLBOX_LOG_COLLECTOR"] = old_env
+        release.set()
+        thread.join()
+        server.close()
+
+def test_invalid_address():
+    """Ungültiges TOOLBOX_LOG_COLLECTOR: wie "off", eine Warnung, der Logger schreibt selbst."""
+    old_env = os.environ.get("TOOLBOX_LOG_COLLECTOR")
+    stderr = io.StringIO()
+    try:
+        with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stderr(stderr):
+            for value in ("localhost", "host:abc", "localhost"):
+                os.environ["TOOLBOX_LOG_COLLECTOR"] = value
+                assert logger.collector_address() is None
+                assert logger.collector_address() is None
+            assert stderr.getvalue().count("WARNUNG") == 2
+            os.environ["TOOLBOX_LOG_COLLECTOR"] = "127.0.0.1:5"
+            assert logger.collector_address() == ("127.0.0.1", 5)
+
+            os.environ["TOOLBOX_LOG_COLLECTOR"] = "host:abc"
+            log = Logger(Path(tmp) / "direkt.log", console=False)
+            log.info("ohne Collector")
+            log._writer.close()
+            assert (Path(tmp) / "direkt.log").read_text(encoding="utf-8").endswith("ohne Collector\n")
+    finally:
+        if old_env is None:
+            os.environ.pop("TOOLBOX_LOG_COLLECTOR", None)
+        else:
+            os.environ["TOOLBOX_LOG_COLLECTOR"] = old_env
+
+def main():
+    print("=" * 50)
+    print("TEST: log_collector.py")
+    print("=" * 50)
+    test_collector_many_processes()
+    print("   Collector: OK")
+    test_collector_in_same_process()
+    print("   Collector im selben Prozess: OK")
+    test_fallback_without_collector()
+    print("   Fallback ohne Collector: OK")
+    test_stalled_collector()
+    print("   Hängender Collector: OK")
+    test_invalid_address()
+    print("   Ungültige Collector-Adresse: OK")
+    print("\n✅ Alle Tests erfolgreich.")
+
+if __name__ == "__main__":
+    main()
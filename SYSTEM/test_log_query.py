@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+test_log_query.py – Testet Index, Abfragen und Rotation der Logdatei.
+
+Führe es einfach mit `python test_log_query.py` aus.
+"""
+
+import tempfile
+from pathlib import Path
+
+from json_helper import load_json
+from log_query import index_path, query, rotate, segments, update_index
+
+LEVEL_CYCLE = ["INFO", "INFO", "WARNING", "ERROR", "DEBUG"]
+
+def _write_log(path: Path, start: int, count: int):
+    """Schreibt `count` Zeilen, eine pro Sekunde ab 2026-10-18 00:00 + start Sekunden."""
+    with open(path, "a", encoding="utf-8") as f:
+        for i in range(start, start + count):
+            h, rest = divmod(i, 3600)
+            m, s = divmod(rest, 60)
+            level = LEVEL_CYCLE[i % len(LEVEL_CYCLE)]
+            f.write(f"2026-10-18 {h:02d}:{m:02d}:{s:02d} | {level.ljust(8)} | Meldung {i}\n")
+
+def test_query_and_incremental_index():
+    with tempfile.TemporaryDirectory() as tmp:
+        log_file = Path(tmp) / "app.log"
+        _write_log(log_file, 0, 20000)
+        index = update_index(log_file)
+        assert len(index["blocks"]) > 10
+
+        errors = list(query(log_file, levels=["ERROR"], since="2026-10-18 01:00:00", until="2026-10-18 01:59:59"))
+        assert len(errors) == 720 and all("| ERROR" in line for line in errors)
+
+        # Datei wächst -> Index wird fortgeschrieben, neue Zeilen werden gefunden
+        _write_log(log_file, 20000, 100)
+        hits = list(query(log_file, contains="Meldung 2009"))
+        assert [h.rsplit(" ", 1)[1] for h in hits] == ["2009", "20090", "20091", "20092", "20093",
+                                                         "20094", "20095", "20096", "20097", "20098", "20099"]
+        assert load_json(index_path(log_file))["size"] == log_file.stat().st_size
+        assert len(list(query(log_file, limit=5))) == 5
+
+def test_rotation_keeps_index():
+    with tempfile.TemporaryDirectory() as tmp:
+        log_file = Path(tmp) / "app.log"
+        for part in range(3):
+            _write_log(log_file, part * 1000, 1000)
+            assert rotate(log_file, max_bytes=1000, backups=2)
+        _write_log(log_file, 3000, 1000)
+
+        # Nur zwei Backups -> das erste Segment ist verworfen
+        assert [p.name for p in segments(log_file)] == ["app.log.2", "app.log.1", "app.log"]
+        assert all(index_path(p).exists() for p in segments(log_file)[:2])
+        lines = list(query(log_file, levels=["WARNING"]))
+        assert len(lines) == 600
+        assert lines[0].endswith("Meldung 1002") and lines[-1].endswith("Meldung 3997")
+        assert not rotate(log_file, max_bytes=10 ** 9)
+
+def test_logger_rotates():
+    """Der gepufferte Logger rotiert selbst, wenn max_bytes gesetzt ist."""
+    from logger import Logger
+    with tempfile.TemporaryDirectory() as tmp:
+        log_file = Path(tmp) / "rot.log"
+        log = Logger(log_file, console=False, use_collector=False, max_bytes=4000, backups=3)
+        for i in range(230):
+            log.info("Zeile %d", i)
+            if i % 20 == 19:
+                log.flush()
+        log.flush()
+        assert [p.name for p in segments(log_file)] == ["rot.log.2", "rot.log.1", "rot.log"]
+        hits = list(query(log_file, contains="Zeile"))
+        assert len(hits) == 230 and hits[-1].endswith("Zeile 229")
+
+def main():
+    print("=" * 50)
+    print("TEST: log_query.py")
+    print("=" * 50)
+    test_query_and_incremental_index()
+    print("   Index und Abfragen: OK")
+    test_rotation_keeps_index()
+    print("   Rotation: OK")
+    test_logger_rotates()
+    print("   Rotation im Logger: OK")
+    print("\n✅ Alle Tests erfolgreich.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+test_log_view.py – Testet Puffer und Taktung der Log-Anzeige.
+
+Führe es einfach mit `python test_log_view.py` aus.
+"""
+
+import threading
+import time
+
+from log_view import AdaptiveInterval, LogBuffer
+
+
+def test_ring_buffer_counts():
+    """Nie mehr als max_lines; jede Zeile ist angezeigt, verworfen oder entfernt."""
+    buffer = LogBuffer(max_lines=100)
+    buffer.extend(f"a{i}" for i in range(30))
+    lines, trim = buffer.take()
+    assert lines == [f"a{i}" for i in range(30)] and trim == 0
+
+    for i in range(250):                       # mehr als max_lines zwischen zwei Takten
+        buffer.append(f"b{i}")
+    lines, trim = buffer.take()
+    assert len(lines) == 100 and lines[-1] == "b249"
+    assert buffer.dropped == 150 and trim == 30 and buffer.trimmed == 30
+    assert buffer.take() == ([], 0)
+    assert "150 verworfen, 30 entfernt" in buffer.status()
+
+
+def _produce_and_take(total: int):
+    """Ein Thread erzeugt `total` Zeilen, die "Anzeige" holt sie alle 30 ms ab."""
+    buffer = LogBuffer(max_lines=5000)
+
+    def producer():
+        for i in range(total):
+            buffer.append(f"Zeile {i}")
+
+    thread = threading.Thread(target=producer)
+    start = time.perf_counter()
+    thread.start()
+    shown = ticks = 0
+    while thread.is_alive() or buffer.pending:
+        lines, _ = buffer.take()
+        assert len(lines) <= 5000
+        shown += len(lines)
+        ticks += 1
+        time.sleep(0.03)
+    elapsed = time.perf_counter() - start
+
+    assert shown + buffer.dropped == buffer.received == total
+    return total / elapsed, ticks
+
+
+def test_many_lines_per_second():
+    """Deutlich mehr als 10.000 Zeilen/s, ohne dass der Puffer wächst."""
+    rate, _ = _produce_and_take(200_000)
+    assert rate > 10_000, f"nur {rate:.0f} Zeilen/s"
+
+
+def test_adaptive_interval():
+    poll = AdaptiveInterval(min_ms=30, max_ms=250)
+    assert poll.next(500, 0.001) == 30          # Ausgabe -> schnell
+    assert poll.next(500, 0.040) == 160         # teures Zeichnen -> Luft lassen
+    for _ in range(10):
+        interval = poll.next(0, 0.0)            # Leerlauf -> selten
+    assert interval == 250
+
+
+def main():
+    print("=" * 50)
+    print("TEST: log_view.py")
+    print("=" * 50)
+    test_ring_buffer_counts()
+    print("   Ringpuffer und Zähler: OK")
+    test_many_lines_per_second()
+    rate, ticks = _produce_and_take(200_000)
+    print(f"   {rate:,.0f} Zeilen/s in {ticks} Takten: OK")
+    test_adaptive_interval()
+    print("   Adaptiver Takt: OK")
+    print("\n✅ Alle Tests erfolgreich.")
+
+
+if __name__ == "__main__":
+    main()
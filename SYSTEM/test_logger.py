@@ -1,5 +1,12 @@
 # SYSTEM/test_logger.py
-from logger import get_logger, info, warning, error
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from logger import Logger, get_logger, info, warning, error
 from file_manager import FilePaths
 
 # 1. Logger mit Datei im OUTPUT-Ordner
@@ -15,4 +22,94 @@ log.error("Fehler: Datei nicht gefunden")
 info("Diese Info kommt von der Komfort-Funktion")
 error("Und das ein Fehler")
 
-print("Logger-Test abgeschlossen. Siehe Logdatei:", FilePaths.LOGFILE)
\ No newline at end of file
+print("Logger-Test abgeschlossen. Siehe Logdatei:", FilePaths.LOGFILE)
+
+
+# 4. Gepufferter Schreiber: viele Threads, ERROR-Flush, Flush beim Beenden
+def test_buffered_threads():
+    with tempfile.TemporaryDirectory() as tmp:
+        log_file = Path(tmp) / "threads.log"
+        tlog = Logger(log_file, console=False, batch_size=10000, flush_interval=60)
+
+        def worker(n):
+            for i in range(500):
+                tlog.info(f"T{n} {i}")
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        # ERROR löst das Schreiben aus, ohne auf Größe oder Intervall zu warten
+        tlog.error("Ende")
+        for _ in range(100):
+            text = log_file.read_text(encoding="utf-8") if log_file.exists() else ""
+            if text.endswith("| Ende\n"):
+                break
+            time.sleep(0.02)
+        lines = text.splitlines()
+        assert len(lines) == 8 * 500 + 1
+        assert lines[-1].endswith("| ERROR    | Ende")
+        tlog.flush()
+
+def test_flush_at_exit():
+    with tempfile.TemporaryDirectory() as tmp:
+        log_file = Path(tmp) / "exit.log"
+        code = ("from logger import Logger; "
+                f"log = Logger({str(log_file)!r}, console=False, flush_interval=60); "
+                "[log.info(f'Zeile {i}') for i in range(1000)]")
+        subprocess.run([sys.executable, "-c", code], cwd=Path(__file__).parent, check=True)
+        assert len(log_file.read_text(encoding="utf-8").splitlines()) == 1000
+
+# 5. Verzögerte Formatierung und strukturiertes NDJSON-Log
+def test_lazy_and_ndjson():
+    import json
+    calls = []
+
+    def teuer():
+        calls.append(1)
+        return "teuer"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        jlog = Logger(Path(tmp) / "text.log", console=False, min_level="INFO",
+                      json_file=Path(tmp) / "log.ndjson")
+        jlog.debug(teuer)                         # gefiltert -> nie aufgerufen
+        jlog.debug("%s", object())
+        jlog.info(teuer)
+        jlog.info("%d Zeilen aus %s", 42, "a.csv", file="a.csv", rows=42)
+        jlog.info("%d kaputt", "x")               # Formatfehler bricht nicht ab
+        jlog.flush()
+
+        assert calls == [1]
+        records = [json.loads(line) for line in (Path(tmp) / "log.ndjson").read_text(encoding="utf-8").splitlines()]
+        assert [r["msg"] for r in records[:2]] == ["teuer", "42 Zeilen aus a.csv"]
+        assert records[1]["file"] == "a.csv" and records[1]["rows"] == 42 and records[1]["level"] == "INFO"
+        assert "Formatfehler" in records[2]["msg"]
+        text = (Path(tmp) / "text.log").read_text(encoding="utf-8").splitlines()
+        assert text[1].endswith("| 42 Zeilen aus a.csv | file=a.csv rows=42")
+
+# 6. Ein Schreiber pro Datei: abweichende Einstellungen werden gemeldet
+def test_writer_settings():
+    import contextlib
+    import io
+    with tempfile.TemporaryDirectory() as tmp:
+        log_file = Path(tmp) / "einstellungen.log"
+        first = Logger(log_file, console=False, batch_size=10)
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            same = Logger(log_file, console=False, batch_size=10)
+        assert same._writer is first._writer and stderr.getvalue() == ""
+        with contextlib.redirect_stderr(stderr):
+            other = Logger(log_file, console=False, batch_size=99, max_bytes=1000)
+        assert other._writer is first._writer and other._writer.batch_size == 10
+        assert "WARNUNG" in stderr.getvalue() and "batch_size=10" in stderr.getvalue()
+        first._writer.close()
+
+
+if __name__ == "__main__":
+    test_buffered_threads()
+    test_flush_at_exit()
+    test_lazy_and_ndjson()
+    test_writer_settings()
+    print("Gepufferter Logger-Test abgeschlossen.")
@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+test_progress.py – Testet die Fortschrittsmeldungen (Drosselung, Kanäle, Jobs).
+
+Führe es einfach mit `python test_progress.py` aus.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import progress
+from csv_importer import csv_to_json
+from job_runner import DONE, JobRunner
+from progress import MARKER, Progress, format_progress, parse_marker
+from worker_pool import WorkerPool
+
+# Meldet 20000 Zeilen in gut 0,3 s
+SCRIPT = """
+import os, sys, time
+sys.path.insert(0, os.getcwd())  # Unterprozess läuft im SYSTEM-Ordner
+from progress import Progress
+with Progress(total=20000, unit="Zeilen", label="demo", interval=0.05) as p:
+    for i in range(1, 20001):
+        p.update(i)
+        if not i % 2000:
+            time.sleep(0.03)
+print("fertig")
+"""
+
+
+def test_rate_limit_and_final():
+    """Viele update()-Aufrufe, wenige Meldungen; die letzte ist final und vollständig."""
+    records = []
+    with Progress(total=100000, unit="Zeilen", interval=0.05, channel=records.append) as p:
+        for i in range(1, 100001):
+            p.update(i)
+    assert 1 <= len(records) <= 20
+    last = records[-1]
+    assert last["final"] and last["done"] == 100000 and last["eta"] is None
+    assert not any(r["final"] for r in records[:-1])
+    assert format_progress(last).startswith("██████████ 100% 100000 Zeilen")
+
+
+def test_disabled_without_channel():
+    previous = progress.set_channel(None)
+    saved = {k: os.environ.pop(k, None) for k in (progress.PROGRESS_FD_ENV, progress.PROGRESS_ENV)}
+    try:
+        p = Progress(total=10)
+        assert not p.enabled
+        p.update(5)
+        p.finish()
+    finally:
+        progress.set_channel(previous)
+        os.environ.update({k: v for k, v in saved.items() if v is not None})
+
+
+def test_eta_from_bytes():
+    p = Progress(bytes_total=1000, channel=lambda r: None)
+    p.update(10, bytes_done=250)
+    record = p.record(p._start + 1.0)
+    assert record["eta"] == 3.0 and format_progress(record).startswith("██░░░░░░░░  25%")
+
+
+def test_fd_and_marker_channels():
+    read_fd, write_fd = os.pipe()
+    os.environ[progress.PROGRESS_FD_ENV] = str(write_fd)
+    try:
+        Progress(total=1, label="pipe").finish()
+        # Nach dem ersten Lesen nicht mehr in der Umgebung (Enkelprozesse erben sie nicht)
+        assert progress.PROGRESS_FD_ENV not in os.environ
+        Progress(total=1, label="zweiter").finish()
+    finally:
+        os.close(write_fd)
+    with os.fdopen(read_fd) as pipe:
+        assert [json.loads(line)["label"] for line in pipe] == ["pipe", "zweiter"]
+    # Geschlossen bzw. keine Pipe: keine Meldungen
+    assert not Progress(total=1).enabled
+    with tempfile.TemporaryFile() as f:
+        os.environ[progress.PROGRESS_FD_ENV] = str(f.fileno())
+        p = Progress(total=1)
+        assert not p.enabled and progress.PROGRESS_FD_ENV not in os.environ
+        p.finish()
+        assert f.tell() == 0
+    assert parse_marker(MARKER + '{"done": 3}') == {"done": 3}
+    assert parse_marker("normale Zeile") is None and parse_marker(MARKER + "kaputt") is None
+
+
+def test_csv_import_reports():
+    """csv_to_json meldet Zeilen und Bytes, zuletzt final."""
+    records = []
+    previous = progress.set_channel(records.append)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = Path(tmp) / "daten.csv"
+            csv_path.write_text("a;b\n" + "".join(f"{i};x\n" for i in range(5000)), encoding="utf-8")
+            for mode in ("full", "stream"):
+                records.clear()
+                assert csv_to_json(csv_path, Path(tmp) / f"{mode}.json", mode=mode)
+                assert records[0]["label"] == "daten.csv" and records[0]["unit"] == "Zeilen"
+                assert records[-1]["final"] and records[-1]["bytes"] == csv_path.stat().st_size
+                assert records[-1]["done"] == 5000
+    finally:
+        progress.set_channel(previous)
+
+
+def _check_job(runner_kwargs):
+    seen = []
+    with tempfile.TemporaryDirectory() as tmp:
+        script = Path(tmp) / "melden.py"
+        script.write_text(SCRIPT, encoding="utf-8")
+        lines = []
+        runner = JobRunner(on_output=lambda job, line: lines.append(line),
+                           on_progress=lambda job, record: seen.append(record), **runner_kwargs)
+        try:
+            argv = [sys.executable, "-u", str(script)]
+            job = runner.submit_command(argv, target=(str(script), []))
+            assert job.wait(60)
+        finally:
+            runner.shutdown()
+    assert job.status == DONE and lines == ["fertig"], lines  # keine Markerzeilen in der Ausgabe
+    assert 2 <= len(seen) <= 30 and seen[-1]["final"] and job.progress == seen[-1]
+    return job
+
+
+def test_job_runner_progress():
+    """Fortschritt kommt über die eigene Pipe bzw. über den Pool-Worker an."""
+    assert not _check_job({}).pooled
+    pool = WorkerPool(size=1)
+    try:
+        assert _check_job({"pool": pool}).pooled
+    finally:
+        pool.close()
+
+
+def main():
+    print("=" * 50)
+    print("TEST: progress.py")
+    print("=" * 50)
+    test_rate_limit_and_final()
+    print("   Drosselung und finale Meldung: OK")
+    test_disabled_without_channel()
+    test_eta_from_bytes()
+    test_fd_and_marker_channels()
+    print("   Kanäle (Pipe, Marker): OK")
+    test_csv_import_reports()
+    print("   csv_importer meldet Fortschritt: OK")
+    start = time.perf_counter()
+    test_job_runner_progress()
+    print(f"   JobRunner (Prozess und Pool): OK ({time.perf_counter() - start:.2f} s)")
+    print("\n✅ Alle Tests erfolgreich.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+test_schema_import.py – Testet den typisierten, spaltenweisen Import.
+
+Führe es einfach mit `python test_schema_import.py` aus.
+"""
+
+import json
+import tempfile
+from datetime import date
+from pathlib import Path
+
+from csv_importer import csv_to_json
+from schema_import import load_schema, measure_import, read_columnar, schema_path_for
+
+SCHEMA = {
+    "primary_key": "id",
+    "columns": {
+        "id": "int",
+        "klasse": "category",
+        "geburtsdatum": "date",
+        "schnitt": "float",
+        "aktiv": "bool",
+    },
+}
+
+def _write_csv(path: Path, rows: int):
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        f.write("id;name;klasse;geburtsdatum;schnitt;aktiv\n")
+        for i in range(rows):
+            schnitt = "" if i % 10 == 0 else f"{1 + i % 5},{i % 10}"
+            f.write(f"{i};Schüler {i};{5 + i % 8}a;{1 + i % 28:02d}.03.2010;{schnitt};{'ja' if i % 2 else 'nein'}\n")
+
+def test_typed_columns():
+    """Werte werden typisiert, Primärschlüssel-Zugriff funktioniert."""
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = Path(tmp) / "schueler.csv"
+        _write_csv(csv_path, 100)
+        table = read_columnar(csv_path, SCHEMA)
+
+        assert len(table) == 100
+        row = table.get(11)
+        assert row["name"] == "Schüler 11"
+        assert row["klasse"] == "8a"
+        assert row["geburtsdatum"] == date(2010, 3, 12)
+        assert row["schnitt"] == 2.1
+        assert row["aktiv"] is True
+        assert table.get(10)["schnitt"] is None
+        assert table.columns["klasse"].categories == [f"{k}a" for k in range(5, 13)]
+
+def test_sidecar_and_export():
+    """Sidecar-Schema wird gefunden; records- und columnar-Export sind gültiges JSON."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        csv_path = tmp / "schueler.csv"
+        _write_csv(csv_path, 20)
+        schema_path_for(csv_path).write_text(json.dumps(SCHEMA), encoding='utf-8')
+        schema = load_schema(csv_path)
+        assert schema == SCHEMA
+
+        assert csv_to_json(csv_path, tmp / "records.json", schema=schema)
+        records = json.loads((tmp / "records.json").read_text(encoding='utf-8'))
+        assert records[3] == {"id": 3, "name": "Schüler 3", "klasse": "8a", "geburtsdatum": "2010-03-04",
+                              "schnitt": 4.3, "aktiv": True}
+
+        assert csv_to_json(csv_path, tmp / "columnar.json", schema=schema, export="columnar")
+        columnar = json.loads((tmp / "columnar.json").read_text(encoding='utf-8'))
+        assert columnar["rows"] == 20
+        assert columnar["columns"]["id"]["values"] == list(range(20))
+
+def test_duplicate_key_fails():
+    """Doppelte Primärschlüssel lassen den Import scheitern."""
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = Path(tmp) / "doppelt.csv"
+        csv_path.write_text("id;klasse;geburtsdatum;schnitt;aktiv\n1;5a;;;\n1;5b;;;\n", encoding='utf-8')
+        assert not csv_to_json(csv_path, Path(tmp) / "out.json", schema=SCHEMA)
+
+def main():
+    print("=" * 50)
+    print("TEST: schema_import.py")
+    print("=" * 50)
+
+    test_typed_columns()
+    test_sidecar_and_export()
+    test_duplicate_key_fails()
+
+    # Speichervergleich für eine größere Datei
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = Path(tmp) / "gross.csv"
+        _write_csv(csv_path, 50000)
+        stats = measure_import(csv_path, SCHEMA)
+        print(f"\n{stats['rows']} Zeilen:")
+        print(f"   Liste von Dicts: {stats['dict_bytes'] / 2**20:6.2f} MiB, {stats['dict_seconds']:.2f} s")
+        print(f"   Spaltenweise:    {stats['columnar_bytes'] / 2**20:6.2f} MiB, {stats['columnar_seconds']:.2f} s")
+
+    print("\n✅ Alle Tests erfolgreich.")
+
+if __name__ == "__main__":
+    main()
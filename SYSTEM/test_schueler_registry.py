@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+test_schueler_registry.py – Testet den indizierten Schülerbestand.
+
+Führe es einfach mit `python test_schueler_registry.py` aus.
+"""
+
+import json
+import tempfile
+from pathlib import Path
+
+from schema_import import read_columnar, save_columnar
+from schueler_registry import Schueler, SchuelerRegistry
+
+
+def _records():
+    return [
+        {"id": 1, "nachname": "Adler", "vorname": "Anna", "klasse": "10a", "kurse": ["Ma", "Ph"]},
+        {"id": 2, "nachname": "Bär", "vorname": "Ben", "klasse": "10b", "kurse": "Ma, Ku"},
+        {"id": 3, "nachname": "Chen", "vorname": "Chris", "klasse": "11a", "jahrgang": "11",
+         "wahl2": "Ph", "wahl1": "Bio", "geburtsdatum": "2008-01-02"},
+    ]
+
+
+def test_indexes_and_find():
+    registry = SchuelerRegistry(_records())
+    assert len(registry) == 3 and 2 in registry and registry.get(99) is None
+    assert registry.get(3).kurse == ("Bio", "Ph") and registry.get(3).jahrgang == 11
+    assert registry.get(3).extra == {"geburtsdatum": "2008-01-02"}
+    assert [s.id for s in registry.by_jahrgang(10)] == [1, 2]
+    assert [s.id for s in registry.by_kurs("Ph")] == [1, 3]
+    assert [s.id for s in registry.find(jahrgang=10, kurs="Ma")] == [1, 2]
+    assert [s.id for s in registry.find(klasse="10b", kurs="Ph")] == []
+    assert registry.klassen() == ["10a", "10b", "11a"] and registry.kurse() == ["Bio", "Ku", "Ma", "Ph"]
+    try:
+        registry.add({"id": 1})
+        raise AssertionError("ValueError erwartet")
+    except ValueError:
+        pass
+
+
+def test_incremental_updates():
+    """update/remove passen nur die betroffenen Indizes an – wie ein Neuaufbau."""
+    registry = SchuelerRegistry(_records())
+    registry.update(1, klasse="11b", kurse=["Ku"])
+    registry.update(2, id=20, nachname="Baer")
+    registry.remove(3)
+    registry.add(Schueler(4, "Dorn", "Dana", "10a", kurse=("Ma", "Ma")))
+    assert registry.modified
+    assert [s.id for s in registry.by_jahrgang(11)] == [1]
+    assert [s.id for s in registry.by_kurs("Ku")] == [1, 20]
+    assert registry.by_kurs("Ph") == [] and "Ph" not in registry.kurse()
+    assert registry.get(20).nachname == "Baer" and 2 not in registry
+    assert [s.id for s in registry.by_kurs("Ma")] == [20, 4]
+
+    rebuilt = SchuelerRegistry(record.to_dict() for record in registry)
+    for field in ("klasse", "jahrgang", "kurse"):
+        assert rebuilt.count_by(field) == registry.count_by(field)
+
+
+def test_persistence():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "schueler_master_liste.json"
+        assert len(SchuelerRegistry.load(path)) == 0        # fehlende Datei = leer
+        registry = SchuelerRegistry(_records())
+        assert registry.save(path, compact=True) and not registry.modified
+        loaded = SchuelerRegistry.load(path)
+        assert list(loaded) == list(registry)
+        assert json.loads(path.read_text(encoding="utf-8"))[2]["geburtsdatum"] == "2008-01-02"
+
+        # Spaltenform aus schema_import
+        csv_path = Path(tmp) / "schueler.csv"
+        csv_path.write_text("id;nachname;klasse;wahl1;wahl2\n1;A;5a;Ma;\n2;B;5b;Ku;Ma\n", encoding="utf-8")
+        table = read_columnar(csv_path, {"primary_key": "id", "columns": {"id": "int", "klasse": "category"}})
+        save_columnar(table, Path(tmp) / "spalten.json")
+        columnar = SchuelerRegistry.load(Path(tmp) / "spalten.json")
+        assert [s.kurse for s in columnar] == [("Ma",), ("Ku", "Ma")]
+        assert columnar.get(2).jahrgang == 5
+
+        path.write_text("{kaputt", encoding="utf-8")
+        try:
+            SchuelerRegistry.load(path)
+            raise AssertionError("ValueError erwartet")
+        except ValueError:
+            pass
+
+
+def main():
+    print("=" * 50)
+    print("TEST: schueler_registry.py")
+    print("=" * 50)
+    test_indexes_and_find()
+    print("   Indizes und Abfragen: OK")
+    test_incremental_updates()
+    print("   Schrittweise Änderungen: OK")
+    test_persistence()
+    print("   Laden/Speichern (auch Spaltenform): OK")
+    print("\n✅ Alle Tests erfolgreich.")
+
+
+if __name__ == "__main__":
+    main()
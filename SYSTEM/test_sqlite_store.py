@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+test_sqlite_store.py – Testet den SQLite-Speicher und den CSV-Import in die Datenbank.
+
+Führe es einfach mit `python test_sqlite_store.py` aus.
+"""
+
+import json
+import sqlite3
+import tempfile
+from pathlib import Path
+
+from csv_importer import csv_to_sqlite
+from json_helper import load_json, save_json
+from sqlite_store import SqliteStore
+
+RECORDS = [{"id": str(i), "name": f"Schüler {i}", "klasse": f"{5 + i % 3}a", "jahrgang": 5 + i % 3,
+            "kurse": ["Ma", "Ph"] if i % 2 else ["De"]} for i in range(30)]
+
+
+def test_lookup_query_upsert():
+    with SqliteStore(":memory:") as store:
+        assert store.bulk_load("schueler", RECORDS, key="id", indexes=["klasse"]) == 30
+        assert store.get("schueler", "7") == RECORDS[7] and store.get("schueler", "99") is None
+        assert store.query("schueler", klasse="6a") == [r for r in RECORDS if r["klasse"] == "6a"]
+        assert "ix_schueler_klasse" in store.explain("schueler", klasse="6a")
+        # Feld ohne Index (json_extract), Liste = einer der Werte
+        assert store.count("schueler", jahrgang=[5, 7]) == 20
+        assert [r["id"] for r in store.query("schueler", order_by="name", limit=2, jahrgang=5)] == ["0", "12"]
+
+        store.upsert("schueler", dict(RECORDS[7], klasse="9z"))
+        store.upsert("schueler", {"id": "100", "name": "Neu", "klasse": "9z"})
+        assert store.update("schueler", "100", jahrgang=9) and not store.update("schueler", "x", a=1)
+        assert [r["id"] for r in store.query("schueler", klasse="9z")] == ["7", "100"]
+        assert store.get("schueler", "100")["jahrgang"] == 9
+        assert store.delete("schueler", "7") and not store.delete("schueler", "7")
+
+        store.add_index("schueler", "jahrgang")
+        assert "ix_schueler_jahrgang" in store.explain("schueler", jahrgang=9)
+        assert store.count("schueler", jahrgang=9) == 1
+        assert store.tables()["schueler"] == {"key": "id", "indexes": ["klasse", "jahrgang"]}
+
+
+def test_transactions_and_errors():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Path(tmp) / "daten" / "toolbox.sqlite3"
+        with SqliteStore(db) as store:
+            store.bulk_load("schueler", RECORDS, key="id", indexes=["klasse"])
+            # Fehler mitten im Massenimport: alte Tabelle bleibt vollständig erhalten
+            try:
+                store.bulk_load("schueler", RECORDS[:5] + [{"name": "ohne id"}], key="id")
+            except ValueError:
+                pass
+            else:
+                raise AssertionError("ValueError erwartet")
+            assert store.count("schueler") == 30
+            try:
+                store.insert_many("schueler", [{"id": "1"}])
+            except sqlite3.IntegrityError:
+                pass
+            else:
+                raise AssertionError("IntegrityError erwartet")
+        # Neu geöffnet: Tabellen und Indexspalten aus der Verwaltungstabelle
+        with SqliteStore(db) as store:
+            assert store.tables() == {"schueler": {"key": "id", "indexes": ["klasse"]}}
+            assert store.get("schueler", "3") == RECORDS[3]
+
+        broken = Path(tmp) / "kaputt.sqlite3"
+        broken.write_bytes(b"keine Datenbank" * 100)
+        try:
+            SqliteStore(broken)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("ValueError erwartet")
+
+
+def test_journal_mode():
+    with tempfile.TemporaryDirectory() as tmp:
+        # Standard DELETE (Netzlaufwerke), WAL nur auf Wunsch
+        with SqliteStore(Path(tmp) / "a.sqlite3") as store:
+            assert store.conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+        with SqliteStore(Path(tmp) / "b.sqlite3", journal_mode="wal") as store:
+            assert store.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        try:
+            SqliteStore(Path(tmp) / "c.sqlite3", journal_mode="MEMORY")
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("ValueError erwartet")
+
+
+def test_json_roundtrip_and_csv_import():
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        save_json(tmp / "master.json", RECORDS)
+        with SqliteStore(tmp / "db.sqlite3") as store:
+            assert store.import_json("schueler", tmp / "master.json", key="id", indexes=["klasse"]) == 30
+            assert store.export_json("schueler", tmp / "export.json")
+            assert store.export_json("schueler", tmp / "export.ndjson", ndjson=True)
+        assert load_json(tmp / "export.json") == RECORDS
+        lines = (tmp / "export.ndjson").read_text(encoding="utf-8").splitlines()
+        assert [json.loads(line) for line in lines] == RECORDS
+
+        csv_path = tmp / "schule_a.csv"
+        with open(csv_path, "w", encoding="utf-8", newline="") as f:
+            f.write("id;name;klasse\n" + "".join(f"{i};Schüler {i};{5 + i % 3}b\n" for i in range(500)))
+        assert csv_to_sqlite(csv_path, tmp / "db.sqlite3", key="id", indexes=["klasse"])
+        assert not csv_to_sqlite(tmp / "fehlt.csv", tmp / "db.sqlite3")
+        with SqliteStore(tmp / "db.sqlite3") as store:
+            assert set(store.tables()) == {"schueler", "schule_a"}
+            assert store.get("schule_a", "42") == {"id": "42", "name": "Schüler 42", "klasse": "5b"}
+            assert store.count("schule_a", klasse="7b") == 166
+
+
+def main():
+    print("=" * 50)
+    print("TEST: sqlite_store.py")
+    print("=" * 50)
+    test_lookup_query_upsert()
+    print("   Punktabfragen, Filter, Upserts, Indizes: OK")
+    test_transactions_and_errors()
+    print("   Transaktionen und Fehler: OK")
+    test_journal_mode()
+    print("   Journal-Modus: OK")
+    test_json_roundtrip_and_csv_import()
+    print("   JSON-Export/-Import und CSV-Import: OK")
+    print("\n✅ Alle Tests erfolgreich.")
+
+
+if __name__ == "__main__":
+    main()
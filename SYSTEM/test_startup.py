@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+test_startup.py – Prüft, dass die SYSTEM-Module schnell und ohne Nebenwirkungen importieren.
+
+Gemessen wird mit `python -X importtime` in einem frischen Interpreter
+(bester von drei Läufen). Das Budget je Modul lässt sich über die
+Umgebungsvariable TOOLBOX_IMPORT_BUDGET_MS anpassen (z.B. auf langsamen
+Rechnern).
+
+Führe es einfach mit `python test_startup.py` aus.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SYSTEM_DIR = Path(__file__).parent
+
+# Module, die CLI-Werkzeuge und Dashboard beim Start laden
+MODULES = ["file_manager", "json_helper", "logger", "config_helper", "import_manifest",
+           "schema_import", "csv_importer", "log_query", "log_collector", "log_view", "job_runner",
+           "worker_pool", "progress", "schueler_registry", "kursplanung",
+           "clash_matrix", "dedup", "import_delta",
+           "sqlite_store", "bulk_loader"]
+
+# Pakete, die erst bei Bedarf geladen werden dürfen (log_collector braucht socket selbst)
+LAZY = ["concurrent.futures", "multiprocessing", "tracemalloc", "socket", "gzip", "lzma", "secrets"]
+
+BUDGET_MS = float(os.environ.get("TOOLBOX_IMPORT_BUDGET_MS", 150))
+
+
+def _python(code: str, *flags: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *flags, "-c", code], cwd=SYSTEM_DIR,
+                          capture_output=True, text=True)
+
+
+def import_time_ms(module: str, runs: int = 3) -> float:
+    """Kumulierte Importzeit eines Moduls in ms laut -X importtime (bester Lauf)."""
+    best = None
+    for _ in range(runs):
+        result = _python(f"import {module}", "-X", "importtime")
+        assert result.returncode == 0, result.stderr
+        for line in result.stderr.splitlines():
+            parts = [p.strip() for p in line.split("|")]
+            if len(parts) == 3 and parts[2] == module:
+                micros = int(parts[1])
+        best = micros if best is None else min(best, micros)
+    return best / 1000
+
+
+def test_import_without_side_effects():
+    """Der Import legt keine Ordner an."""
+    code = ("import os, pathlib\n"
+            "def verboten(*a, **k): raise AssertionError('mkdir beim Import')\n"
+            "pathlib.Path.mkdir = os.mkdir = os.makedirs = verboten\n"
+            + "".join(f"import {m}\n" for m in MODULES))
+    result = _python(code)
+    assert result.returncode == 0, result.stderr
+
+
+def test_heavy_modules_lazy():
+    """Schwere Abhängigkeiten werden erst bei Bedarf importiert."""
+    code = ("import sys\n" + "".join(f"import {m}\n" for m in MODULES if m != "log_collector")
+            + f"print(','.join(m for m in {LAZY!r} if m in sys.modules))")
+    result = _python(code)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "", f"Beim Start geladen: {result.stdout.strip()}"
+
+
+def test_import_time_budget():
+    """Jedes Modul importiert innerhalb des Budgets."""
+    slow = {m: ms for m in MODULES if (ms := import_time_ms(m)) > BUDGET_MS}
+    assert not slow, f"Über dem Budget von {BUDGET_MS:.0f} ms: {slow}"
+
+
+def main():
+    print("=" * 50)
+    print("TEST: Start-/Importzeit")
+    print("=" * 50)
+    test_import_without_side_effects()
+    print("   Keine Nebenwirkungen beim Import: OK")
+    test_heavy_modules_lazy()
+    print("   Schwere Module erst bei Bedarf: OK")
+    for module in MODULES:
+        print(f"   {module:<16} {import_time_ms(module):7.1f} ms")
+    test_import_time_budget()
+    print(f"   Budget {BUDGET_MS:.0f} ms je Modul: OK")
+    print("\n✅ Alle Tests erfolgreich.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+test_worker_pool.py – Testet den Pool vorgewärmter Worker und den Rückfall im JobRunner.
+
+Führe es einfach mit `python test_worker_pool.py` aus.
+"""
+
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from job_runner import CANCELLED, FAILED, TIMEOUT, JobRunner
+from worker_pool import WorkerPool, WorkerStopped, WorkerUnavailable
+
+SCRIPT = """
+import os, sys
+from logger import Logger
+print("argv", sys.argv[1:])
+Logger(console=True).info("aus dem Logger")
+print("pid", os.getpid())
+if "--fehler" in sys.argv:
+    raise ValueError("kaputt")
+sys.exit(int(sys.argv[1]) if sys.argv[1:] and sys.argv[1].isdigit() else 0)
+"""
+
+
+def _script(tmp: str) -> str:
+    path = Path(tmp) / "skript.py"
+    path.write_text(SCRIPT, encoding="utf-8")
+    return str(path)
+
+
+def _run(pool, target, *args, **kwargs):
+    lines = []
+    code, peak = pool.run(target, args, on_output=lambda line, stream: lines.append(line), **kwargs)
+    return code, lines
+
+
+def test_reuse_and_output():
+    """Mehrere Aufträge im selben warmen Worker; Ausgabe, Logger und Exitcodes kommen an."""
+    pool = WorkerPool(size=1)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            script = _script(tmp)
+            code, lines = _run(pool, script, "a", "b")
+            assert code == 0 and lines[0] == "argv ['a', 'b']"
+            assert any(line.endswith("| INFO     | aus dem Logger") for line in lines)
+            pid = lines[-1]
+            code, lines = _run(pool, script, "3")
+            assert code == 3 and lines[-1] == pid         # gleicher Prozess
+            code, lines = _run(pool, script, "--fehler")
+            assert code == 1 and "ValueError: kaputt" in lines[-1]
+            code, lines = _run(pool, "import_manifest:file_digest", script)
+            assert code == 0 and pool.started == 1
+    finally:
+        pool.close()
+
+
+def test_recycling():
+    """Nach max_jobs Aufträgen wird der Worker ersetzt."""
+    pool = WorkerPool(size=1, max_jobs=2)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            script = _script(tmp)
+            pids = [_run(pool, script)[1][-1] for _ in range(4)]
+        assert pids[0] == pids[1] != pids[2] == pids[3]
+        assert pool.recycled == 2 and pool.started == 2
+    finally:
+        pool.close()
+
+
+def test_config_changes_between_jobs():
+    """Eine geänderte settings.json gilt schon im nächsten Auftrag desselben Workers."""
+    pool = WorkerPool(size=1)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            settings = Path(tmp) / "settings.json"
+            script = Path(tmp) / "wert.py"
+            script.write_text("import os, sys\nfrom config_helper import Config\n"
+                              "print('wert =', Config.shared(sys.argv[1]).get('wert'))\n"
+                              "print('pid', os.getpid())\n", encoding="utf-8")
+            settings.write_text('{"wert": 1}', encoding="utf-8")
+            code, first = _run(pool, str(script), str(settings))
+            settings.write_text('{"wert": 2}', encoding="utf-8")
+            code, second = _run(pool, str(script), str(settings))
+            assert first[0] == "wert = 1" and second[0] == "wert = 2"
+            assert first[-1] == second[-1]                     # gleicher Worker
+    finally:
+        pool.close()
+
+
+def _sleeper(tmp: str) -> str:
+    path = Path(tmp) / "schlafen.py"
+    path.write_text("import time\nprint('schlafe', flush=True)\ntime.sleep(30)\n", encoding="utf-8")
+    return str(path)
+
+
+def test_timeout_kills_worker():
+    """Zeitlimit beendet den Worker; der nächste Auftrag bekommt einen neuen."""
+    pool = WorkerPool(size=1)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            start = time.perf_counter()
+            try:
+                pool.run(_sleeper(tmp), timeout=0.5)
+                raise AssertionError("WorkerStopped erwartet")
+            except WorkerStopped:
+                pass
+            assert time.perf_counter() - start < 10
+            code, lines = _run(pool, _script(tmp))
+            assert code == 0 and pool.started == 2
+    finally:
+        pool.close()
+    try:
+        pool.run("time:time")
+        raise AssertionError("WorkerUnavailable erwartet")
+    except WorkerUnavailable:
+        pass
+
+
+def test_stop_while_printing():
+    """Auch ein Auftrag, der ohne Pause ausgibt, wird nach Zeitlimit bzw. Abbruch beendet."""
+    pool = WorkerPool(size=1)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "schwaetzer.py"
+            path.write_text("while True:\n    print('x' * 40)\n", encoding="utf-8")
+            for kwargs in ({"timeout": 0.5}, {"should_stop": lambda: time.perf_counter() > start + 0.5}):
+                start = time.perf_counter()
+                try:
+                    pool.run(str(path), on_output=lambda line, stream: None, **kwargs)
+                    raise AssertionError("WorkerStopped erwartet")
+                except WorkerStopped:
+                    pass
+                assert time.perf_counter() - start < 5
+    finally:
+        pool.close()
+
+
+def test_job_runner_with_pool():
+    """JobRunner nutzt den Pool für Skripte und fällt ohne Worker auf Unterprozesse zurück."""
+    lines = []
+    pool = WorkerPool(size=2)
+    runner = JobRunner(max_workers=2, pool=pool, on_output=lambda job, line: lines.append(line))
+    try:
+        ok = runner.submit("job_runner.py", [])              # Verwendungshinweis, Exitcode 2
+        assert ok.wait(60)
+        assert ok.pooled and ok.status == FAILED and ok.exit_code == 2
+        assert any(line.startswith("Verwendung") for line in lines)
+
+        usage = runner.submit("worker_pool.py", [], timeout=60)
+        assert usage.wait(60) and usage.pooled and usage.exit_code == 2
+
+        pool.close()                                          # kein Worker mehr -> Unterprozess
+        fallback = runner.submit("job_runner.py", [])
+        assert fallback.wait(60)
+        assert not fallback.pooled and fallback.exit_code == 2
+    finally:
+        runner.shutdown()
+        pool.close()
+
+
+def test_job_runner_cancel_pooled():
+    """Abbruch und Zeitlimit funktionieren auch für Jobs im Pool."""
+    pool = WorkerPool(size=2)
+    runner = JobRunner(max_workers=2, pool=pool)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            sleeper = _sleeper(tmp)
+            argv = [sys.executable, sleeper]
+            cancelled = runner.submit_command(argv, target=(sleeper, []))
+            limited = runner.submit_command(argv, target=(sleeper, []), timeout=0.5)
+            while cancelled.started is None:
+                time.sleep(0.01)
+            runner.cancel(cancelled.id)
+            assert runner.wait(30)
+            assert cancelled.pooled and cancelled.status == CANCELLED
+            assert limited.pooled and limited.status == TIMEOUT
+    finally:
+        runner.shutdown()
+        pool.close()
+
+
+def measure_speedup(runs: int = 5) -> tuple:
+    """Durchschnittliche Zeit je Lauf: neuer Interpreter vs. warmer Worker (Sekunden)."""
+    with tempfile.TemporaryDirectory() as tmp:
+        script = _script(tmp)
+        start = time.perf_counter()
+        for _ in range(runs):
+            subprocess.run([sys.executable, script], cwd=Path(__file__).parent, capture_output=True)
+        cold = (time.perf_counter() - start) / runs
+        pool = WorkerPool(size=1)
+        try:
+            _run(pool, script)                               # Worker starten
+            start = time.perf_counter()
+            for _ in range(runs):
+                _run(pool, script)
+            warm = (time.perf_counter() - start) / runs
+        finally:
+            pool.close()
+    return cold, warm
+
+
+def main():
+    print("=" * 50)
+    print("TEST: worker_pool.py")
+    print("=" * 50)
+    test_reuse_and_output()
+    print("   Warmer Worker, Ausgabe, Exitcodes: OK")
+    test_recycling()
+    print("   Ersetzen nach max_jobs: OK")
+    test_config_changes_between_jobs()
+    print("   Geänderte settings.json zwischen Aufträgen: OK")
+    test_timeout_kills_worker()
+    print("   Zeitlimit: OK")
+    test_stop_while_printing()
+    print("   Zeitlimit und Abbruch bei Dauerausgabe: OK")
+    test_job_runner_with_pool()
+    print("   JobRunner mit Pool und Rückfall: OK")
+    test_job_runner_cancel_pooled()
+    print("   JobRunner-Zeitlimit im Pool: OK")
+    cold, warm = measure_speedup()
+    print(f"   Neuer Interpreter {cold * 1000:.0f} ms, warmer Worker {warm * 1000:.1f} ms je Lauf")
+    print("\n✅ Alle Tests erfolgreich.")
+
+
+if __name__ == "__main__":
+    main()
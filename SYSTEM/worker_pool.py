@@ -0,0 +1,415 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+worker_pool.py – Vorgewärmte Worker-Prozesse für kurze Skripte und Funktionen.
+
+Jeder neue Python-Prozess kostet den Interpreterstart und den Import der
+SYSTEM-Module – bei kurzen Werkzeugen der größte Teil der Laufzeit. Der
+Pool hält deshalb einige Worker-Prozesse bereit, in denen die Module schon
+importiert sind, und schickt ihnen Aufträge:
+
+    - ein Skript (Pfad + Argumente), ausgeführt mit runpy als __main__
+    - oder eine Funktion "modul:funktion" mit Argumenten
+
+Ausgaben auf sys.stdout/sys.stderr (auch die Konsolenausgabe des Loggers)
+werden zeilenweise an den Aufrufer zurückgeschickt, Fortschrittsmeldungen
+(progress) als eigene Nachrichten. Ein Worker wird nach
+max_jobs Aufträgen oder oberhalb von max_memory Bytes ersetzt; bei Abbruch
+oder Zeitüberschreitung wird er beendet und ebenfalls ersetzt.
+
+Grenzen: Ausgaben, die direkt auf den Dateideskriptor gehen (Unterprozesse,
+C-Erweiterungen), kommen nicht an; Zustand auf Modulebene bleibt zwischen
+Aufträgen erhalten – nur die gemeinsamen Config-Instanzen und der
+load_json-Cache werden vor jedem Auftrag verworfen. Wo das stört, ist der
+isolierte Unterprozess (job_runner) der richtige Weg.
+
+Verwendung:
+    pool = WorkerPool(size=2)
+    code, peak = pool.run("csv_importer.py", ["--input", "a.csv"], on_output=print)
+    code, peak = pool.run("csv_importer:main")
+    pool.close()
+"""
+
+import atexit
+import importlib
+import os
+import runpy
+import sys
+import threading
+import time
+import traceback
+from pathlib import Path
+from typing import Callable, Optional, Sequence, Tuple
+
+from file_manager import FilePaths
+
+# Module, die jeder Worker beim Start importiert
+WARM_MODULES = ("file_manager", "json_helper", "logger", "config_helper", "import_manifest",
+                "schema_import", "csv_importer", "log_query")
+
+DEFAULT_MAX_JOBS = 50
+DEFAULT_MAX_MEMORY = 512 * 1024 * 1024
+# Sekunden, die ein Worker zum Starten haben darf
+_START_TIMEOUT = 30.0
+# Abfrageintervall für Abbruch und Zeitlimit
+_POLL = 0.1
+
+
+class WorkerUnavailable(RuntimeError):
+    """Es konnte kein Worker gestartet werden – der Aufrufer nimmt den Unterprozess."""
+
+
+class WorkerStopped(RuntimeError):
+    """Der Auftrag wurde abgebrochen oder hat das Zeitlimit überschritten."""
+
+
+# ----------------------------------------------------------------------
+# Seite des Worker-Prozesses
+# ----------------------------------------------------------------------
+class _PipeWriter:
+    """Ersetzt sys.stdout/sys.stderr im Worker und schickt ganze Zeilen an den Pool."""
+
+    def __init__(self, conn, stream: str):
+        self.conn = conn
+        self.stream = stream
+        self.partial = ""
+        self.encoding = "utf-8"
+
+    def write(self, text: str) -> int:
+        lines = (self.partial + text).split("\n")
+        self.partial = lines.pop()
+        if lines:
+            self.conn.send(("out", self.stream, lines))  # ein Paket pro write
+        return len(text)
+
+    def flush(self):
+        if self.partial:
+            self.conn.send(("out", self.stream, [self.partial]))
+            self.partial = ""
+
+    def isatty(self) -> bool:
+        return False
+
+
+def _current_rss() -> int:
+    """Aktueller Speicher des Prozesses in Bytes (0 = unbekannt)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except Exception:
+        return 0
+
+
+def _peak_rss() -> Optional[int]:
+    """Bisheriger Höchststand des Worker-Prozesses (ru_maxrss) in Bytes."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _reset_job_state():
+    """
+    Verwirft Zwischenspeicher, die ein Auftrag sonst vom vorherigen erbt.
+
+    Sonst sähe z.B. der zweite Auftrag noch die settings.json, die der erste
+    über Config.shared() gelesen hat, obwohl sie inzwischen geändert wurde.
+    """
+    config_helper = sys.modules.get("config_helper")
+    if config_helper is not None:
+        config_helper.Config.reset_shared()
+    json_helper = sys.modules.get("json_helper")
+    if json_helper is not None:
+        json_helper.clear_cache()
+
+
+def _execute(target: str, args: Sequence[str]) -> int:
+    """Führt einen Auftrag aus und liefert den Exitcode."""
+    saved_argv, saved_path, saved_cwd = sys.argv[:], sys.path[:], os.getcwd()
+    try:
+        _reset_job_state()
+        if target.endswith(".py"):
+            path = Path(target)
+            if not path.is_absolute():
+                path = FilePaths.SYSTEM_DIR / path
+            sys.argv = [str(path), *args]
+            runpy.run_path(str(path), run_name="__main__")
+            return 0
+        module, _, func = target.partition(":")
+        result = getattr(importlib.import_module(module), func or "main")(*args)
+        return result if isinstance(result, int) else 0
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            return e.code or 0
+        print(e.code, file=sys.stderr)
+        return 1
+    except BaseException:
+        traceback.print_exc()
+        return 1
+    finally:
+        sys.argv, sys.path[:] = saved_argv, saved_path
+        os.chdir(saved_cwd)
+
+
+def _worker_main(conn, preload: Sequence[str]):
+    """Hauptschleife eines Worker-Prozesses."""
+    os.chdir(FilePaths.SYSTEM_DIR)
+    for name in preload:
+        try:
+            importlib.import_module(name)
+        except Exception:
+            pass  # fehlendes Modul -> wird beim Auftrag gemeldet
+    stdout, stderr = _PipeWriter(conn, "stdout"), _PipeWriter(conn, "stderr")
+    import progress
+    progress.set_channel(lambda record: conn.send(("progress", record)))
+    conn.send(("ready", os.getpid()))
+
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            break
+        if message is None:
+            break
+        _, target, args = message
+        sys.stdout, sys.stderr = stdout, stderr
+        try:
+            code = _execute(target, args)
+        finally:
+            # Gepufferte Logzeilen gehören noch zu diesem Auftrag
+            logger = sys.modules.get("logger")
+            if logger is not None:
+                logger.flush_all()
+            stdout.flush()
+            stderr.flush()
+            sys.stdout, sys.stderr = sys.__stdout__, sys.__stderr__
+        conn.send(("done", code, _current_rss(), _peak_rss()))
+
+
+# ----------------------------------------------------------------------
+# Seite des Pools
+# ----------------------------------------------------------------------
+class _Worker:
+    """Ein Worker-Prozess mit seiner Verbindung."""
+
+    def __init__(self, context, preload: Sequence[str]):
+        self.conn, child = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child, tuple(preload)),
+                                       name="ToolboxWorker")
+        self.process.start()
+        child.close()
+        self.jobs = 0
+        if not self.conn.poll(_START_TIMEOUT):
+            self.kill()
+            raise WorkerUnavailable("Worker startet nicht")
+        try:
+            kind, self.pid = self.conn.recv()
+        except (EOFError, OSError) as e:
+            self.kill()
+            raise WorkerUnavailable(f"Worker beim Start beendet: {e}")
+
+    def alive(self) -> bool:
+        return self.process.is_alive()
+
+    def close(self):
+        """Regulär beenden (nach dem laufenden Auftrag)."""
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.kill()
+        self.conn.close()
+
+    def kill(self):
+        self.process.terminate()
+        self.process.join(timeout=3)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+
+
+class WorkerPool:
+    """
+    Pool vorgewärmter Worker-Prozesse.
+
+    Args:
+        size: Höchstzahl gleichzeitiger Worker
+        max_jobs: Worker nach so vielen Aufträgen ersetzen
+        max_memory: Worker ersetzen, wenn sein Speicher danach darüber liegt (Bytes)
+        preload: Module, die jeder Worker beim Start importiert
+        start: Worker sofort im Hintergrund starten (sonst beim ersten Auftrag)
+    """
+
+    def __init__(self, size: int = 2, max_jobs: int = DEFAULT_MAX_JOBS,
+                 max_memory: int = DEFAULT_MAX_MEMORY, preload: Sequence[str] = WARM_MODULES,
+                 start: bool = False):
+        self.size = max(1, int(size))
+        self.max_jobs = max_jobs
+        self.max_memory = max_memory
+        self.preload = tuple(preload)
+        # spawn: sicher auch mit Threads und Tk im Elternprozess.
+        # multiprocessing erst hier importieren (job_runner importiert dieses Modul immer).
+        import multiprocessing
+        self._context = multiprocessing.get_context("spawn")
+        self._idle = []
+        self._count = 0
+        self._cond = threading.Condition()
+        self._closed = False
+        self.started = 0      # gestartete Worker (für Statistik/Tests)
+        self.recycled = 0     # ersetzte Worker
+        atexit.register(self.close)
+        if start:
+            self.warm_up()
+
+    def warm_up(self):
+        """Startet alle Worker im Hintergrund vor (blockiert nicht)."""
+        threading.Thread(target=self._warm_up, name="WorkerPoolStart", daemon=True).start()
+
+    def _warm_up(self):
+        try:
+            workers = [self._acquire() for _ in range(self.size)]
+        except WorkerUnavailable:
+            return
+        for worker in workers:
+            self._release(worker)
+
+    def _acquire(self) -> _Worker:
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise WorkerUnavailable("Pool ist geschlossen")
+                while self._idle:
+                    worker = self._idle.pop()
+                    if worker.alive():
+                        return worker
+                    self._count -= 1
+                if self._count < self.size:
+                    self._count += 1
+                    break
+                self._cond.wait()
+        try:
+            worker = _Worker(self._context, self.preload)
+        except BaseException:
+            with self._cond:
+                self._count -= 1
+                self._cond.notify()
+            raise
+        self.started += 1
+        return worker
+
+    def _release(self, worker: Optional[_Worker], replace: bool = False):
+        """Gibt einen Worker zurück oder ersetzt ihn (beendet ihn)."""
+        if worker is not None and replace:
+            self.recycled += 1
+            threading.Thread(target=worker.close, daemon=True).start()
+        with self._cond:
+            if worker is not None and not replace and not self._closed:
+                self._idle.append(worker)
+            else:
+                self._count -= 1
+            self._cond.notify()
+        if worker is not None and not replace and self._closed:
+            worker.close()
+
+    def run(self, target: str, args: Sequence[str] = (),
+            on_output: Optional[Callable[[str, str], None]] = None,
+            timeout: Optional[float] = None,
+            should_stop: Optional[Callable[[], bool]] = None,
+            on_progress: Optional[Callable[[dict], None]] = None) -> Tuple[int, Optional[int]]:
+        """
+        Führt einen Auftrag in einem Worker aus (blockiert bis zum Ende).
+
+        Args:
+            target: Skript (".py", relativ zu SYSTEM oder absolut) oder "modul:funktion"
+            args: Argumente (sys.argv[1:] bzw. Funktionsargumente)
+            on_output: Rückruf (zeile, "stdout"/"stderr") je Ausgabezeile
+            timeout: Zeitlimit in Sekunden
+            should_stop: Wird regelmäßig gefragt; True bricht den Auftrag ab
+            on_progress: Rückruf (datensatz) je Fortschrittsmeldung (siehe progress)
+
+        Returns:
+            (exitcode, peak_rss des Workers in Bytes oder None)
+
+        Raises:
+            WorkerUnavailable: Kein Worker startbar (Aufrufer nimmt den Unterprozess)
+            WorkerStopped: Abgebrochen oder Zeitlimit überschritten
+        """
+        worker = self._acquire()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            worker.conn.send(("run", target, [str(a) for a in args]))
+            while True:
+                # Bei jeder Nachricht prüfen, nicht nur im Leerlauf – ein Auftrag, der
+                # ununterbrochen ausgibt, muss ebenfalls abbrechbar sein
+                expired = deadline is not None and time.monotonic() > deadline
+                if expired or (should_stop is not None and should_stop()):
+                    worker.kill()
+                    raise WorkerStopped("Zeitlimit überschritten" if expired else "abgebrochen")
+                if not worker.conn.poll(_POLL):
+                    if not worker.alive():
+                        raise EOFError
+                    continue
+                message = worker.conn.recv()
+                if message[0] == "out":
+                    if on_output is not None:
+                        for line in message[2]:
+                            on_output(line, message[1])
+                    continue
+                if message[0] == "progress":
+                    if on_progress is not None:
+                        on_progress(message[1])
+                    continue
+                _, code, rss, peak = message
+                break
+        except (EOFError, OSError):
+            # Worker während des Auftrags gestorben (z.B. os._exit, Absturz)
+            worker.kill()
+            self._release(worker, replace=True)
+            code = worker.process.exitcode
+            return (code if code is not None else 1), None
+        except BaseException:
+            self._release(worker, replace=True)
+            raise
+
+        worker.jobs += 1
+        replace = worker.jobs >= self.max_jobs or (self.max_memory and rss > self.max_memory)
+        self._release(worker, replace=bool(replace))
+        return code, peak
+
+    def close(self):
+        """Beendet alle Worker."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for worker in idle:
+            worker.close()
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Verwendung: python worker_pool.py SKRIPT|MODUL:FUNKTION [ARGUMENTE ...]")
+        sys.exit(2)
+    pool = WorkerPool(size=1)
+    start = time.perf_counter()
+    code, peak = pool.run(sys.argv[1], sys.argv[2:], on_output=lambda line, stream: print(line))
+    cold = time.perf_counter() - start
+    start = time.perf_counter()
+    pool.run(sys.argv[1], sys.argv[2:])
+    warm = time.perf_counter() - start
+    print(f"Exitcode {code}; erster Lauf {cold:.2f} s (Worker-Start), warmer Lauf {warm:.3f} s")
+    pool.close()
+    sys.exit(code)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,14 +3,15 @@
 """
 dashboard.py ? Minimales Dashboard fur das Projekt.
 Steht im Hauptverzeichnis, importiert Module aus dem SYSTEM-Ordner.
-Erweiterung: Kann Skripte aus dem SYSTEM-Ordner starten und Ausgabe anzeigen.
+Erweiterung: Kann Skripte aus dem SYSTEM-Ordner als Jobs starten (begrenzte
+Parallelitat, Abbruch, Zeitlimit) und ihre Ausgabe anzeigen.
 """
 
 import tkinter as tk
-from tkinter import scrolledtext
+from tkinter import scrolledtext, ttk
+import shlex
 import sys
-import subprocess
-import threading
+import time
 import queue
 from pathlib import Path
 
@@ -19,7 +20,12 @@ SYSTEM_DIR = Path(__file__).parent / "SYSTEM"
 sys.path.insert(0, str(SYSTEM_DIR))
 
 # Jetzt konnen die Module importiert werden
+from config_helper import Config
 from file_manager import FilePaths
+from job_runner import DEFAULT_MAX_WORKERS, FINISHED, JobRunner, format_bytes
+from worker_pool import DEFAULT_MAX_JOBS, DEFAULT_MAX_MEMORY, WorkerPool
+from log_view import DEFAULT_MAX_LINES, AdaptiveInterval, LogBuffer
+from progress import format_progress
 from logger import Logger
 
 # Logger initialisieren
@@ -29,7 +35,12 @@ class Dashboard:
     def __init__(self, root):
         self.root = root
         self.root.title("Projekt-Dashboard (Hauptverzeichnis)")
-        self.root.geometry("700x600")
+        # Einstellungen: eigene Instanz, Änderungen verzögert speichern
+        # (Fenstergröße ändert sich beim Ziehen sehr oft). Nicht Config.shared():
+        # das verzögerte Speichern soll nicht für alle anderen Aufrufer im Prozess gelten.
+        self.cfg = Config(autosave_delay=1.0)
+        self.root.geometry(self.cfg.get("dashboard_geometry", "700x600"))
+        self.root.bind("<Configure>", self._on_configure)
 
         # Queue fur Thread-sichere Kommunikation
         self.msg_queue = queue.Queue()
@@ -57,6 +68,12 @@ class Dashboard:
 
         self.log_text = scrolledtext.ScrolledText(log_frame, height=15, font=("Courier", 9))
         self.log_text.pack(fill="both", expand=True)
+        self.log_status = tk.Label(log_frame, font=("Courier", 8), anchor="w")
+        self.log_status.pack(fill="x")
+
+        # Zeilen aus allen Threads sammeln, pro Takt einmal einfugen, hochstens N Zeilen behalten
+        self.log_buffer = LogBuffer(self.cfg.get("dashboard_log_lines", DEFAULT_MAX_LINES))
+        self.poll = AdaptiveInterval()
 
         # Button-Frame
         btn_frame = tk.Frame(root)
@@ -66,18 +83,137 @@ class Dashboard:
         tk.Button(btn_frame, text="Warnung loggen", command=self.log_warning).pack(side="left", padx=5)
         tk.Button(btn_frame, text="Fehler loggen", command=self.log_error).pack(side="left", padx=5)
 
-        # NEU: Button zum Starten eines Test-Skripts
-        tk.Button(btn_frame, text="Test-Skript starten", command=self.run_test_script).pack(side="left", padx=5)
+        tk.Button(btn_frame, text="Beenden", command=self.quit).pack(side="left", padx=20)
 
-        tk.Button(btn_frame, text="Beenden", command=root.quit).pack(side="left", padx=20)
+        # Jobs: beliebiges Skript aus SYSTEM mit Argumenten, hochstens N gleichzeitig.
+        # Kurze Skripte laufen in vorgewarmten Workern (ohne Interpreterstart);
+        # ohne Worker oder mit abgewahltem "Warm-Pool" in einem eigenen Prozess.
+        max_workers = self.cfg.get("job_max_workers", DEFAULT_MAX_WORKERS)
+        self.pool = None
+        if self.cfg.get("job_use_pool", True):
+            self.pool = WorkerPool(size=max_workers,
+                                   max_jobs=self.cfg.get("worker_max_jobs", DEFAULT_MAX_JOBS),
+                                   max_memory=self.cfg.get("worker_max_memory", DEFAULT_MAX_MEMORY))
+        self.runner = JobRunner(
+            max_workers=max_workers,
+            on_output=lambda job, line: self.log_message("", f"[{job.name}#{job.id}] {line}"),
+            on_update=lambda job: self.msg_queue.put(("JOB", job)),
+            pool=self.pool,
+        )
+        self._build_job_panel(root)
+        root.protocol("WM_DELETE_WINDOW", self.quit)
 
         # Erste Log-Meldung
         log.info("Dashboard gestartet")
         self.log_message("INFO", "Dashboard gestartet")
 
+        # Anderungen an settings.json von aussen ubernehmen (Ruckruf lauft im Hintergrund-Thread)
+        self.cfg.on_change(lambda keys: self.msg_queue.put(("CONFIG", keys)))
+
+        # Alles, was fur das erste Bild nicht notig ist, erst danach erledigen
+        self.root.after_idle(self._after_first_paint)
+
         # Queue regelmasig abfragen
         self.root.after(100, self.process_queue)
 
+    def _build_job_panel(self, root):
+        """Skriptauswahl, Argumente, Zeitlimit und die Job-Tabelle."""
+        job_frame = tk.LabelFrame(root, text="Jobs", padx=10, pady=5)
+        job_frame.pack(fill="x", padx=10, pady=5)
+
+        row = tk.Frame(job_frame)
+        row.pack(fill="x")
+        scripts = sorted(p.name for p in SYSTEM_DIR.glob("*.py"))
+        self.script_var = tk.StringVar(value="test_logger.py" if "test_logger.py" in scripts else "")
+        ttk.Combobox(row, textvariable=self.script_var, values=scripts, width=24,
+                     state="readonly").pack(side="left")
+        tk.Label(row, text="Argumente:").pack(side="left", padx=(10, 2))
+        self.args_var = tk.StringVar()
+        tk.Entry(row, textvariable=self.args_var, width=24).pack(side="left")
+        tk.Label(row, text="Zeitlimit (s):").pack(side="left", padx=(10, 2))
+        self.timeout_var = tk.StringVar()
+        tk.Entry(row, textvariable=self.timeout_var, width=6).pack(side="left")
+        self.pooled_var = tk.BooleanVar(value=self.pool is not None)
+        tk.Checkbutton(row, text="Warm-Pool", variable=self.pooled_var,
+                       state="normal" if self.pool is not None else "disabled").pack(side="left", padx=(10, 0))
+        tk.Button(row, text="Starten", command=self.start_job).pack(side="left", padx=5)
+        tk.Button(row, text="Abbrechen", command=self.cancel_job).pack(side="left")
+
+        columns = ("id", "skript", "status", "fortschritt", "art", "laufzeit", "speicher", "exit")
+        headings = ("#", "Skript", "Status", "Fortschritt", "Art", "Laufzeit", "Peak-Speicher", "Exit")
+        widths = (40, 160, 80, 220, 60, 70, 100, 50)
+        self.job_table = ttk.Treeview(job_frame, columns=columns, show="headings", height=5)
+        for column, heading, width in zip(columns, headings, widths):
+            self.job_table.heading(column, text=heading)
+            self.job_table.column(column, width=width, anchor="w")
+        self.job_table.pack(fill="x", pady=(5, 0))
+
+    def start_job(self):
+        """Reiht das gewahlte Skript mit Argumenten ein."""
+        script = self.script_var.get()
+        try:
+            args = shlex.split(self.args_var.get())
+            timeout = float(self.timeout_var.get()) if self.timeout_var.get().strip() else None
+            job = self.runner.submit(script, args, timeout=timeout, pooled=self.pooled_var.get())
+        except ValueError as e:
+            self.log_message("FEHLER", str(e))
+            return
+        self.log_message("INFO", f"Job #{job.id} eingereiht: {script} {' '.join(args)}")
+
+    def cancel_job(self):
+        """Bricht die in der Tabelle markierten Jobs ab."""
+        for item in self.job_table.selection():
+            self.runner.cancel(int(item))
+
+    def _update_job_row(self, job):
+        """Schreibt den Stand eines Jobs in die Tabelle."""
+        wall = f"{job.wall_time:.1f} s" if job.wall_time is not None else ""
+        exit_code = "" if job.exit_code is None else job.exit_code
+        kind = ("Pool" if job.pooled else "Prozess") if job.started is not None else ""
+        values = (job.id, job.name, job.label, format_progress(job.progress), kind, wall,
+                  format_bytes(job.peak_rss), exit_code)
+        item = str(job.id)
+        if self.job_table.exists(item):
+            self.job_table.item(item, values=values)
+        else:
+            self.job_table.insert("", tk.END, iid=item, values=values)
+            self.job_table.see(item)
+
+    def _on_job_update(self, job):
+        self._update_job_row(job)
+        if job.status in FINISHED:
+            level = "INFO" if job.exit_code == 0 else "FEHLER"
+            if job.error:
+                detail = f" ({job.error})"
+            else:
+                detail = "" if job.exit_code is None else f" (Exitcode {job.exit_code})"
+            self.log_message(level, f"Job #{job.id} {job.name}: {job.label}{detail}")
+
+    def quit(self):
+        """Laufende Jobs abbrechen und das Fenster schliessen."""
+        self.runner.shutdown(cancel=True)
+        if self.pool is not None:
+            self.pool.close()
+        self.root.quit()
+
+    def _after_first_paint(self):
+        """Ordner anlegen und Einstellungen uberwachen – nach dem ersten Zeichnen."""
+        FilePaths.ensure_dirs()
+        if self.pool is not None:
+            self.pool.warm_up()
+        self.cfg.watch(interval=self.cfg.get("config_watch_interval", 2.0))
+
+    def _on_configure(self, event):
+        """Merkt sich die Fenstergröße (gespeichert wird erst nach dem Ziehen)."""
+        if event.widget is self.root and self.cfg.get("dashboard_geometry") != self.root.geometry():
+            self.cfg.set("dashboard_geometry", self.root.geometry())
+
+    def _apply_config(self, keys):
+        """Reagiert auf neu geladene Einstellungen."""
+        self.log_message("INFO", f"Einstellungen neu geladen: {', '.join(sorted(keys))}")
+        if "dashboard_geometry" in keys:
+            self.root.geometry(self.cfg.get("dashboard_geometry", "700x600"))
+
     def log_info(self):
         log.info("Info-Button gedruckt")
         self.log_message("INFO", "Info-Button gedruckt")
@@ -91,66 +227,47 @@ class Dashboard:
         self.log_message("FEHLER", "Fehler-Button gedruckt")
 
     def log_message(self, level, text):
-        """Zeigt eine Meldung im Log-Fenster an."""
-        self.log_text.insert(tk.END, f"{level}: {text}\n")
-        self.log_text.see(tk.END)
-
-    # NEU: Methode zum Starten des Test-Skripts
-    def run_test_script(self):
-        """Startet test_logger.py in einem separaten Thread und zeigt Ausgabe an."""
-        script_path = SYSTEM_DIR / "test_logger.py"
-        if not script_path.exists():
-            self.log_message("FEHLER", f"Skript nicht gefunden: {script_path}")
-            return
-
-        self.log_message("INFO", f"Starte {script_path.name} ...")
-        # Thread starten, um GUI nicht zu blockieren
-        thread = threading.Thread(target=self._run_script_thread, args=(script_path,), daemon=True)
-        thread.start()
-
-    def _run_script_thread(self, script_path):
-        """Fuhrt das Skript aus und leitet Ausgabe in die Queue."""
-        try:
-            # Verwende denselben Python-Interpreter wie das Dashboard
-            python_exe = sys.executable
-            process = subprocess.Popen(
-                [python_exe, str(script_path)],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,
-                encoding='utf-8'
-            )
-            # Zeilenweise lesen und in Queue packen
-            for line in iter(process.stdout.readline, ''):
-                if line:
-                    self.msg_queue.put(("STDOUT", line.rstrip()))
-            process.wait()
-            if process.returncode == 0:
-                self.msg_queue.put(("INFO", f"{script_path.name} erfolgreich beendet."))
-            else:
-                self.msg_queue.put(("FEHLER", f"{script_path.name} mit Fehler {process.returncode} beendet."))
-        except Exception as e:
-            self.msg_queue.put(("FEHLER", f"Fehler beim Ausfuhren: {e}"))
+        """Zeigt eine Meldung im Log-Fenster an (aus jedem Thread; gezeichnet im nachsten Takt)."""
+        self.log_buffer.append(f"{level}: {text}" if level else text)
 
     def process_queue(self):
         """Verarbeitet Nachrichten aus der Queue (wird regelmasig von Tkinter aufgerufen)."""
         try:
             while True:
                 msg_type, msg = self.msg_queue.get_nowait()
-                if msg_type == "STDOUT":
-                    self.log_message("", msg)  # ohne Level
-                elif msg_type == "INFO":
-                    self.log_message("INFO", msg)
-                elif msg_type == "FEHLER":
-                    self.log_message("FEHLER", msg)
-                else:
-                    self.log_message("", msg)
+                if msg_type == "JOB":
+                    self._on_job_update(msg)
+                elif msg_type == "CONFIG":
+                    self._apply_config(msg)
         except queue.Empty:
             pass
-        self.root.after(100, self.process_queue)
+
+        # Laufzeit und Fortschritt laufender Jobs nachfuhren – je Takt hochstens
+        # einmal pro Job, egal wie viele Fortschrittsmeldungen inzwischen kamen
+        for job in self.runner.active():
+            if job.started is not None:
+                self._update_job_row(job)
+
+        start = time.perf_counter()
+        lines = self._render_log()
+        self.root.after(self.poll.next(lines, time.perf_counter() - start), self.process_queue)
+
+    def _render_log(self):
+        """Fugt alle neuen Zeilen mit einem insert ein und kurzt die Anzeige auf N Zeilen."""
+        lines, trim = self.log_buffer.take()
+        if not lines:
+            return 0
+        at_bottom = self.log_text.yview()[1] >= 0.999
+        self.log_text.insert(tk.END, "\n".join(lines) + "\n")
+        if trim:
+            self.log_text.delete("1.0", f"{trim + 1}.0")
+        if at_bottom:
+            self.log_text.see(tk.END)
+        self.log_status.config(text=self.log_buffer.status())
+        return len(lines)
 
 if __name__ == "__main__":
     root = tk.Tk()
     app = Dashboard(root)
-    root.mainloop()
\ No newline at end of file
+    root.mainloop()
+    app.cfg.flush()  # ausstehende Einstellungen schreiben